@@ -0,0 +1,206 @@
+# app/api/cache.py
+"""Response cache for the WPL analytics endpoints.
+
+Entries are keyed on the route, its query parameters and a per-namespace
+data version. Imports bump the version, which orphans every older entry
+at once; orphaned entries then age out through TTL/LRU eviction. The
+version also goes into the ETag, so a client sending If-None-Match gets
+a 304 without the route touching the database, but only while the entry
+behind that ETag is still cached: a 304 is never older than the TTL, and
+an ETag from before a restart or a cache flush is answered with a body.
+
+Backends: ``MemoryCacheBackend`` (per process, TTL + LRU, the default)
+or ``RedisCacheBackend`` when CACHE_URL is set, which also shares the data
+version between workers. In-process versions start from a random nonce,
+so ETags never repeat across workers or restarts. Writers outside the API
+(the CLIs) bump the version through ``get_response_cache()``; that only
+reaches the workers with a shared backend, otherwise their entries age
+out within CACHE_TTL_SECONDS.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.metrics import REGISTRY
+from app.profiling import serializing
+
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 300))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+CACHE_URL = os.getenv("CACHE_URL") or None
+
+# Namespace of everything derived from wpl_matches, wpl_player_stats and wpl_standings
+WPL_NAMESPACE = "wpl"
+
+REQUESTS = REGISTRY.counter(
+    "response_cache_requests_total", "Cached-route lookups by outcome", ("result",)
+)
+ENTRIES = REGISTRY.gauge("response_cache_entries", "Entries held by the in-process response cache")
+BYTES = REGISTRY.gauge("response_cache_bytes", "Body bytes held by the in-process response cache")
+
+
+class MemoryCacheBackend:
+    """Thread-safe TTL + LRU cache of response bodies"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._versions = {}
+        self._nonce = os.urandom(6).hex()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            body, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes, ttl: int):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, time.monotonic() + ttl)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            self._publish()
+
+    def get_version(self, namespace: str) -> str:
+        return f"{self._nonce}.{self._versions.get(namespace, 0)}"
+
+    def bump_version(self, namespace: str) -> str:
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        return self.get_version(namespace)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._publish()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self._bytes}
+
+    def _remove(self, key: str):
+        body, _ = self._entries.pop(key)
+        self._bytes -= len(body)
+        self._publish()
+
+    def _publish(self):
+        ENTRIES.set(len(self._entries))
+        BYTES.set(self._bytes)
+
+
+class RedisCacheBackend:
+    """Shared backend; needs the optional ``redis`` package"""
+
+    def __init__(self, url: str, prefix: str = "skye:cache:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_URL is set but the 'redis' package is not installed") from e
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self.prefix + key)
+
+    def set(self, key: str, body: bytes, ttl: int):
+        self._client.set(self.prefix + key, body, ex=ttl)
+
+    def get_version(self, namespace: str) -> str:
+        return str(int(self._client.get(f"{self.prefix}version:{namespace}") or 0))
+
+    def bump_version(self, namespace: str) -> str:
+        return str(self._client.incr(f"{self.prefix}version:{namespace}"))
+
+    def clear(self):
+        for key in self._client.scan_iter(f"{self.prefix}*"):
+            self._client.delete(key)
+
+    def stats(self) -> dict:
+        return {}
+
+
+class ResponseCache:
+    def __init__(self, backend=None, ttl: int = CACHE_TTL_SECONDS):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+
+    def get_version(self, namespace: str) -> str:
+        return self.backend.get_version(namespace)
+
+    def bump_version(self, namespace: str) -> str:
+        """Invalidate every cached response in ``namespace``"""
+        return self.backend.bump_version(namespace)
+
+    def stats(self) -> dict:
+        hits = REQUESTS.value(result="hit") + REQUESTS.value(result="not_modified")
+        total = hits + REQUESTS.value(result="miss")
+        return {**self.backend.stats(), "hit_rate": hits / total if total else None}
+
+    async def respond(
+        self,
+        request: Request,
+        namespace: str,
+        compute: Callable[[], Awaitable],
+        media_type: str = "application/json",
+        encode: Optional[Callable[[object], bytes]] = None,
+    ) -> Response:
+        """Serve from cache, answer If-None-Match with 304, or compute and store.
+
+        ``encode`` turns the computed result into the body; the default is JSON.
+        """
+        version = self.backend.get_version(namespace)
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        key = f"{namespace}:{version}:{request.url.path}?{query}"
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        body = self.backend.get(key)
+        # Only vouch for an ETag while its entry is cached, so a 304 is bounded by the TTL
+        if body is not None and etag in _parse_etags(request.headers.get("if-none-match")):
+            REQUESTS.inc(result="not_modified")
+            return Response(status_code=304, headers=headers)
+
+        if body is not None:
+            REQUESTS.inc(result="hit")
+            return Response(body, media_type=media_type, headers={**headers, "X-Cache": "HIT"})
+
+        REQUESTS.inc(result="miss")
+        result = await compute()
+        with serializing():
+            body = encode(result) if encode else json.dumps(jsonable_encoder(result)).encode()
+        self.backend.set(key, body, self.ttl)
+        return Response(body, media_type=media_type, headers={**headers, "X-Cache": "MISS"})
+
+
+def _parse_etags(header: Optional[str]) -> set:
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        backend = RedisCacheBackend(CACHE_URL) if CACHE_URL else MemoryCacheBackend()
+        _response_cache = ResponseCache(backend)
+    return _response_cache
@@ -0,0 +1,59 @@
+# app/api/dashboard.py
+"""Process-wide MatchIndex behind the /wpl/dashboard routes.
+
+The index is built from the processed store on first use and rebuilt when
+the store's files change. The store version also names the response-cache
+namespace, so a rebuild orphans every cached dashboard response at once.
+pandas and pyarrow are imported on first use, not with the app.
+"""
+import hashlib
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from app.utils.match_index import MatchIndex
+
+
+class DashboardIndex:
+    def __init__(self, store_path: Optional[Path] = None):
+        self._store_path = Path(store_path) if store_path else None
+        self._version = None
+        self._index: Optional['MatchIndex'] = None
+        self._lock = threading.Lock()
+
+    @property
+    def store_path(self) -> Path:
+        if self._store_path is None:
+            from app.utils.processed_store import default_store_path
+            self._store_path = default_store_path()
+        return self._store_path
+
+    def get(self) -> Tuple['MatchIndex', str]:
+        """The current index and a cache namespace for its data version"""
+        from app.utils.match_index import DASHBOARD_COLUMNS, MatchIndex
+        from app.utils.processed_store import read_matches, store_version
+
+        version = store_version(self.store_path)
+        if not version:
+            raise FileNotFoundError(f"Processed store not found: {self.store_path}")
+        with self._lock:
+            if version != self._version:
+                self._index = MatchIndex(read_matches(self.store_path, columns=DASHBOARD_COLUMNS))
+                self._version = version
+            index = self._index
+        digest = hashlib.sha1(repr(version).encode()).hexdigest()[:12]
+        return index, f"dashboard:{digest}"
+
+
+_dashboard_index: Optional[DashboardIndex] = None
+_dashboard_index_lock = threading.Lock()
+
+
+def get_dashboard_index() -> DashboardIndex:
+    global _dashboard_index
+    if _dashboard_index is None:
+        with _dashboard_index_lock:
+            if _dashboard_index is None:
+                _dashboard_index = DashboardIndex()
+    return _dashboard_index
@@ -0,0 +1,161 @@
+# app/api/matchups.py
+"""Process-wide MatchupIndex behind /wpl/head-to-head and /wpl/venue-stats.
+
+Built from the processed store on first use, plus the matches imported
+straight into wpl_matches (``source`` NULL), which the store never sees.
+Those are read again whenever the WPL cache version moves, as every
+import bumps it, and at least once per CACHE_TTL_SECONDS for imports made
+by other workers. Only the seasons whose store files or imported matches
+changed are rebuilt and swapped into the index; the data version names
+the cache namespace as for the dashboard.
+"""
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.api.cache import CACHE_TTL_SECONDS
+from app.db.models import WPLMatch
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from app.utils.matchups import MatchupIndex
+
+# Store and database rows for one match share the date and pair of teams; the store's copy wins
+MATCH_KEY = ['date', 'team1', 'team2']
+
+
+def _season_files(version: tuple) -> Dict[int, tuple]:
+    """Store version entries grouped by the season partition they belong to"""
+    seasons = defaultdict(list)
+    for entry in version:
+        partition = Path(entry[0]).parts[0]
+        seasons[int(partition.split('=', 1)[1])].append(entry)
+    return {season: tuple(entries) for season, entries in seasons.items()}
+
+
+def imported_matches(db: Session) -> 'pd.DataFrame':
+    """Matches imported into wpl_matches outside the store, in the index's columns.
+
+    wpl_matches has no toss or margin columns, so these count towards played,
+    won and no result but not the toss or margin figures. A season is the
+    calendar year of the match date, as for the standings.
+    """
+    import pandas as pd
+    from app.utils.matchups import MATCHUP_COLUMNS
+
+    rows = (
+        db.query(WPLMatch.match_date, WPLMatch.team1, WPLMatch.team2, WPLMatch.venue, WPLMatch.winner)
+        .filter(WPLMatch.source.is_(None), WPLMatch.match_date.isnot(None))
+        .order_by(WPLMatch.id)
+        .all()
+    )
+    df = pd.DataFrame(rows, columns=['date', 'team1', 'team2', 'venue', 'winner'])
+    df['date'] = pd.to_datetime(df['date'])
+    df['season'] = df['date'].dt.year.astype('int64')
+    for column in ('toss_winner', 'toss_decision'):
+        df[column] = None
+    for column in ('winner_runs', 'winner_wickets'):
+        df[column] = float('nan')
+    return df[MATCH_KEY[:1] + MATCHUP_COLUMNS]
+
+
+def _by_season(df: 'pd.DataFrame') -> Dict[int, Tuple['pd.DataFrame', int]]:
+    """Each season's rows with a digest of their contents"""
+    import pandas as pd
+
+    return {
+        int(season): (part, int(pd.util.hash_pandas_object(part, index=False).sum()))
+        for season, part in df.groupby('season')
+    }
+
+
+def _without_stored(imported: 'pd.DataFrame', stored: 'pd.DataFrame') -> 'pd.DataFrame':
+    import pandas as pd
+
+    def keys(df):
+        # Either side may be listed first
+        a, b = (df[c].astype(object).fillna('') for c in MATCH_KEY[1:])
+        return pd.MultiIndex.from_arrays([df['date'], a.where(a <= b, b), b.where(a <= b, a)])
+
+    return imported[~keys(imported).isin(keys(stored))]
+
+
+class MatchupSource:
+    def __init__(self, store_path: Optional[Path] = None, imports_ttl: int = CACHE_TTL_SECONDS):
+        self._store_path = Path(store_path) if store_path else None
+        self.imports_ttl = imports_ttl
+        # Per season: (store files, digest of imported matches)
+        self._signatures: Dict[int, tuple] = {}
+        self._imported: Dict[int, tuple] = {}
+        self._imports_version: Optional[str] = None
+        self._imports_read_at = float('-inf')
+        self._index: Optional['MatchupIndex'] = None
+        self._lock = threading.Lock()
+
+    @property
+    def store_path(self) -> Path:
+        if self._store_path is None:
+            from app.utils.processed_store import default_store_path
+            self._store_path = default_store_path()
+        return self._store_path
+
+    def get(self, db: Optional[Session] = None, imports_version: Optional[str] = None) -> Tuple['MatchupIndex', str]:
+        """The current index and a cache namespace for its data version.
+
+        Without ``db`` the imported matches last read are kept as they are.
+        """
+        import pandas as pd
+        from app.utils.matchups import MATCHUP_COLUMNS, MatchupIndex
+        from app.utils.processed_store import read_matches, store_version
+
+        version = store_version(self.store_path)
+        if not version:
+            raise FileNotFoundError(f"Processed store not found: {self.store_path}")
+        with self._lock:
+            expired = time.monotonic() - self._imports_read_at > self.imports_ttl
+            if db is not None and (imports_version != self._imports_version or expired):
+                self._imported = _by_season(imported_matches(db))
+                self._imports_version, self._imports_read_at = imports_version, time.monotonic()
+
+            files = _season_files(version)
+            signatures = {
+                season: (files.get(season), self._imported[season][1] if season in self._imported else None)
+                for season in set(files) | set(self._imported)
+            }
+            if signatures != self._signatures:
+                changed = sorted(s for s in signatures if self._signatures.get(s) != signatures[s])
+                removed = sorted(set(self._signatures) - set(signatures))
+                stored = [s for s in changed if s in files]
+                columns = MATCH_KEY[:1] + MATCHUP_COLUMNS
+                df = read_matches(self.store_path, columns=columns, seasons=stored) if stored else None
+                frames = {}
+                for season in changed:
+                    part = df[df['season'] == season] if season in files else pd.DataFrame(columns=columns)
+                    if season in self._imported:
+                        part = pd.concat([part, _without_stored(self._imported[season][0], part)])
+                    frames[season] = part
+                # Readers keep the old index until the updated copy is swapped in
+                index = self._index.copy() if self._index is not None else MatchupIndex()
+                index.update(frames, removed)
+                self._index, self._signatures = index, signatures
+            index = self._index
+        digest = hashlib.sha1(repr(sorted(signatures.items())).encode()).hexdigest()[:12]
+        return index, f"matchups:{digest}"
+
+
+_matchup_source: Optional[MatchupSource] = None
+_matchup_source_lock = threading.Lock()
+
+
+def get_matchup_source() -> MatchupSource:
+    global _matchup_source
+    if _matchup_source is None:
+        with _matchup_source_lock:
+            if _matchup_source is None:
+                _matchup_source = MatchupSource()
+    return _matchup_source
@@ -0,0 +1,101 @@
+# app/api/pagination.py
+"""Keyset pagination, column projection and NDJSON streaming for table reads."""
+import json
+from typing import List, Optional
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.database import AnySession
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+STREAM_BATCH_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-After-Id"
+
+
+def parse_fields(model, fields: Optional[str]) -> List:
+    """Resolve a comma-separated ``fields=`` value to table columns.
+
+    ``id`` is always included because it is the pagination cursor.
+    """
+    table_columns = model.__table__.c
+    if not fields:
+        return list(table_columns)
+
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in table_columns]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(table_columns.keys())}"
+        )
+    if 'id' not in names:
+        names.insert(0, 'id')
+    return [table_columns[name] for name in names]
+
+
+def _keyset_select(model, columns, after_id: Optional[int]):
+    stmt = select(*columns).order_by(model.id)
+    if after_id is not None:
+        stmt = stmt.where(model.id > after_id)
+    return stmt
+
+
+def keyset_page(
+    db: Session,
+    response: Response,
+    model,
+    columns,
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> List[dict]:
+    """Return one page of rows as plain dicts, ordered by id.
+
+    When the page is full, the id to pass as ``after_id`` for the next page
+    is returned in the ``X-Next-After-Id`` header.
+    """
+    rows = [dict(row._mapping) for row in db.execute(_keyset_select(model, columns, after_id).limit(limit))]
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(rows[-1]['id'])
+    return rows
+
+
+def _json_default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stream_ndjson(db: AnySession, model, columns, after_id: Optional[int] = None) -> StreamingResponse:
+    """Stream every row after ``after_id`` as NDJSON from a server-side cursor.
+
+    The generator opens its own connection on the session's engine, so it
+    does not depend on the request's session outliving the response.
+    """
+    stmt = _keyset_select(model, columns, after_id)
+
+    def encode(partition) -> str:
+        return ''.join(json.dumps(dict(row._mapping), default=_json_default) + '\n' for row in partition)
+
+    if isinstance(db, AsyncSession):
+        async_engine = db.bind
+
+        async def generate():
+            async with async_engine.connect() as connection:
+                result = await connection.stream(stmt)
+                async for partition in result.partitions(STREAM_BATCH_SIZE):
+                    yield encode(partition)
+    else:
+        engine = db.get_bind()
+
+        def generate():
+            with engine.connect() as connection:
+                result = connection.execution_options(stream_results=True).execute(stmt)
+                for partition in result.partitions(STREAM_BATCH_SIZE):
+                    yield encode(partition)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
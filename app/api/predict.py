@@ -0,0 +1,100 @@
+# app/api/predict.py
+"""Process-wide WinModel behind /wpl/predict.
+
+Each worker loads the saved model for the store's data version once, and
+trains and saves it first if no worker has yet. The store and manifest
+are checked on every request, so a reclean switches to the new model
+without a restart. scikit-learn is imported on first use, not with the app.
+"""
+import csv
+import io
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from app.utils.win_model import WinModel
+
+MAX_FIXTURES = 10_000
+FIXTURE_FIELDS = ('team1', 'team2', 'venue', 'toss_winner', 'toss_decision')
+
+
+def parse_fixtures(body: bytes, content_type: str) -> Dict[str, List]:
+    """Parse a JSON array, NDJSON or CSV body into columnar fixtures"""
+    text = body.decode('utf-8')
+    content_type = (content_type or '').split(';')[0].strip().lower()
+
+    if content_type in ('application/x-ndjson', 'application/jsonl'):
+        raw = [json.loads(line) for line in text.splitlines() if line.strip()]
+    elif content_type == 'text/csv':
+        raw = list(csv.DictReader(io.StringIO(text)))
+    else:
+        raw = json.loads(text)
+        if not isinstance(raw, list):
+            raise ValueError("Expected a JSON array of fixtures")
+
+    if len(raw) > MAX_FIXTURES:
+        raise ValueError(f"Batch exceeds {MAX_FIXTURES} fixtures")
+
+    fixtures = {field: [] for field in FIXTURE_FIELDS}
+    for i, item in enumerate(raw):
+        if not isinstance(item, dict) or not item.get('team1') or not item.get('team2'):
+            raise ValueError(f"Invalid fixture at index {i}: team1 and team2 are required")
+        for field in FIXTURE_FIELDS:
+            # CSV leaves optional fields as empty strings
+            fixtures[field].append(item.get(field) or None)
+    return fixtures
+
+
+class WinModelSource:
+    def __init__(self, store_path: Optional[Path] = None, model_dir: Optional[Path] = None):
+        self._store_path = Path(store_path) if store_path else None
+        self._model_dir = Path(model_dir) if model_dir else None
+        self._stamp: tuple = ()
+        self._model: Optional['WinModel'] = None
+        self._lock = threading.Lock()
+
+    @property
+    def store_path(self) -> Path:
+        if self._store_path is None:
+            from app.utils.processed_store import default_store_path
+            self._store_path = default_store_path()
+        return self._store_path
+
+    @property
+    def model_dir(self) -> Path:
+        if self._model_dir is None:
+            from app.utils.win_model import default_model_dir
+            self._model_dir = default_model_dir(self.store_path)
+        return self._model_dir
+
+    def get(self) -> 'WinModel':
+        """The model for the current data, loaded (or trained) when the data has changed"""
+        from app.utils.manifest import MANIFEST_NAME
+        from app.utils.processed_store import store_version
+        from app.utils.win_model import load_or_train
+
+        version = store_version(self.store_path)
+        if not version:
+            raise FileNotFoundError(f"Processed store not found: {self.store_path}")
+        manifest = self.store_path.parent / MANIFEST_NAME
+        stamp = (version, manifest.stat().st_mtime_ns if manifest.exists() else None)
+        with self._lock:
+            if stamp != self._stamp:
+                self._model = load_or_train(self.store_path, self.model_dir)
+                self._stamp = stamp
+            return self._model
+
+
+_win_model_source: Optional[WinModelSource] = None
+_win_model_source_lock = threading.Lock()
+
+
+def get_win_model_source() -> WinModelSource:
+    global _win_model_source
+    if _win_model_source is None:
+        with _win_model_source_lock:
+            if _win_model_source is None:
+                _win_model_source = WinModelSource()
+    return _win_model_source
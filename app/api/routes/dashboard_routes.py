@@ -0,0 +1,108 @@
+# app/api/routes/dashboard_routes.py
+"""Pre-aggregated, filtered data for the WPL dashboard.
+
+Filters resolve through the shared MatchIndex and responses go through the
+response cache, keyed on the processed store's version. ``/matches`` can
+return an Arrow IPC stream instead of JSON; JSON bodies are gzip-compressed
+by the app's middleware when the client accepts it.
+"""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.cache import ResponseCache, get_response_cache
+from app.api.dashboard import DashboardIndex, get_dashboard_index
+from app.profiling import ProfiledRoute
+
+router = APIRouter(prefix="/wpl/dashboard", tags=["dashboard"], route_class=ProfiledRoute)
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MAX_DETAIL_ROWS = 10_000
+
+
+def _current_index(dashboard: DashboardIndex):
+    try:
+        return dashboard.get()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def _filters(index, start_date, end_date, team, season):
+    # Missing bounds resolve to the data's own range, so equivalent
+    # requests share one memoized summary
+    return (start_date or index.min_date, end_date or index.max_date, team, season)
+
+
+@router.get("/options")
+async def get_dashboard_options(
+    request: Request,
+    dashboard: DashboardIndex = Depends(get_dashboard_index),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """Values the dashboard's filter widgets offer"""
+    index, namespace = await run_in_threadpool(_current_index, dashboard)
+
+    async def compute():
+        return {
+            "teams": index.teams,
+            "seasons": index.seasons,
+            "min_date": index.min_date,
+            "max_date": index.max_date,
+        }
+
+    return await cache.respond(request, namespace, compute)
+
+
+@router.get("/summary")
+async def get_dashboard_summary(
+    request: Request,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    team: Optional[str] = None,
+    season: Optional[int] = None,
+    dashboard: DashboardIndex = Depends(get_dashboard_index),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """Key metrics, team table, win types and venue counts for one filter combination"""
+    index, namespace = await run_in_threadpool(_current_index, dashboard)
+    filters = _filters(index, start_date, end_date, team, season)
+
+    async def compute():
+        summary = await run_in_threadpool(index.summary, *filters)
+        return summary.to_dict()
+
+    return await cache.respond(request, namespace, compute)
+
+
+@router.get("/matches")
+async def get_dashboard_matches(
+    request: Request,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    team: Optional[str] = None,
+    season: Optional[int] = None,
+    limit: int = Query(MAX_DETAIL_ROWS, gt=0, le=MAX_DETAIL_ROWS),
+    format: str = Query("json", pattern="^(json|arrow)$"),
+    dashboard: DashboardIndex = Depends(get_dashboard_index),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """The "Match Details" table in date order, at most ``limit`` rows"""
+    from app.utils.aggregations import table_records
+    from app.utils.processed_store import to_arrow_ipc
+
+    index, namespace = await run_in_threadpool(_current_index, dashboard)
+    filters = _filters(index, start_date, end_date, team, season)
+
+    async def compute():
+        summary = await run_in_threadpool(index.summary, *filters)
+        return summary.details.head(limit)
+
+    async def compute_records():
+        # table_records moves the index into the first column
+        return table_records((await compute()).set_index('date'))
+
+    if format == "arrow":
+        return await cache.respond(request, namespace, compute, media_type=ARROW_STREAM, encode=to_arrow_ipc)
+    return await cache.respond(request, namespace, compute_records)
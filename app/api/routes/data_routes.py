@@ -1,20 +1,112 @@
 # app/api/routes/data_routes.py
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from datetime import datetime
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, parse_fields, stream_ndjson
+from app.db.database import AnySession, get_read_session, get_session, run_db
 from app.db.models import DataPoint
+from app.db.ingest import (
+    BufferFull,
+    DataPointWriteBuffer,
+    get_write_buffer,
+    insert_points,
+    make_point,
+    parse_points,
+)
+from app.profiling import ProfiledRoute
+from app.db.rollups import RESOLUTIONS, apply_rollups, raw_rollup_query, rollup_query
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+logger = logging.getLogger(__name__)
 
 @router.get("/data/")
-def get_data(db: Session = Depends(get_db)):
-    data = db.query(DataPoint).all()
-    return data
+async def get_data(
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, gt=0, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AnySession = Depends(get_read_session)
+):
+    columns = parse_fields(DataPoint, fields)
+    if format == "ndjson":
+        return stream_ndjson(db, DataPoint, columns, after_id)
+    return await run_db(db, keyset_page, response, DataPoint, columns, after_id, limit)
 
-@router.post("/data/")
-def create_data(value: float, category: str, source: str, db: Session = Depends(get_db)):
-    data_point = DataPoint(value=value, category=category, source=source)
+def _create_point(db: Session, point: dict) -> DataPoint:
+    data_point = DataPoint(**point)
     db.add(data_point)
+    apply_rollups(db, [point])
     db.commit()
     db.refresh(data_point)
-    return data_point
\ No newline at end of file
+    return data_point
+
+def _insert_batch(db: Session, points: list) -> int:
+    try:
+        inserted = insert_points(db, points)
+        db.commit()
+        return inserted
+    except Exception:
+        db.rollback()
+        raise
+
+@router.post("/data/")
+async def create_data(
+    value: float,
+    category: str,
+    source: str,
+    response: Response,
+    buffered: bool = False,
+    db: AnySession = Depends(get_session),
+    buffer: DataPointWriteBuffer = Depends(get_write_buffer)
+):
+    try:
+        point = make_point(value, category, source)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if buffered:
+        # Coalesced into a multi-row insert by the write buffer
+        try:
+            # submit() may block for backpressure, so keep it off the event loop
+            await run_in_threadpool(buffer.submit, point)
+        except BufferFull as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        response.status_code = 202
+        return {"status": "queued"}
+
+    return await run_db(db, _create_point, point)
+
+@router.post("/data/batch")
+async def create_data_batch(request: Request, db: AnySession = Depends(get_session)):
+    """Insert many points from a JSON array, NDJSON or CSV body"""
+    try:
+        points = await run_in_threadpool(parse_points, await request.body(), request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        inserted = await run_db(db, _insert_batch, points)
+    except Exception:
+        # Driver errors can quote the rows, so the details only go to the log
+        logger.exception("Batch insert failed")
+        raise HTTPException(status_code=500, detail="Batch insert failed")
+    return {"status": "success", "inserted": inserted}
+
+@router.get("/data/rollup")
+async def get_data_rollup(
+    bucket: str = Query("hour", pattern=f"^({'|'.join(RESOLUTIONS)})$"),
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    method: str = Query("rollup", pattern="^(rollup|raw)$"),
+    db: AnySession = Depends(get_read_session)
+):
+    """count/sum/min/max/avg per time bucket; method=raw scans data_points instead"""
+    query = raw_rollup_query if method == "raw" else rollup_query
+    return await run_db(db, query, bucket, category=category, source=source, start=start, end=end)
@@ -1,75 +1,232 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import pandas as pd
-from app.db.database import get_db
-from app.db.models import WPLMatch, WPLPlayerStats
-from app.db.models import calculate_team_stats, get_top_players
+from typing import Optional
+from datetime import date
+from pathlib import Path
+from app.api.cache import WPL_NAMESPACE, ResponseCache, get_response_cache
+from app.api.matchups import MatchupSource, get_matchup_source
+from app.api.predict import WinModelSource, get_win_model_source, parse_fixtures
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, parse_fields, stream_ndjson
+from app.db.database import AnySession, get_read_session, get_session, run_db
+from app.db.models import WPLMatch
+from app.db.models import LEADERBOARD_CATEGORIES
+from app.db.leaderboard import top_players_query
+from app.db.queries import team_stats_python, team_stats_query
+from app.db.standings import read_standings
+from app.db.summary import read_match_analysis, stream_match_analysis
+from app.profiling import ProfiledRoute
+from app.db.wpl_import import DEFAULT_BATCH_SIZE, DEFAULT_IMPORT_FILE, import_matches
 
-router = APIRouter(prefix="/wpl", tags=["wpl"])
+router = APIRouter(prefix="/wpl", tags=["wpl"], route_class=ProfiledRoute)
+
+CACHE_NAMESPACE = WPL_NAMESPACE
+
+logger = logging.getLogger(__name__)
+
+def get_import_dir() -> Path:
+    """Directory server-side import paths must resolve into; overridden in tests"""
+    return Path(__file__).parent.parent.parent.parent / 'data'
+
+def resolve_import_path(path: str, import_dir: Path) -> Path:
+    """``path`` relative to ``import_dir``; anything resolving outside it is a 403"""
+    root = Path(import_dir).resolve()
+    resolved = (root / path).resolve()
+    if not resolved.is_relative_to(root):
+        raise HTTPException(status_code=403, detail="Import paths must be inside the data directory")
+    return resolved
 
 @router.post("/import-data")
-async def import_wpl_data(db: Session = Depends(get_db)):
+async def import_wpl_data(
+    file: Optional[UploadFile] = File(None),
+    path: Optional[str] = None,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, gt=0),
+    db: AnySession = Depends(get_session),
+    cache: ResponseCache = Depends(get_response_cache),
+    import_dir: Path = Depends(get_import_dir)
+):
+    """Import matches from an uploaded CSV or a path under the data directory"""
+    if file is not None:
+        source = file.file
+    else:
+        path = path or DEFAULT_IMPORT_FILE
+        source = str(resolve_import_path(path, import_dir))
     try:
-        # Read CSV file
-        df = pd.read_csv("wpl_2023_2024.csv")
-        
-        # Process matches data
-        for _, row in df.iterrows():
-            match = WPLMatch(
-                match_date=pd.to_datetime(row['date']).date(),
-                venue=row['venue'],
-                team1=row['team1'],
-                team2=row['team2'],
-                winner=row['winner'],
-                player_of_match=row['player_of_match'],
-                team1_score=row['team1_score'],
-                team1_wickets=row['team1_wickets'],
-                team1_overs=row['team1_overs'],
-                team2_score=row['team2_score'],
-                team2_wickets=row['team2_wickets'],
-                team2_overs=row['team2_overs']
-            )
-            db.add(match)
-        
-        db.commit()
-        return {"status": "success", "message": "Data imported successfully"}
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+        report = await run_db(db, import_matches, source, batch_size=batch_size)
+        return {"status": "success", "message": "Data imported successfully", **report.to_dict()}
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File not found: {path}")
+    except Exception:
+        # Parser errors can quote the file, so the details only go to the log
+        logger.exception("Match import failed")
+        await run_db(db, Session.rollback)
+        raise HTTPException(status_code=500, detail="Import failed")
+    finally:
+        # Batches are committed as they go, so even a failed import may have changed data
+        cache.bump_version(CACHE_NAMESPACE)
+
+def get_deliveries_path() -> Path:
+    """Location of the deliveries store; overridden in tests"""
+    from app.utils.deliveries_store import default_deliveries_path
+    return default_deliveries_path()
+
+@router.post("/import-deliveries")
+async def import_wpl_deliveries(
+    file: Optional[UploadFile] = File(None),
+    path: Optional[str] = None,
+    db: AnySession = Depends(get_session),
+    cache: ResponseCache = Depends(get_response_cache),
+    store_path: Path = Depends(get_deliveries_path),
+    import_dir: Path = Depends(get_import_dir)
+):
+    """Import ball-by-ball deliveries and update the player stats they derive"""
+    # pandas and pyarrow load on first use rather than when the app starts
+    from app.db.player_stats import import_deliveries
+    if file is None and path is None:
+        raise HTTPException(status_code=400, detail="Upload a file or give a path")
+    source = file.file if file is not None else str(resolve_import_path(path, import_dir))
+    try:
+        report = await run_db(db, import_deliveries, source, store_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File not found: {path}")
+    except ValueError:
+        logger.exception("Deliveries import failed")
+        raise HTTPException(status_code=400, detail="Invalid deliveries file")
+    cache.bump_version(CACHE_NAMESPACE)
+    return {"status": "success", **report.to_dict()}
 
 @router.get("/matches")
-async def get_matches(db: Session = Depends(get_db)):
-    matches = db.query(WPLMatch).all()
-    return matches
+async def get_matches(
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, gt=0, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AnySession = Depends(get_read_session)
+):
+    columns = parse_fields(WPLMatch, fields)
+    if format == "ndjson":
+        return stream_ndjson(db, WPLMatch, columns, after_id)
+    return await run_db(db, keyset_page, response, WPLMatch, columns, after_id, limit)
 
 @router.get("/team-stats")
-async def get_team_statistics(db: Session = Depends(get_db)):
-    matches = db.query(WPLMatch).all()
-    team_stats = calculate_team_stats(matches)
-    return team_stats
+async def get_team_statistics(
+    request: Request,
+    season: Optional[int] = None,
+    venue: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    method: str = Query("sql", pattern="^(sql|python)$"),
+    db: AnySession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    filters = dict(season=season, venue=venue, start_date=start_date, end_date=end_date)
+    compute = team_stats_python if method == "python" else team_stats_query
+    return await cache.respond(request, CACHE_NAMESPACE, lambda: run_db(db, compute, **filters))
 
 @router.get("/top-players/{category}")
 async def get_top_players_route(
+    request: Request,
     category: str,
-    limit: Optional[int] = 5,
-    db: Session = Depends(get_db)
+    limit: int = Query(5, gt=0, le=1000),
+    team: Optional[str] = None,
+    db: AnySession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache)
 ):
-    players = db.query(WPLPlayerStats).all()
-    top_players = get_top_players(players, category, limit)
-    return top_players
+    if category not in LEADERBOARD_CATEGORIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported category '{category}'. Choose from: {', '.join(LEADERBOARD_CATEGORIES)}"
+        )
+    return await cache.respond(
+        request, CACHE_NAMESPACE, lambda: run_db(db, top_players_query, category, limit, team)
+    )
 
 @router.get("/match-analysis")
-async def get_match_analysis(db: Session = Depends(get_db)):
-    matches = db.query(WPLMatch).all()
-    
-    analysis = {
-        "total_matches": len(matches),
-        "average_first_innings_score": sum(m.team1_score for m in matches) / len(matches),
-        "average_second_innings_score": sum(m.team2_score for m in matches) / len(matches),
-        "venues": list(set(m.venue for m in matches)),
-        "highest_score": max(max(m.team1_score, m.team2_score) for m in matches),
-        "players_of_match": list(set(m.player_of_match for m in matches))
+async def get_match_analysis(
+    request: Request,
+    method: str = Query("summary", pattern="^(summary|stream)$"),
+    db: AnySession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    compute = stream_match_analysis if method == "stream" else read_match_analysis
+    return await cache.respond(request, CACHE_NAMESPACE, lambda: run_db(db, compute))
+
+@router.get("/standings")
+async def get_standings(
+    request: Request,
+    season: Optional[int] = None,
+    as_of: Optional[date] = None,
+    db: AnySession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """Points table with net run rate and form, as it stood after the last match on or before ``as_of``"""
+    return await cache.respond(request, CACHE_NAMESPACE, lambda: run_db(db, read_standings, season, as_of))
+
+async def _matchup_response(request: Request, source: MatchupSource, db: AnySession, cache: ResponseCache, lookup):
+    """Serve ``lookup(index)`` from the current matchup index; unknown names are a 404"""
+    try:
+        # Imports bump the WPL version, which has the source re-read the imported matches
+        index, namespace = await run_db(db, source.get, cache.get_version(CACHE_NAMESPACE))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def compute():
+        try:
+            return lookup(index)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=e.args[0])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await cache.respond(request, namespace, compute)
+
+@router.get("/head-to-head")
+async def get_head_to_head(
+    request: Request,
+    team1: str,
+    team2: str,
+    venue: Optional[str] = None,
+    source: MatchupSource = Depends(get_matchup_source),
+    db: AnySession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """Both teams' record against each other, optionally at one venue"""
+    return await _matchup_response(
+        request, source, db, cache, lambda index: index.head_to_head_stats(team1, team2, venue)
+    )
+
+@router.get("/venue-stats")
+async def get_venue_stats(
+    request: Request,
+    venue: Optional[str] = None,
+    team: Optional[str] = None,
+    source: MatchupSource = Depends(get_matchup_source),
+    db: AnySession = Depends(get_read_session),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """Every team at a venue, one team at every venue (with its toss record), or one team at one venue"""
+    return await _matchup_response(request, source, db, cache, lambda index: index.venue_stats(venue, team))
+
+@router.post("/predict")
+async def predict_wins(
+    request: Request,
+    source: WinModelSource = Depends(get_win_model_source)
+):
+    """Probability that team1 wins each fixture of a JSON array, NDJSON or CSV body, in one batch"""
+    try:
+        fixtures = await run_in_threadpool(parse_fixtures, await request.body(), request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        model = await run_in_threadpool(source.get)
+        probabilities = await run_in_threadpool(model.predict, fixtures)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "model_version": model.version,
+        "team1_win_probability": probabilities.round(4).tolist(),
     }
-    
-    return analysis
\ No newline at end of file
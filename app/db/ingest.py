@@ -0,0 +1,255 @@
+# app/db/ingest.py
+"""High-throughput DataPoint ingestion: batch parsing, bulk inserts and a write buffer."""
+import csv
+import io
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.db.models import DataPoint
+from app.db.rollups import apply_rollups, to_utc_naive
+from app.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+INSERT_CHUNK_SIZE = 5000
+MAX_BATCH_POINTS = 100000
+# A failed flush is retried once with a fresh session before its points are dropped
+FLUSH_ATTEMPTS = 2
+
+FLUSH_SECONDS = REGISTRY.histogram(
+    "datapoint_buffer_flush_seconds", "Time to write one buffered batch of data points"
+)
+FLUSHED_ROWS = REGISTRY.counter(
+    "datapoint_buffer_flushed_rows_total", "Data points written by the write buffer"
+)
+FAILED_ROWS = REGISTRY.counter(
+    "datapoint_buffer_failed_rows_total", "Buffered data points dropped because their flush failed"
+)
+REJECTED = REGISTRY.counter(
+    "datapoint_buffer_rejected_total", "Single-point posts rejected because the write buffer was full"
+)
+DEPTH = REGISTRY.gauge(
+    "datapoint_buffer_depth", "Data points waiting in the write buffer"
+)
+
+
+class BufferFull(Exception):
+    """Raised when the write buffer cannot accept a point within the timeout"""
+
+
+def make_point(value, category, source, timestamp=None) -> Dict:
+    """Validate one incoming point and return a row dict for data_points"""
+    if category in (None, '') or source in (None, ''):
+        raise ValueError("category and source are required")
+    if timestamp in (None, ''):
+        timestamp = datetime.now(timezone.utc)
+    elif not isinstance(timestamp, datetime):
+        timestamp = datetime.fromisoformat(str(timestamp))
+    # Stored as UTC; naive timestamps are taken to already be UTC
+    timestamp = to_utc_naive(timestamp).replace(tzinfo=timezone.utc)
+    return {
+        'value': float(value),
+        'category': str(category),
+        'source': str(source),
+        'timestamp': timestamp,
+    }
+
+
+def parse_points(body: bytes, content_type: str) -> List[Dict]:
+    """Parse a JSON array, NDJSON or CSV request body into row dicts"""
+    text = body.decode('utf-8')
+    content_type = (content_type or '').split(';')[0].strip().lower()
+
+    if content_type in ('application/x-ndjson', 'application/jsonl'):
+        raw = [json.loads(line) for line in text.splitlines() if line.strip()]
+    elif content_type == 'text/csv':
+        raw = list(csv.DictReader(io.StringIO(text)))
+    else:
+        raw = json.loads(text)
+        if not isinstance(raw, list):
+            raise ValueError("Expected a JSON array of data points")
+
+    if len(raw) > MAX_BATCH_POINTS:
+        raise ValueError(f"Batch exceeds {MAX_BATCH_POINTS} points")
+
+    points = []
+    for i, item in enumerate(raw):
+        try:
+            points.append(make_point(
+                item.get('value'), item.get('category'), item.get('source'), item.get('timestamp')
+            ))
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid data point at index {i}: {e}")
+    return points
+
+
+def insert_points(db: Session, points: List[Dict]) -> int:
+    """Write points with multi-row inserts and update rollups; the caller commits"""
+    table = DataPoint.__table__
+    for start in range(0, len(points), INSERT_CHUNK_SIZE):
+        db.execute(table.insert(), points[start:start + INSERT_CHUNK_SIZE])
+    apply_rollups(db, points)
+    return len(points)
+
+
+class DataPointWriteBuffer:
+    """Coalesces single-point writes into grouped multi-row inserts.
+
+    A background thread flushes when ``max_batch`` points are pending or
+    ``flush_interval`` seconds have passed. Producers block for up to
+    ``put_timeout`` seconds once ``max_pending`` points are queued and then
+    get ``BufferFull``, which the API turns into a 503 with Retry-After.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_batch: int = 500,
+        flush_interval: float = 0.05,
+        max_pending: int = 10000,
+        put_timeout: float = 1.0,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.put_timeout = put_timeout
+        self._pending: List[Dict] = []
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, point: Dict):
+        with self._cond:
+            if self._closed:
+                raise BufferFull("Write buffer is closed")
+            self._ensure_started()
+            deadline = time.monotonic() + self.put_timeout
+            while len(self._pending) >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    REJECTED.inc()
+                    raise BufferFull("Write buffer is full")
+                self._cond.wait(remaining)
+            self._pending.append(point)
+            DEPTH.set(len(self._pending))
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+    def flush(self):
+        """Synchronously write everything currently pending.
+
+        Also waits for batches the flusher thread has already taken, so every
+        point submitted before the call is written when it returns.
+        """
+        while True:
+            batch = self._take()
+            if not batch:
+                break
+            self._write(batch)
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight == 0)
+
+    def close(self):
+        """Stop the flusher thread after draining pending points"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="datapoint-flusher", daemon=True)
+            self._thread.start()
+
+    def _take(self) -> List[Dict]:
+        with self._cond:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            if batch:
+                self._in_flight += 1
+            DEPTH.set(len(self._pending))
+            # Wake producers waiting on a full buffer
+            self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.max_batch or self._closed,
+                    timeout=self.flush_interval,
+                )
+                if self._closed:
+                    return
+            batch = self._take()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict]):
+        started = time.perf_counter()
+        try:
+            for attempt in range(1, FLUSH_ATTEMPTS + 1):
+                try:
+                    self._insert(batch)
+                    FLUSHED_ROWS.inc(len(batch))
+                    return
+                except Exception as e:
+                    error = e
+                    logger.warning(f"Flush attempt {attempt} of {len(batch)} buffered data points failed: {e}")
+            # These points were already acknowledged with 202, so say plainly that they are lost
+            FAILED_ROWS.inc(len(batch))
+            logger.error(
+                f"Dropped {len(batch)} acknowledged data points after {FLUSH_ATTEMPTS} failed flushes: {error}"
+            )
+        finally:
+            FLUSH_SECONDS.observe(time.perf_counter() - started)
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def _insert(self, batch: List[Dict]):
+        db = self.session_factory()
+        try:
+            insert_points(db, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+_write_buffer: Optional[DataPointWriteBuffer] = None
+_write_buffer_lock = threading.Lock()
+
+
+def get_write_buffer() -> DataPointWriteBuffer:
+    """Process-wide write buffer on the default session factory"""
+    global _write_buffer
+    if _write_buffer is None:
+        with _write_buffer_lock:
+            if _write_buffer is None:
+                _write_buffer = DataPointWriteBuffer(SessionLocal)
+    return _write_buffer
+
+
+def close_write_buffer():
+    global _write_buffer
+    if _write_buffer is not None:
+        _write_buffer.close()
+        _write_buffer = None
@@ -0,0 +1,31 @@
+# app/db/leaderboard.py
+"""Top-N player leaderboards pushed down to the database as ORDER BY ... LIMIT."""
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.models import LEADERBOARD_CATEGORIES, WPLPlayerStats
+
+
+def top_players_query(
+    db: Session,
+    category: str = 'runs',
+    limit: int = 5,
+    team: Optional[str] = None,
+) -> List[WPLPlayerStats]:
+    """Fetch the top `limit` players for a category.
+
+    Each category column is indexed, and NULLs are filtered out rather than
+    sorted last, so the database can walk the index and stop after `limit`
+    rows. Ties are broken by id, matching ``get_top_players``.
+    """
+    if category not in LEADERBOARD_CATEGORIES:
+        raise ValueError(f"Unsupported category: {category}")
+
+    column = getattr(WPLPlayerStats, category)
+    order = column.desc() if LEADERBOARD_CATEGORIES[category] else column.asc()
+
+    query = db.query(WPLPlayerStats).filter(column.isnot(None))
+    if team is not None:
+        query = query.filter(WPLPlayerStats.team == team)
+    return query.order_by(order, WPLPlayerStats.id).limit(limit).all()
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Date
+import heapq
+from sqlalchemy import Column, Integer, String, DateTime, Float, Date, JSON, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 class DataPoint(Base):
     __tablename__ = "data_points"
+    __table_args__ = (
+        Index('ix_data_points_category_source_timestamp', 'category', 'source', 'timestamp'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
@@ -14,12 +18,35 @@ class DataPoint(Base):
     def __repr__(self):
         return f"<DataPoint(id={self.id}, timestamp={self.timestamp}, value={self.value})>"
 
+class DataPointRollup(Base):
+    """Pre-aggregated data points per time bucket, maintained on every write"""
+    __tablename__ = "data_point_rollups"
+    __table_args__ = (
+        UniqueConstraint('resolution', 'bucket_start', 'category', 'source', name='uq_data_point_rollup'),
+        Index('ix_data_point_rollups_lookup', 'resolution', 'category', 'source', 'bucket_start'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    resolution = Column(String, nullable=False)
+    # Naive UTC bucket start
+    bucket_start = Column(DateTime, nullable=False)
+    category = Column(String)
+    source = Column(String)
+    count = Column(Integer, nullable=False)
+    sum = Column(Float, nullable=False)
+    min = Column(Float)
+    max = Column(Float)
+
 class WPLMatch(Base):
     __tablename__ = "wpl_matches"
+    __table_args__ = (
+        # Natural key used by the importer to upsert instead of duplicating
+        UniqueConstraint('match_date', 'team1', 'team2', name='uq_wpl_match_key'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     match_date = Column(Date)
-    venue = Column(String)
+    venue = Column(String, index=True)
     team1 = Column(String)
     team2 = Column(String)
     winner = Column(String)
@@ -30,20 +57,77 @@ class WPLMatch(Base):
     team2_score = Column(Integer)
     team2_wickets = Column(Integer)
     team2_overs = Column(Float)
+    # Raw file a match was synced from via the processed store; NULL for CSV imports
+    source = Column(String, index=True)
 
 class WPLPlayerStats(Base):
     __tablename__ = "wpl_player_stats"
+    __table_args__ = (
+        UniqueConstraint('player_name', 'team', name='uq_wpl_player_team'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_name = Column(String)
-    team = Column(String)
+    team = Column(String, index=True)
     matches = Column(Integer)
-    runs = Column(Integer)
-    wickets = Column(Integer)
-    batting_average = Column(Float)
-    bowling_average = Column(Float)
-    strike_rate = Column(Float)
-    economy_rate = Column(Float)
+    # Leaderboard columns are indexed so ORDER BY ... LIMIT reads only `limit` rows
+    runs = Column(Integer, index=True)
+    wickets = Column(Integer, index=True)
+    batting_average = Column(Float, index=True)
+    bowling_average = Column(Float, index=True)
+    strike_rate = Column(Float, index=True)
+    economy_rate = Column(Float, index=True)
+    # Denominators of the averages; set when stats are derived from deliveries
+    balls_faced = Column(Integer)
+    dismissals = Column(Integer)
+    balls_bowled = Column(Integer)
+    runs_conceded = Column(Integer)
+
+class MatchSummary(Base):
+    """Single-row aggregate of wpl_matches, maintained by the importer"""
+    __tablename__ = "match_summary"
+
+    id = Column(Integer, primary_key=True)
+    total_matches = Column(Integer, nullable=False, default=0)
+    first_innings_runs = Column(Integer, nullable=False, default=0)
+    first_innings_count = Column(Integer, nullable=False, default=0)
+    second_innings_runs = Column(Integer, nullable=False, default=0)
+    second_innings_count = Column(Integer, nullable=False, default=0)
+    highest_score = Column(Integer)
+    venues = Column(JSON, nullable=False, default=list)
+    players_of_match = Column(JSON, nullable=False, default=list)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class WPLStanding(Base):
+    """One team's season standing after the matches up to ``as_of``.
+
+    Every match date of a season holds a row for each team that has played
+    by then, so the table as of any date is one indexed lookup.
+    """
+    __tablename__ = "wpl_standings"
+    __table_args__ = (
+        # Also the index for "latest snapshot on or before a date"
+        UniqueConstraint('season', 'as_of', 'team', name='uq_wpl_standing'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    season = Column(Integer, nullable=False)
+    as_of = Column(Date, nullable=False)
+    team = Column(String, nullable=False)
+    position = Column(Integer, nullable=False)
+    played = Column(Integer, nullable=False)
+    won = Column(Integer, nullable=False)
+    lost = Column(Integer, nullable=False)
+    no_result = Column(Integer, nullable=False)
+    points = Column(Integer, nullable=False)
+    # Net run rate inputs; overs are kept as balls so they add up exactly
+    runs_for = Column(Integer, nullable=False)
+    balls_faced = Column(Integer, nullable=False)
+    runs_against = Column(Integer, nullable=False)
+    balls_bowled = Column(Integer, nullable=False)
+    net_run_rate = Column(Float)
+    # Results of the last five matches, oldest first: W, L or N
+    form = Column(String, nullable=False)
 
 # Analytics functions
 def calculate_team_stats(matches):
@@ -83,21 +167,35 @@ def calculate_team_stats(matches):
             team_stats[match.team1]['losses'] += 1
             
         # Update runs and wickets
-        team_stats[match.team1]['total_runs'] += match.team1_score
-        team_stats[match.team1]['total_wickets'] += match.team2_wickets
-        team_stats[match.team2]['total_runs'] += match.team2_score
-        team_stats[match.team2]['total_wickets'] += match.team1_wickets
+        team_stats[match.team1]['total_runs'] += match.team1_score or 0
+        team_stats[match.team1]['total_wickets'] += match.team2_wickets or 0
+        team_stats[match.team2]['total_runs'] += match.team2_score or 0
+        team_stats[match.team2]['total_wickets'] += match.team1_wickets or 0
     
     return team_stats
 
-def get_top_players(player_stats, category='runs', limit=5):
-    """Get top players based on different categories"""
-    if category == 'runs':
-        return sorted(player_stats, key=lambda x: x.runs, reverse=True)[:limit]
-    elif category == 'wickets':
-        return sorted(player_stats, key=lambda x: x.wickets, reverse=True)[:limit]
-    elif category == 'batting_average':
-        return sorted(player_stats, key=lambda x: x.batting_average or 0, reverse=True)[:limit]
-    elif category == 'bowling_average':
-        return sorted(player_stats, key=lambda x: x.bowling_average or float('inf'))[:limit]
-    return []
\ No newline at end of file
+# Leaderboard category -> True when higher is better
+LEADERBOARD_CATEGORIES = {
+    'runs': True,
+    'wickets': True,
+    'batting_average': True,
+    'bowling_average': False,
+    'strike_rate': True,
+    'economy_rate': False,
+}
+
+def get_top_players(player_stats, category='runs', limit=5, team=None):
+    """Get top players based on different categories.
+
+    Uses a bounded heap, so only `limit` players are kept while scanning.
+    Players without a value for the category are skipped.
+    """
+    if category not in LEADERBOARD_CATEGORIES:
+        return []
+
+    candidates = (
+        p for p in player_stats
+        if getattr(p, category) is not None and (team is None or p.team == team)
+    )
+    select_top = heapq.nlargest if LEADERBOARD_CATEGORIES[category] else heapq.nsmallest
+    return select_top(limit, candidates, key=lambda p: getattr(p, category))
\ No newline at end of file
@@ -0,0 +1,215 @@
+# app/db/player_stats.py
+"""``wpl_player_stats`` maintained from the ball-by-ball deliveries store.
+
+Every row keeps its additive counts (runs, balls faced, dismissals, balls
+bowled, runs conceded, wickets, matches) next to the averages derived from
+them. Importing a match adds the counts of its deliveries and subtracts
+those of any earlier copy, so only the players in that match are read and
+rewritten. ``rebuild_player_stats`` recomputes the table from the whole
+store, e.g. for rows entered by hand before deliveries were kept.
+
+Because an import subtracts the copy of a match it read from the store,
+two imports of the same match must not overlap: they are serialized by a
+process lock and, on Postgres, a transaction-level advisory lock shared
+by every worker.
+
+Usage: python -m app.db.player_stats rebuild | import <deliveries.csv>
+"""
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Dict, Optional, Union
+
+import pandas as pd
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.models import WPLPlayerStats
+from app.db.wpl_import import to_records
+from app.utils.deliveries_store import normalise_deliveries, read_deliveries, replacing_matches
+from app.utils.player_stats import (
+    COUNT_COLUMNS,
+    KEY,
+    STAT_COLUMNS,
+    combine_counts,
+    empty_counts,
+    player_counts,
+    player_stats_table,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns player_counts reads from the store
+COUNT_INPUTS = [
+    'match_id', 'batting_team', 'bowling_team', 'batter', 'non_striker', 'bowler',
+    'runs', 'extras', 'extra_type', 'dismissal', 'player_dismissed',
+]
+# Keys per IN (...) clause, well under SQLite's bound-parameter limit
+KEY_CHUNK_SIZE = 400
+# pg_advisory_xact_lock key shared by everything that writes the counts
+ADVISORY_LOCK_KEY = 0x77706c01
+
+_import_lock = threading.Lock()
+
+
+@dataclass
+class DeliveriesImportReport:
+    matches: int
+    deliveries: int
+    replaced: int
+    players: int
+    seconds: float
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), 'seconds': round(self.seconds, 4)}
+
+
+def _chunks(keys: list):
+    for start in range(0, len(keys), KEY_CHUNK_SIZE):
+        yield keys[start:start + KEY_CHUNK_SIZE]
+
+
+def _key_filter(keys: list):
+    return tuple_(WPLPlayerStats.player_name, WPLPlayerStats.team).in_(keys)
+
+
+def load_counts(db: Session, keys) -> pd.DataFrame:
+    """Stored counts of the given (player_name, team) keys; missing counts read as 0"""
+    keys = list(keys)
+    columns = [getattr(WPLPlayerStats, c) for c in KEY + COUNT_COLUMNS]
+    rows = [row for chunk in _chunks(keys) for row in db.query(*columns).filter(_key_filter(chunk))]
+    if not rows:
+        return empty_counts()
+    counts = pd.DataFrame(rows, columns=KEY + COUNT_COLUMNS).set_index(KEY)
+    return counts.fillna(0).astype('int64')
+
+
+def _write_rows(db: Session, table: pd.DataFrame):
+    records = to_records(table)
+    if not records:
+        return
+    stats = WPLPlayerStats.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(stats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=KEY,
+            set_={c: stmt.excluded[c] for c in COUNT_COLUMNS + STAT_COLUMNS},
+        )
+        db.execute(stmt, records)
+        return
+
+    for chunk in _chunks([tuple(r[k] for k in KEY) for r in records]):
+        db.query(WPLPlayerStats).filter(_key_filter(chunk)).delete(synchronize_session=False)
+    db.execute(stats.insert(), records)
+
+
+def lock_player_stats(db: Session):
+    """Block other workers' imports until this transaction ends (Postgres only)"""
+    if db.get_bind().dialect.name == 'postgresql':
+        db.execute(select(func.pg_advisory_xact_lock(ADVISORY_LOCK_KEY)))
+
+
+def apply_counts(db: Session, delta: pd.DataFrame) -> int:
+    """Add ``delta`` to the stored counts and re-derive those players' stats (no commit).
+
+    Players left with no counts at all are deleted. Returns the number of
+    players touched.
+    """
+    delta = delta[(delta != 0).any(axis=1)]
+    if delta.empty:
+        return 0
+    counts = combine_counts(load_counts(db, delta.index), delta)
+    _write_rows(db, player_stats_table(counts))
+
+    emptied = list(delta.index.difference(counts.index))
+    for chunk in _chunks(emptied):
+        db.query(WPLPlayerStats).filter(_key_filter(chunk)).delete(synchronize_session=False)
+    return len(delta)
+
+
+def rebuild_player_stats(db: Session, store_path: Optional[Path] = None) -> int:
+    """Replace every player row with stats computed from the whole store (no commit)"""
+    lock_player_stats(db)
+    counts = player_counts(read_deliveries(store_path, columns=COUNT_INPUTS))
+    db.query(WPLPlayerStats).delete(synchronize_session=False)
+    _write_rows(db, player_stats_table(counts))
+    return len(counts)
+
+
+def import_deliveries(
+    db: Session,
+    source: Union[str, IO, pd.DataFrame],
+    store_path: Optional[Path] = None,
+) -> DeliveriesImportReport:
+    """Store whole matches of deliveries and fold them into ``wpl_player_stats``.
+
+    Re-importing a match replaces its deliveries and corrects the stats by
+    the difference, so imports are idempotent. The database changes are
+    flushed, the store files swapped in and the transaction committed; if
+    either the write or the commit fails, the previous store files are put
+    back and the transaction rolled back, so both stay as they were.
+    """
+    started = time.perf_counter()
+    if not isinstance(source, pd.DataFrame):
+        # Cricsheet's over.ball would otherwise lose trailing zeros as a float
+        source = pd.read_csv(source, dtype={'ball': str})
+    df = normalise_deliveries(source)
+    match_ids = df['match_id'].unique()
+    counts = player_counts(df)
+
+    # The old copy must not change between reading it and committing its replacement
+    with _import_lock:
+        try:
+            lock_player_stats(db)
+            previous = read_deliveries(store_path, columns=COUNT_INPUTS, match_ids=match_ids)
+            # Players only in the old copy of a match come out with negative counts
+            delta = combine_counts(counts, player_counts(previous), sign=-1)
+            players = apply_counts(db, delta)
+            db.flush()
+            # The store only keeps the new matches if the commit succeeds
+            with replacing_matches(df, store_path):
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    report = DeliveriesImportReport(
+        matches=len(match_ids),
+        deliveries=len(df),
+        replaced=len(previous),
+        players=players,
+        seconds=time.perf_counter() - started,
+    )
+    logger.info(f"Imported {report.deliveries} deliveries from {report.matches} matches "
+                f"in {report.seconds:.3f}s, {report.players} players updated")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.api.cache import WPL_NAMESPACE, get_response_cache
+    from app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain wpl_player_stats from ball-by-ball deliveries")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('rebuild', help="recompute every player from the deliveries store")
+    import_parser = commands.add_parser('import', help="add a deliveries CSV to the store and the stats")
+    import_parser.add_argument('csv')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with SessionLocal() as session:
+        if args.command == 'rebuild':
+            players = rebuild_player_stats(session)
+            session.commit()
+            logger.info(f"Rebuilt stats for {players} players")
+        else:
+            import_deliveries(session, args.csv)
+    # /wpl/top-players reads these stats
+    get_response_cache().bump_version(WPL_NAMESPACE)
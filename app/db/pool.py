@@ -0,0 +1,108 @@
+# app/db/pool.py
+"""Connection pool settings and instrumentation for the SQLAlchemy engines.
+
+Every setting comes from the environment (and so from .env):
+
+- DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds to wait for a connection)
+- DB_POOL_RECYCLE (seconds before a connection is replaced), DB_POOL_PRE_PING
+- DB_STATEMENT_TIMEOUT_MS (PostgreSQL statement_timeout; 0 disables it)
+"""
+import os
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.metrics import REGISTRY
+
+CHECKOUT_SECONDS = REGISTRY.histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled connection", ("pool",)
+)
+IN_USE = REGISTRY.gauge(
+    "db_pool_connections_in_use", "Connections currently checked out of the pool", ("pool",)
+)
+OVERFLOW = REGISTRY.counter(
+    "db_pool_overflow_total", "Connections opened beyond pool_size", ("pool",)
+)
+TIMEOUTS = REGISTRY.counter(
+    "db_pool_timeouts_total", "Checkouts that gave up waiting for a connection", ("pool",)
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+class _InstrumentedPoolMixin:
+    """Times checkouts and counts overflow/timeouts; ``metrics_name`` labels the pool"""
+    metrics_name = "primary"
+
+    def _do_get(self):
+        overflow_before = self._overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            TIMEOUTS.inc(pool=self.metrics_name)
+            raise
+        finally:
+            CHECKOUT_SECONDS.observe(time.perf_counter() - started, pool=self.metrics_name)
+        if self._overflow > overflow_before and self._overflow > 0:
+            OVERFLOW.inc(pool=self.metrics_name)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncPool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _named_pool_class(base, name: str):
+    # A subclass per name survives pool.recreate(), which reuses the class
+    return type(f"{base.__name__}_{name}", (base,), {"metrics_name": name})
+
+
+def engine_options(url: str, name: str, is_async: bool = False) -> Dict:
+    """create_engine/create_async_engine keyword arguments for ``url``"""
+    options = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True)}
+    if url.startswith("sqlite"):
+        # SQLite keeps SQLAlchemy's default pool and has no statement timeout
+        return options
+
+    options.update(
+        poolclass=_named_pool_class(InstrumentedAsyncPool if is_async else InstrumentedQueuePool, name),
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+    )
+
+    statement_timeout = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    if statement_timeout and url.startswith("postgresql"):
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
+def instrument_engine(engine, name: str):
+    """Track connections in use for ``engine`` (a sync Engine or AsyncEngine.sync_engine)"""
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        IN_USE.inc(pool=name)
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        IN_USE.dec(pool=name)
+
+    return engine
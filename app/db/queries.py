@@ -0,0 +1,82 @@
+# app/db/queries.py
+"""Analytics computed inside the database rather than over ORM objects."""
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, extract, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.db.models import WPLMatch, calculate_team_stats
+
+
+def match_filters(
+    season: Optional[int] = None,
+    venue: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List:
+    """Build WHERE clauses shared by the match analytics queries"""
+    filters = []
+    if season is not None:
+        filters.append(extract('year', WPLMatch.match_date) == season)
+    if venue is not None:
+        filters.append(WPLMatch.venue == venue)
+    if start_date is not None:
+        filters.append(WPLMatch.match_date >= start_date)
+    if end_date is not None:
+        filters.append(WPLMatch.match_date <= end_date)
+    return filters
+
+
+def team_stats_query(db: Session, **filters) -> Dict[str, Dict[str, int]]:
+    """Per-team matches, wins, losses, runs and wickets via UNION ALL + GROUP BY.
+
+    Returns the same shape as ``calculate_team_stats``.
+    """
+    m = WPLMatch.__table__.c
+    where = match_filters(**filters)
+
+    def side(team, opponent, runs, wickets_taken):
+        return select(
+            team.label('team'),
+            literal(1).label('played'),
+            case((m.winner == team, 1), else_=0).label('won'),
+            case((m.winner == opponent, 1), else_=0).label('lost'),
+            runs.label('runs'),
+            wickets_taken.label('wickets'),
+        ).where(*where)
+
+    sides = union_all(
+        side(m.team1, m.team2, m.team1_score, m.team2_wickets),
+        side(m.team2, m.team1, m.team2_score, m.team1_wickets),
+    ).subquery()
+
+    rows = db.execute(
+        select(
+            sides.c.team,
+            func.sum(sides.c.played),
+            func.sum(sides.c.won),
+            func.sum(sides.c.lost),
+            func.coalesce(func.sum(sides.c.runs), 0),
+            func.coalesce(func.sum(sides.c.wickets), 0),
+        )
+        .group_by(sides.c.team)
+        .order_by(sides.c.team)
+    )
+
+    return {
+        team: {
+            'matches': int(matches),
+            'wins': int(wins),
+            'losses': int(losses),
+            'total_runs': int(runs),
+            'total_wickets': int(wickets),
+        }
+        for team, matches, wins, losses, runs, wickets in rows
+    }
+
+
+def team_stats_python(db: Session, **filters) -> Dict[str, Dict[str, int]]:
+    """Reference implementation: load the matches and aggregate in Python"""
+    matches = db.query(WPLMatch).filter(*match_filters(**filters)).all()
+    return calculate_team_stats(matches)
@@ -0,0 +1,212 @@
+# app/db/rollups.py
+"""Time-bucketed rollups over data_points.
+
+``data_point_rollups`` holds count/sum/min/max per (resolution, bucket,
+category, source). Every write path folds its points in with an upsert,
+so range queries read one row per bucket instead of scanning raw points.
+Buckets are aligned to UTC, and a start/end range selects every bucket it
+touches, whole, whichever method answers it.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.models import DataPoint, DataPointRollup
+
+RESOLUTIONS = ('minute', 'hour', 'day')
+BUCKET_WIDTHS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+REBUILD_BATCH_SIZE = 10000
+
+# strftime patterns used to bucket raw rows on SQLite
+_SQLITE_BUCKET_FORMATS = {
+    'minute': '%Y-%m-%d %H:%M:00',
+    'hour': '%Y-%m-%d %H:00:00',
+    'day': '%Y-%m-%d 00:00:00',
+}
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normalise a timestamp to naive UTC, the form buckets are stored in"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _utc(value: datetime) -> datetime:
+    """Aware UTC timestamp for filtering the raw timestamptz column"""
+    return to_utc_naive(value).replace(tzinfo=timezone.utc)
+
+
+def truncate(value: datetime, resolution: str) -> datetime:
+    value = to_utc_naive(value).replace(second=0, microsecond=0)
+    if resolution in ('hour', 'day'):
+        value = value.replace(minute=0)
+    if resolution == 'day':
+        value = value.replace(hour=0)
+    return value
+
+
+def _aggregate(points: Iterable[Dict]) -> List[Dict]:
+    buckets = defaultdict(lambda: [0, 0.0, None, None])
+    for point in points:
+        value = point['value']
+        for resolution in RESOLUTIONS:
+            key = (resolution, truncate(point['timestamp'], resolution), point['category'], point['source'])
+            state = buckets[key]
+            state[0] += 1
+            state[1] += value
+            state[2] = value if state[2] is None else min(state[2], value)
+            state[3] = value if state[3] is None else max(state[3], value)
+
+    return [
+        {
+            'resolution': resolution,
+            'bucket_start': bucket_start,
+            'category': category,
+            'source': source,
+            'count': count,
+            'sum': total,
+            'min': minimum,
+            'max': maximum,
+        }
+        for (resolution, bucket_start, category, source), (count, total, minimum, maximum) in buckets.items()
+    ]
+
+
+def apply_rollups(db: Session, points: Iterable[Dict]):
+    """Fold newly written points into the rollup tables (no commit)"""
+    rows = _aggregate(points)
+    if not rows:
+        return
+
+    table = DataPointRollup.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        # SQLite's scalar min()/max() take several arguments like LEAST/GREATEST
+        least, greatest = (func.least, func.greatest) if dialect == 'postgresql' else (func.min, func.max)
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['resolution', 'bucket_start', 'category', 'source'],
+            set_={
+                'count': table.c.count + stmt.excluded.count,
+                'sum': table.c.sum + stmt.excluded.sum,
+                'min': least(table.c.min, stmt.excluded.min),
+                'max': greatest(table.c.max, stmt.excluded.max),
+            },
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        existing = db.query(DataPointRollup).filter_by(
+            resolution=row['resolution'],
+            bucket_start=row['bucket_start'],
+            category=row['category'],
+            source=row['source'],
+        ).with_for_update().one_or_none()
+        if existing is None:
+            db.add(DataPointRollup(**row))
+        else:
+            existing.count += row['count']
+            existing.sum += row['sum']
+            existing.min = min(existing.min, row['min'])
+            existing.max = max(existing.max, row['max'])
+
+
+def rebuild_rollups(db: Session):
+    """Recompute every rollup from raw points, e.g. for data written before rollups existed"""
+    db.query(DataPointRollup).delete()
+    result = db.execute(
+        select(DataPoint.timestamp, DataPoint.value, DataPoint.category, DataPoint.source)
+        .where(DataPoint.timestamp.isnot(None), DataPoint.value.isnot(None))
+        .execution_options(stream_results=True)
+    )
+    for partition in result.partitions(REBUILD_BATCH_SIZE):
+        apply_rollups(db, [dict(row._mapping) for row in partition])
+
+
+def _result(bucket_start, count, total, minimum, maximum) -> Dict:
+    if isinstance(bucket_start, str):
+        bucket_start = datetime.fromisoformat(bucket_start)
+    return {
+        'bucket': bucket_start,
+        'count': int(count),
+        'sum': total,
+        'min': minimum,
+        'max': maximum,
+        'avg': total / count if count else None,
+    }
+
+
+def rollup_query(
+    db: Session,
+    resolution: str = 'hour',
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict]:
+    """count/sum/min/max/avg per bucket, read from the rollup table"""
+    r = DataPointRollup
+    query = db.query(
+        r.bucket_start, func.sum(r.count), func.sum(r.sum), func.min(r.min), func.max(r.max)
+    ).filter(r.resolution == resolution)
+    if category is not None:
+        query = query.filter(r.category == category)
+    if source is not None:
+        query = query.filter(r.source == source)
+    if start is not None:
+        query = query.filter(r.bucket_start >= truncate(start, resolution))
+    if end is not None:
+        query = query.filter(r.bucket_start <= truncate(end, resolution))
+    rows = query.group_by(r.bucket_start).order_by(r.bucket_start)
+    return [_result(*row) for row in rows]
+
+
+def _raw_bucket(db: Session, resolution: str):
+    if db.get_bind().dialect.name == 'postgresql':
+        return func.date_trunc(resolution, func.timezone('UTC', DataPoint.timestamp))
+    return func.strftime(_SQLITE_BUCKET_FORMATS[resolution], DataPoint.timestamp)
+
+
+def raw_rollup_query(
+    db: Session,
+    resolution: str = 'hour',
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict]:
+    """Same result as ``rollup_query`` computed from raw points.
+
+    Filters hit the (category, source, timestamp) index. Bucketing is
+    implemented for PostgreSQL and SQLite.
+    """
+    bucket = _raw_bucket(db, resolution).label('bucket')
+    query = db.query(
+        bucket,
+        func.count(DataPoint.value),
+        func.sum(DataPoint.value),
+        func.min(DataPoint.value),
+        func.max(DataPoint.value),
+    ).filter(DataPoint.value.isnot(None))
+    if category is not None:
+        query = query.filter(DataPoint.category == category)
+    if source is not None:
+        query = query.filter(DataPoint.source == source)
+    if start is not None:
+        query = query.filter(DataPoint.timestamp >= _utc(truncate(start, resolution)))
+    if end is not None:
+        # The whole bucket containing ``end``, as rollup_query returns it
+        query = query.filter(DataPoint.timestamp < _utc(truncate(end, resolution) + BUCKET_WIDTHS[resolution]))
+    rows = query.group_by(bucket).order_by(bucket)
+    return [_result(*row) for row in rows]
@@ -0,0 +1,147 @@
+# app/db/schema.py
+"""Create and upgrade the database schema as an explicit step.
+
+The API no longer touches the database at import time. Run
+``python -m app.db.schema`` before starting workers (or set
+DB_CREATE_SCHEMA=1 to run it from the app's startup hook).
+
+``create_all`` only creates missing tables, so ``upgrade_schema`` also
+adds columns, unique keys and indexes that models gained after their
+table was created: new columns are added as nullable and unique
+constraints as unique indexes of the same name, which ON CONFLICT accepts
+on both SQLite and Postgres. Anything else (type changes, dropped
+columns) is left alone.
+
+Each statement runs in its own transaction, so one failure does not roll
+back the others. Tables written by older importers can hold duplicate
+keys; their unique index is skipped and reported unless ``dedupe`` is
+set, which keeps the newest row (highest id) of each key, as a re-import
+would have.
+
+Usage: python -m app.db.schema [--dedupe]
+"""
+import argparse
+import logging
+from typing import List, Optional
+
+from sqlalchemy import UniqueConstraint, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db import models  # noqa: F401 - registers tables
+from app.db.database import Base, engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _column_ddl(engine: Engine, column) -> str:
+    column_type = column.type.compile(dialect=engine.dialect)
+    return f"ALTER TABLE {column.table.name} ADD COLUMN {column.name} {column_type}"
+
+
+class SchemaUpgradeError(Exception):
+    """Raised after an upgrade that had to skip some statements"""
+
+    def __init__(self, skipped: List[str]):
+        self.skipped = skipped
+        super().__init__("Schema upgrade incomplete: " + "; ".join(skipped))
+
+
+def _key_filter(columns: List[str]) -> str:
+    # Rows with a NULL in the key never conflict in a unique index
+    return " AND ".join(f"{c} IS NOT NULL" for c in columns)
+
+
+def duplicate_keys(engine: Engine, table: str, columns: List[str]) -> int:
+    """Rows that would have to go before a unique index on ``columns`` can be created"""
+    keys = ", ".join(columns)
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(
+            f"SELECT COALESCE(SUM(n - 1), 0) FROM (SELECT COUNT(*) AS n FROM {table} "
+            f"WHERE {_key_filter(columns)} GROUP BY {keys} HAVING COUNT(*) > 1) AS duplicates"
+        ).scalar()
+
+
+def _dedupe_statement(table: str, columns: List[str]) -> str:
+    where = _key_filter(columns)
+    return (
+        f"DELETE FROM {table} WHERE {where} AND id NOT IN "
+        f"(SELECT MAX(id) FROM {table} WHERE {where} GROUP BY {', '.join(columns)})"
+    )
+
+
+def upgrade_schema(engine: Optional[Engine] = None, dedupe: bool = False) -> List[str]:
+    """Create missing tables, columns, unique keys and indexes; returns the statements that were run.
+
+    Statements that cannot run are logged and skipped, then reported
+    together in a ``SchemaUpgradeError`` once the others are applied.
+    """
+    engine = engine or default_engine
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    Base.metadata.create_all(bind=engine)
+
+    statements, skipped = [], []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {c['name'] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present:
+                statements.append(_column_ddl(engine, column))
+
+        indexes = inspector.get_indexes(table.name)
+        unique_keys = {c['name'] for c in inspector.get_unique_constraints(table.name)}
+        unique_keys |= {i['name'] for i in indexes if i.get('unique')}
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint) and constraint.name not in unique_keys:
+                columns = [c.name for c in constraint.columns]
+                index = f"CREATE UNIQUE INDEX {constraint.name} ON {table.name} ({', '.join(columns)})"
+                duplicates = duplicate_keys(engine, table.name, columns)
+                if duplicates and not dedupe:
+                    logger.error(
+                        f"{table.name} has {duplicates} rows duplicating a ({', '.join(columns)}) key; "
+                        f"skipping {constraint.name}. Run python -m app.db.schema --dedupe to keep the newest of each"
+                    )
+                    skipped.append(f"{index} ({duplicates} duplicate rows)")
+                    continue
+                if duplicates:
+                    statements.append(_dedupe_statement(table.name, columns))
+                statements.append(index)
+
+        # Lookup indexes models gained later, e.g. ix_wpl_matches_venue
+        present_indexes = {i['name'] for i in indexes} | unique_keys
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if not index.unique and index.name not in present_indexes:
+                columns = ', '.join(c.name for c in index.columns)
+                statements.append(f"CREATE INDEX {index.name} ON {table.name} ({columns})")
+
+    applied = []
+    for statement in statements:
+        logger.info(statement)
+        try:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(statement)
+        except SQLAlchemyError as e:
+            logger.error(f"Schema statement failed: {statement}: {e}")
+            skipped.append(statement)
+            continue
+        applied.append(statement)
+    if skipped:
+        raise SchemaUpgradeError(skipped)
+    return applied
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and upgrade the database schema")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="delete rows duplicating a new unique key, keeping the newest of each")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        applied = upgrade_schema(dedupe=args.dedupe)
+    except SchemaUpgradeError as e:
+        logger.error(str(e))
+        raise SystemExit(1)
+    logger.info(f"Schema up to date ({len(applied)} changes applied)")
@@ -0,0 +1,171 @@
+# app/db/standings.py
+"""Season points tables with net run rate and last-five form.
+
+``wpl_standings`` keeps the table of every season as it stood after each
+of its match dates. The importer passes each written batch to
+``update_standings``: for every season the batch touches, the snapshot
+from before the batch's earliest date is the starting point and only the
+matches from that date on are replayed, so a new match day costs that
+day's matches however far the season has run. Updated and back-dated
+matches are handled the same way, from their own date.
+
+Reading the table as of a date is a lookup of the latest snapshot date on
+or before it, then that snapshot's rows. A season is the calendar year of
+its matches, as in ``app.db.queries.match_filters``. The points-table
+arithmetic itself is in ``app.utils.standings``.
+
+Usage: python -m app.db.standings    (rebuild every season)
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import extract, func
+from sqlalchemy.orm import Session
+
+from app.db.models import WPLMatch, WPLStanding
+from app.utils.standings import (  # noqa: F401 - innings_balls is re-exported
+    MATCH_FIELDS,
+    RECORD_COLUMNS,
+    TeamRecord,
+    innings_balls,
+    ranked,
+    replay,
+    standings_dict,
+)
+
+MATCH_COLUMNS = tuple(getattr(WPLMatch, field) for field in MATCH_FIELDS)
+
+
+def _season_matches(db: Session, season: int, since: Optional[date] = None, until: Optional[date] = None):
+    start, end = date(season, 1, 1), date(season, 12, 31)
+    return (
+        db.query(*MATCH_COLUMNS)
+        .filter(WPLMatch.match_date >= max(since or start, start), WPLMatch.match_date <= min(until or end, end))
+        .order_by(WPLMatch.match_date, WPLMatch.id)
+    )
+
+
+def _snapshot_rows(season: int, as_of: date, table: Dict[str, TeamRecord]) -> List[Dict]:
+    return [
+        {
+            'season': season,
+            'as_of': as_of,
+            'team': record.team,
+            'position': position,
+            'net_run_rate': record.net_run_rate,
+            **{c: getattr(record, c) for c in RECORD_COLUMNS},
+        }
+        for position, record in enumerate(ranked(table), start=1)
+    ]
+
+
+def _snapshot_date(db: Session, season: int, before: Optional[date] = None, until: Optional[date] = None):
+    query = db.query(func.max(WPLStanding.as_of)).filter(WPLStanding.season == season)
+    if before is not None:
+        query = query.filter(WPLStanding.as_of < before)
+    if until is not None:
+        query = query.filter(WPLStanding.as_of <= until)
+    return query.scalar()
+
+
+def _snapshot(db: Session, season: int, as_of: date) -> List[WPLStanding]:
+    return (
+        db.query(WPLStanding)
+        .filter(WPLStanding.season == season, WPLStanding.as_of == as_of)
+        .order_by(WPLStanding.position)
+        .all()
+    )
+
+
+def replay_season(db: Session, season: int, since: Optional[date] = None) -> int:
+    """Rewrite the season's snapshots from ``since`` (default: its first match) on; returns rows written"""
+    table = {}
+    if since is not None:
+        previous = _snapshot_date(db, season, before=since)
+        if previous is not None:
+            table = {row.team: TeamRecord.from_row(row) for row in _snapshot(db, season, previous)}
+
+    stale = db.query(WPLStanding).filter(WPLStanding.season == season)
+    if since is not None:
+        stale = stale.filter(WPLStanding.as_of >= since)
+    stale.delete(synchronize_session=False)
+
+    rows = []
+    for day in replay(table, _season_matches(db, season, since)):
+        rows.extend(_snapshot_rows(season, day, table))
+    if rows:
+        db.execute(WPLStanding.__table__.insert(), rows)
+    return len(rows)
+
+
+def update_standings(db: Session, records: Iterable[Dict]):
+    """Replay the seasons of freshly written match records from their earliest date (no commit)"""
+    since = {}
+    for record in records:
+        day = record.get('match_date')
+        if day is not None:
+            since[day.year] = min(since.get(day.year, day), day)
+    for season in sorted(since):
+        replay_season(db, season, since[season])
+
+
+def refresh_standings(db: Session):
+    """Rebuild every season's snapshots from wpl_matches (no commit)"""
+    db.query(WPLStanding).delete(synchronize_session=False)
+    seasons = db.query(extract('year', WPLMatch.match_date)).filter(WPLMatch.match_date.isnot(None)).distinct()
+    for (season,) in seasons.all():
+        replay_season(db, int(season))
+
+
+def _latest_season(db: Session) -> Optional[int]:
+    season = db.query(func.max(WPLStanding.season)).scalar()
+    if season is None:
+        latest = db.query(func.max(WPLMatch.match_date)).scalar()
+        season = latest.year if latest is not None else None
+    return season
+
+
+def _compute_table(db: Session, season: int, as_of: Optional[date]) -> Tuple[Optional[date], List[TeamRecord]]:
+    """The table replayed from wpl_matches without writing, for seasons that have no snapshots"""
+    table, last = {}, None
+    for last in replay(table, _season_matches(db, season, until=as_of)):
+        pass
+    return last, ranked(table)
+
+
+def read_standings(db: Session, season: Optional[int] = None, as_of: Optional[date] = None) -> Dict:
+    """The points table of ``season`` after the last match on or before ``as_of``.
+
+    ``season`` defaults to the year of ``as_of``, or to the latest season.
+    Seasons no import has built snapshots for yet are replayed without
+    writing, so this is safe to run on a read replica.
+    """
+    if season is None:
+        season = as_of.year if as_of is not None else _latest_season(db)
+    if season is None:
+        return {'season': None, 'as_of': None, 'standings': []}
+
+    snapshot_date = _snapshot_date(db, season, until=as_of)
+    if snapshot_date is not None:
+        records = [TeamRecord.from_row(row) for row in _snapshot(db, season, snapshot_date)]
+    elif _snapshot_date(db, season) is None:
+        snapshot_date, records = _compute_table(db, season, as_of)
+    else:
+        # ``as_of`` is before the season's first match
+        records = []
+
+    return standings_dict(season, snapshot_date, records)
+
+
+if __name__ == "__main__":
+    import logging
+
+    from app.api.cache import WPL_NAMESPACE, get_response_cache
+    from app.db.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with SessionLocal() as session:
+        refresh_standings(session)
+        session.commit()
+    get_response_cache().bump_version(WPL_NAMESPACE)
+    logging.getLogger(__name__).info("Rebuilt standings for every season")
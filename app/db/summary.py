@@ -0,0 +1,175 @@
+# app/db/summary.py
+"""Materialized match summary backing /wpl/match-analysis.
+
+The importer applies each batch of newly inserted matches to the single
+``match_summary`` row, so reading the analysis is a primary-key lookup.
+Updates to existing matches cannot be applied incrementally (a maximum
+cannot be decremented), so those trigger a full ``refresh_summary``.
+Reads never write, so they can be served from a read replica.
+"""
+from typing import Dict, Iterable
+
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import MatchSummary, WPLMatch
+
+SUMMARY_ID = 1
+STREAM_BATCH_SIZE = 1000
+
+
+def _get_summary_row(db: Session, lock: bool = False) -> MatchSummary:
+    query = db.query(MatchSummary).filter(MatchSummary.id == SUMMARY_ID)
+    if lock:
+        # Serialises concurrent imports on databases that support row locks
+        query = query.with_for_update()
+    return query.one_or_none()
+
+
+def _empty_row() -> MatchSummary:
+    return MatchSummary(
+        id=SUMMARY_ID,
+        total_matches=0,
+        first_innings_runs=0,
+        first_innings_count=0,
+        second_innings_runs=0,
+        second_innings_count=0,
+        highest_score=None,
+        venues=[],
+        players_of_match=[],
+    )
+
+
+def _max(*values):
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+def apply_new_matches(db: Session, records: Iterable[Dict]):
+    """Fold newly inserted match records into the summary row (no commit)"""
+    records = list(records)
+    if not records:
+        return
+
+    row = _get_summary_row(db, lock=True)
+    if row is None:
+        # No summary yet: build it from the table, which already holds `records`
+        refresh_summary(db)
+        return
+
+    first = [r['team1_score'] for r in records if r.get('team1_score') is not None]
+    second = [r['team2_score'] for r in records if r.get('team2_score') is not None]
+
+    row.total_matches += len(records)
+    row.first_innings_runs += sum(first)
+    row.first_innings_count += len(first)
+    row.second_innings_runs += sum(second)
+    row.second_innings_count += len(second)
+    row.highest_score = _max(row.highest_score, *first, *second)
+    # Reassign rather than mutate so the JSON columns are flagged dirty
+    row.venues = sorted(set(row.venues) | {r['venue'] for r in records if r.get('venue')})
+    row.players_of_match = sorted(
+        set(row.players_of_match) | {r['player_of_match'] for r in records if r.get('player_of_match')}
+    )
+
+
+def _compute_summary(db: Session) -> MatchSummary:
+    """Aggregate wpl_matches into a transient (unsaved) summary row"""
+    (total, first_runs, first_count, second_runs, second_count,
+     first_max, second_max) = db.query(
+        func.count(WPLMatch.id),
+        func.coalesce(func.sum(WPLMatch.team1_score), 0),
+        func.count(WPLMatch.team1_score),
+        func.coalesce(func.sum(WPLMatch.team2_score), 0),
+        func.count(WPLMatch.team2_score),
+        func.max(WPLMatch.team1_score),
+        func.max(WPLMatch.team2_score),
+    ).one()
+    venues = [v for (v,) in db.query(distinct(WPLMatch.venue)) if v]
+    players = [p for (p,) in db.query(distinct(WPLMatch.player_of_match)) if p]
+
+    row = _empty_row()
+    row.total_matches = total
+    row.first_innings_runs = first_runs
+    row.first_innings_count = first_count
+    row.second_innings_runs = second_runs
+    row.second_innings_count = second_count
+    row.highest_score = _max(first_max, second_max)
+    row.venues = sorted(venues)
+    row.players_of_match = sorted(players)
+    return row
+
+
+def refresh_summary(db: Session) -> MatchSummary:
+    """Recompute the summary row from wpl_matches (no commit)"""
+    computed = _compute_summary(db)
+    row = _get_summary_row(db, lock=True)
+    if row is None:
+        row = computed
+        db.add(row)
+    else:
+        for column in MatchSummary.__table__.columns.keys():
+            if column not in ('id', 'updated_at'):
+                setattr(row, column, getattr(computed, column))
+    return row
+
+
+def _average(total, count):
+    return total / count if count else None
+
+
+def summary_to_analysis(row: MatchSummary) -> Dict:
+    return {
+        "total_matches": row.total_matches,
+        "average_first_innings_score": _average(row.first_innings_runs, row.first_innings_count),
+        "average_second_innings_score": _average(row.second_innings_runs, row.second_innings_count),
+        "venues": list(row.venues),
+        "highest_score": row.highest_score,
+        "players_of_match": list(row.players_of_match),
+    }
+
+
+def read_match_analysis(db: Session) -> Dict:
+    """Constant-time read of the match analysis.
+
+    Until the first import has built the summary row, the analysis is
+    aggregated from the table without writing, so this is safe to run on
+    a read replica.
+    """
+    row = _get_summary_row(db)
+    if row is None:
+        row = _compute_summary(db)
+    return summary_to_analysis(row)
+
+
+def stream_match_analysis(db: Session, batch_size: int = STREAM_BATCH_SIZE) -> Dict:
+    """Compute the match analysis in one scan over a server-side cursor"""
+    row = _empty_row()
+    venues, players = set(), set()
+
+    result = db.execute(
+        select(
+            WPLMatch.venue,
+            WPLMatch.player_of_match,
+            WPLMatch.team1_score,
+            WPLMatch.team2_score,
+        ).execution_options(stream_results=True)
+    )
+    for partition in result.partitions(batch_size):
+        for venue, player, first, second in partition:
+            row.total_matches += 1
+            if first is not None:
+                row.first_innings_runs += first
+                row.first_innings_count += 1
+            if second is not None:
+                row.second_innings_runs += second
+                row.second_innings_count += 1
+            row.highest_score = _max(row.highest_score, first, second)
+            if venue:
+                venues.add(venue)
+            if player:
+                players.add(player)
+
+    row.venues = sorted(venues)
+    row.players_of_match = sorted(players)
+    return summary_to_analysis(row)
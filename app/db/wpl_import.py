@@ -0,0 +1,314 @@
+# app/db/wpl_import.py
+"""Chunked, idempotent import of WPL match CSVs into ``wpl_matches``.
+
+pandas and the processed store are imported by the functions that use
+them, so the API can import this module without loading them.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.models import WPLMatch
+from app.db.standings import replay_season, update_standings
+from app.db.summary import apply_new_matches, refresh_summary
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Relative to the data directory: the raw file the processed store is cleaned from
+DEFAULT_IMPORT_FILE = "raw/Wpl 2023-2024.csv"
+DEFAULT_BATCH_SIZE = 5000
+
+# Natural key of a match; must match the ``uq_wpl_match_key`` constraint
+MATCH_KEY = ('match_date', 'team1', 'team2')
+
+# CSV column -> WPLMatch column
+COLUMN_MAP = {
+    'date': 'match_date',
+    'venue': 'venue',
+    'team1': 'team1',
+    'team2': 'team2',
+    'winner': 'winner',
+    'player_of_match': 'player_of_match',
+    'team1_score': 'team1_score',
+    'team1_wickets': 'team1_wickets',
+    'team1_overs': 'team1_overs',
+    'team2_score': 'team2_score',
+    'team2_wickets': 'team2_wickets',
+    'team2_overs': 'team2_overs',
+}
+INTEGER_COLUMNS = ('team1_score', 'team1_wickets', 'team2_score', 'team2_wickets')
+FLOAT_COLUMNS = ('team1_overs', 'team2_overs')
+REQUIRED_COLUMNS = ('date', 'team1', 'team2')
+
+
+@dataclass
+class BatchTiming:
+    rows: int
+    inserted: int
+    updated: int
+    seconds: float
+
+
+@dataclass
+class ImportReport:
+    batches: List[BatchTiming] = field(default_factory=list)
+    # Matches pruned because the raw file they were synced from no longer has them
+    deleted: int = 0
+
+    @property
+    def rows(self) -> int:
+        return sum(b.rows for b in self.batches)
+
+    @property
+    def updated(self) -> int:
+        return sum(b.updated for b in self.batches)
+
+    @property
+    def seconds(self) -> float:
+        return sum(b.seconds for b in self.batches)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "rows": self.rows,
+            "inserted": sum(b.inserted for b in self.batches),
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "seconds": round(self.seconds, 4),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+            "batches": [
+                {
+                    "rows": b.rows,
+                    "inserted": b.inserted,
+                    "updated": b.updated,
+                    "seconds": round(b.seconds, 4),
+                }
+                for b in self.batches
+            ],
+        }
+
+
+def iter_batches(source: Union[str, IO], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator['pd.DataFrame']:
+    """Stream the CSV in ``batch_size`` row chunks, normalised to WPLMatch columns"""
+    import pandas as pd
+    reader = pd.read_csv(source, chunksize=batch_size)
+    for chunk in reader:
+        chunk.columns = chunk.columns.str.lower().str.strip()
+        missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        yield _normalise_batch(chunk)
+
+
+def _normalise_batch(chunk: 'pd.DataFrame') -> 'pd.DataFrame':
+    """Map CSV columns onto the table, coercing dtypes column-wise.
+
+    Columns the source does not have are left out rather than set to NULL,
+    so re-importing from a narrower source keeps the values already stored.
+    """
+    import pandas as pd
+    frame = pd.DataFrame(index=chunk.index)
+    for csv_col, db_col in COLUMN_MAP.items():
+        if csv_col in chunk.columns:
+            frame[db_col] = chunk[csv_col]
+
+    frame['match_date'] = pd.to_datetime(frame['match_date']).dt.date
+    for col in INTEGER_COLUMNS:
+        if col in frame.columns:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce').astype('Int64')
+    for col in FLOAT_COLUMNS:
+        if col in frame.columns:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce')
+
+    # A key can only be written once per statement on Postgres
+    return frame.drop_duplicates(subset=list(MATCH_KEY), keep='last')
+
+
+def to_records(frame: 'pd.DataFrame') -> List[Dict]:
+    """Convert a batch to row dicts via one pass per column (NaN/NA -> None)"""
+    columns = list(frame.columns)
+    arrays = [frame[c].astype(object).where(frame[c].notna(), None).tolist() for c in columns]
+    return [dict(zip(columns, values)) for values in zip(*arrays)]
+
+
+def _existing_keys(db: Session, records: List[Dict]) -> set:
+    dates = {r['match_date'] for r in records}
+    rows = db.query(WPLMatch.match_date, WPLMatch.team1, WPLMatch.team2).filter(
+        WPLMatch.match_date.in_(dates)
+    )
+    return {tuple(row) for row in rows}
+
+
+def upsert_matches(db: Session, records: List[Dict]) -> List[Dict]:
+    """Write a batch keyed on MATCH_KEY; returns the records that were new"""
+    if not records:
+        return []
+
+    existing = _existing_keys(db, records)
+    table = WPLMatch.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(MATCH_KEY),
+            set_={c: stmt.excluded[c] for c in records[0] if c not in MATCH_KEY},
+        )
+        db.execute(stmt, records)
+    else:
+        new_rows = [r for r in records if tuple(r[k] for k in MATCH_KEY) not in existing]
+        if new_rows:
+            db.execute(table.insert(), new_rows)
+        for record in records:
+            key = tuple(record[k] for k in MATCH_KEY)
+            if key in existing:
+                db.execute(
+                    table.update()
+                    .where(table.c.match_date == record['match_date'])
+                    .where(table.c.team1 == record['team1'])
+                    .where(table.c.team2 == record['team2'])
+                    .values(**record)
+                )
+
+    return [r for r in records if tuple(r[k] for k in MATCH_KEY) not in existing]
+
+
+def iter_store_batches(
+    seasons: Iterable[int],
+    store_path: Optional[Path] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator['pd.DataFrame']:
+    """Read the given seasons from the processed store in normalised batches, tagged with their source"""
+    from app.utils.processed_store import SCHEMA as STORE_SCHEMA, read_sources
+    columns = [c for c in COLUMN_MAP if c in STORE_SCHEMA.names]
+    df = read_sources(store_path, columns=columns, seasons=seasons)
+    for start in range(0, len(df), batch_size):
+        chunk = df.iloc[start:start + batch_size]
+        frame = _normalise_batch(chunk)
+        frame['source'] = chunk['source']
+        yield frame
+
+
+def import_matches(db: Session, source: Union[str, IO], batch_size: int = DEFAULT_BATCH_SIZE) -> ImportReport:
+    """Import a match CSV batch by batch, committing after each batch.
+
+    Re-running on the same file updates rows in place rather than
+    duplicating them, so a failed import can simply be retried.
+
+    New matches are folded into the match summary inside each batch's
+    transaction; if any existing match was updated the summary is rebuilt
+    once the last batch is written. Standings are replayed per batch from
+    its earliest match date.
+    """
+    return import_batches(db, iter_batches(source, batch_size))
+
+
+def import_seasons(
+    db: Session,
+    seasons: Iterable[int],
+    store_path: Optional[Path] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """Upsert only the given season partitions of the processed store.
+
+    Pass ``CleanReport.changed_seasons`` after an incremental clean (see
+    ``sync_clean_report``). Each match records the raw file it came from
+    in ``source``; nothing is deleted here.
+    """
+    seasons = sorted(seasons)
+    if not seasons:
+        return ImportReport()
+    return import_batches(db, iter_store_batches(seasons, store_path, batch_size))
+
+
+def prune_sources(db: Session, sources: Iterable[str], store_path: Optional[Path] = None) -> int:
+    """Delete matches synced from ``sources`` that those raw files no longer contain.
+
+    Only rows whose ``source`` is one of ``sources`` are candidates, so
+    matches imported from a CSV (``source`` NULL) or from other raw files
+    are never touched. Rebuilds the summary and the affected standings and
+    commits if anything was deleted; returns the number of matches deleted.
+    """
+    from app.utils.processed_store import read_sources
+    sources = sorted(sources)
+    if not sources:
+        return 0
+    current = read_sources(store_path, columns=list(REQUIRED_COLUMNS), sources=sources)
+    keys = {tuple(r.values()) for r in to_records(_normalise_batch(current)[list(MATCH_KEY)])}
+
+    rows = db.query(WPLMatch.id, *(getattr(WPLMatch, k) for k in MATCH_KEY)).filter(WPLMatch.source.in_(sources))
+    stale = [(row[0], row[1]) for row in rows if tuple(row[1:]) not in keys]
+    if not stale:
+        return 0
+    ids = [match_id for match_id, _ in stale]
+    for start in range(0, len(ids), DEFAULT_BATCH_SIZE):
+        db.query(WPLMatch).filter(WPLMatch.id.in_(ids[start:start + DEFAULT_BATCH_SIZE])).delete(
+            synchronize_session=False
+        )
+    refresh_summary(db)
+    for season in sorted({day.year for _, day in stale if day is not None}):
+        replay_season(db, season)
+    db.commit()
+    logger.info(f"Deleted {len(stale)} matches no longer in {', '.join(sources)}")
+    return len(stale)
+
+
+def sync_clean_report(db: Session, clean_report, store_path: Optional[Path] = None) -> ImportReport:
+    """Apply an incremental clean to the database and expire cached WPL responses.
+
+    The changed seasons are upserted, then matches that the cleaned or
+    removed raw files no longer contain are pruned by their ``source``.
+    """
+    from app.api.cache import WPL_NAMESPACE, get_response_cache
+    report = import_seasons(db, clean_report.changed_seasons, store_path)
+    sources = [Path(name).stem for name in clean_report.cleaned + clean_report.removed]
+    report.deleted = prune_sources(db, sources, store_path)
+    if clean_report.changed_seasons or report.deleted:
+        get_response_cache().bump_version(WPL_NAMESPACE)
+    return report
+
+
+def import_batches(db: Session, batches: Iterator['pd.DataFrame']) -> ImportReport:
+    """Upsert normalised batches, committing after each one"""
+    report = ImportReport()
+    while True:
+        # Batch timings include parsing, not just the write
+        started = time.perf_counter()
+        frame = next(batches, None)
+        if frame is None:
+            break
+        records = to_records(frame)
+        new_records = upsert_matches(db, records)
+        inserted = len(new_records)
+        # A batch that changed existing matches rebuilds the summary in its own
+        # transaction, so a later failing batch cannot leave it stale
+        if inserted == len(records):
+            apply_new_matches(db, new_records)
+        else:
+            refresh_summary(db)
+        update_standings(db, records)
+        db.commit()
+        elapsed = time.perf_counter() - started
+
+        report.batches.append(BatchTiming(
+            rows=len(records),
+            inserted=inserted,
+            updated=len(records) - inserted,
+            seconds=elapsed,
+        ))
+        logger.info(f"Imported batch of {len(records)} rows in {elapsed:.3f}s")
+
+    logger.info(f"Imported {report.rows} rows at {report.rows_per_sec:.0f} rows/sec")
+    return report
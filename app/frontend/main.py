@@ -1,4 +1,12 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
+
+# `streamlit run app/frontend/main.py` only puts this directory on sys.path;
+# the dashboard also imports from the app package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
 from wpl_dashboard import show_wpl_dashboard
 
 # Configure the page
@@ -1,62 +1,185 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from pathlib import Path
+from datetime import date
+
+from app.utils.match_index import DASHBOARD_COLUMNS, FilterSummary, MatchIndex
+from app.utils.processed_store import default_store_path, from_arrow_ipc, read_matches, store_version
+from app.utils.standings import standings_dict, standings_from_frame
+
+# When set (e.g. http://localhost:8000), filters are resolved by the API's
+# /wpl/dashboard routes instead of an index built in this process. httpx is
+# only imported then; the standalone image does not install it.
+DASHBOARD_API_URL = os.getenv('DASHBOARD_API_URL')
+API_CACHE_TTL = int(os.getenv('DASHBOARD_API_CACHE_TTL', 60))
+
+def data_version():
+    """Version of the data behind the dashboard; changes whenever the data does"""
+    store_path = default_store_path()
+    if store_path.exists():
+        return store_version(store_path)
+    csv_path = store_path.with_name('wpl_clean.csv')
+    return ((str(csv_path), csv_path.stat().st_mtime_ns, csv_path.stat().st_size),) if csv_path.exists() else ()
 
 def load_data():
     """Load the cleaned WPL data"""
     try:
-        current_dir = Path(__file__).parent
-        data_path = current_dir.parent.parent / 'data' / 'processed' / 'wpl_clean.csv'
-        df = pd.read_csv(data_path)
+        store_path = default_store_path()
+        if store_path.exists():
+            return read_matches(store_path, columns=DASHBOARD_COLUMNS)
+        
+        # Fall back to the CSV export when the Parquet store has not been built
+        data_path = store_path.with_name('wpl_clean.csv')
+        df = pd.read_csv(data_path, usecols=DASHBOARD_COLUMNS)
         df['date'] = pd.to_datetime(df['date'])
         return df
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         return None
 
-def display_key_metrics(df):
+# cache_resource rather than cache_data: the index is read-only and shared
+# across reruns, so it is not copied (or re-pickled) on every interaction
+@st.cache_resource(max_entries=2, show_spinner="Loading match data...")
+def load_match_index(version):
+    """Load the data and build its filter indexes once per ``data_version()``"""
+    df = load_data()
+    return MatchIndex(df) if df is not None else None
+
+@st.cache_resource
+def api_client():
+    """One pooled, keep-alive HTTP client shared by every session"""
+    import httpx
+    return httpx.Client(
+        base_url=DASHBOARD_API_URL,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        headers={'Accept-Encoding': 'gzip'},
+    )
+
+def _api_get(path, params):
+    response = api_client().get(f'/wpl/dashboard{path}', params={k: v for k, v in params.items() if v is not None})
+    response.raise_for_status()
+    return response
+
+@st.cache_data(ttl=API_CACHE_TTL, show_spinner=False)
+def fetch_options():
+    options = _api_get('/options', {}).json()
+    for key in ('min_date', 'max_date'):
+        options[key] = date.fromisoformat(options[key])
+    return options
+
+@st.cache_data(ttl=API_CACHE_TTL, max_entries=256, show_spinner=False)
+def fetch_summary(start_date, end_date, team, season):
+    """Pre-aggregated results for one filter combination; the table comes as Arrow"""
+    params = {'start_date': start_date, 'end_date': end_date, 'team': team, 'season': season}
+    data = _api_get('/summary', params).json()
+    details = from_arrow_ipc(_api_get('/matches', {**params, 'format': 'arrow'}).content)
+    return FilterSummary.from_dict(data, details)
+
+class ApiMatchSource:
+    """The parts of MatchIndex the dashboard uses, served by the API"""
+
+    def __init__(self):
+        options = fetch_options()
+        self.teams = options['teams']
+        self.seasons = options['seasons']
+        self.min_date = options['min_date']
+        self.max_date = options['max_date']
+
+    def summary(self, start_date, end_date, team=None, season=None):
+        return fetch_summary(start_date, end_date, team, season)
+
+def match_source():
+    if DASHBOARD_API_URL:
+        import httpx
+        try:
+            return ApiMatchSource()
+        except httpx.HTTPError as e:
+            st.error(f"Error loading data from the API: {str(e)}")
+            return None
+    return load_match_index(data_version())
+
+@st.cache_data(ttl=API_CACHE_TTL, max_entries=64, show_spinner=False)
+def fetch_standings(season, as_of):
+    """Points table as of a date, from the API when configured, otherwise from the match database.
+
+    Without the database packages (the standalone image) the table is
+    replayed from the local match data, which has no scores, so net run
+    rates are left blank.
+    """
+    if DASHBOARD_API_URL:
+        params = {k: v for k, v in {'season': season, 'as_of': as_of}.items() if v is not None}
+        response = api_client().get('/wpl/standings', params=params)
+        response.raise_for_status()
+        return response.json()
+
+    try:
+        from app.db.database import ReadSessionLocal
+        from app.db.standings import read_standings
+    except ImportError:
+        df = load_data()
+        return standings_from_frame(df, season, as_of) if df is not None else standings_dict(season, None, [])
+    db = ReadSessionLocal()
+    try:
+        return read_standings(db, season, as_of)
+    finally:
+        db.close()
+
+def display_standings(season, as_of):
+    """Display the points table after the last match on or before the end date"""
+    st.subheader("Standings")
+    try:
+        table = fetch_standings(season, as_of)
+    except Exception as e:
+        # httpx or SQLAlchemy errors; neither package is imported unless it is used
+        st.info(f"Standings are unavailable: {str(e)}")
+        return
+
+    if not table['standings']:
+        st.info("No standings for the selected season and date.")
+        return
+    st.caption(f"Season {table['season']}, after the matches of {table['as_of']}")
+    standings_df = pd.DataFrame(table['standings']).set_index('position').rename(columns={
+        'team': 'Team',
+        'played': 'P',
+        'won': 'W',
+        'lost': 'L',
+        'no_result': 'NR',
+        'points': 'Pts',
+        'net_run_rate': 'NRR',
+        'form': 'Form',
+    })
+    st.dataframe(standings_df, use_container_width=True)
+
+def display_key_metrics(summary):
     """Display key metrics in the dashboard"""
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Matches", len(df))
+        st.metric("Total Matches", summary.matches)
     
     with col2:
-        win_by_runs = len(df[df['win_type'] == 'runs'])
-        st.metric("Wins by Runs", win_by_runs)
+        st.metric("Wins by Runs", summary.wins_by_runs)
     
     with col3:
-        win_by_wickets = len(df[df['win_type'] == 'wickets'])
-        st.metric("Wins by Wickets", win_by_wickets)
+        st.metric("Wins by Wickets", summary.wins_by_wickets)
     
     with col4:
-        toss_wins = len(df[df['won_toss_and_match']])
-        toss_win_pct = (toss_wins / len(df)) * 100
-        st.metric("Toss Winner Victory", f"{toss_win_pct:.1f}%")
+        st.metric("Toss Winner Victory", f"{summary.toss_win_pct:.1f}%")
 
-def plot_team_performance(df):
+def plot_team_performance(summary):
     """Create team performance visualization"""
     st.subheader("Team Performance")
     
-    # Calculate team statistics
-    team_stats = []
-    teams = set(df['team1'].unique()) | set(df['team2'].unique())
-    
-    for team in teams:
-        matches_played = len(df[(df['team1'] == team) | (df['team2'] == team)])
-        matches_won = len(df[df['winner'] == team])
-        win_rate = (matches_won / matches_played * 100) if matches_played > 0 else 0
-        
-        team_stats.append({
-            'Team': team,
-            'Matches Played': matches_played,
-            'Matches Won': matches_won,
-            'Win Rate': win_rate
-        })
-    
-    team_df = pd.DataFrame(team_stats)
+    team_df = summary.team_table.reset_index().rename(columns={
+        'team': 'Team',
+        'matches_played': 'Matches Played',
+        'matches_won': 'Matches Won',
+        'win_rate': 'Win Rate',
+    })
     
     # Create visualization
     fig = px.bar(team_df, x='Team', y=['Matches Played', 'Matches Won'],
@@ -64,7 +187,7 @@ def plot_team_performance(df):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def plot_match_outcomes(df):
+def plot_match_outcomes(summary):
     """Create match outcomes visualization"""
     st.subheader("Match Outcomes")
     
@@ -72,7 +195,7 @@ def plot_match_outcomes(df):
     
     with col1:
         # Win type pie chart
-        win_type_counts = df['win_type'].value_counts()
+        win_type_counts = summary.win_type_counts
         fig1 = px.pie(values=win_type_counts.values, 
                       names=win_type_counts.index,
                       title='Distribution of Win Types')
@@ -80,7 +203,7 @@ def plot_match_outcomes(df):
     
     with col2:
         # Venue distribution
-        venue_counts = df['venue'].value_counts()
+        venue_counts = summary.venue_counts
         fig2 = px.bar(x=venue_counts.index, y=venue_counts.values,
                       title='Matches per Venue')
         st.plotly_chart(fig2, use_container_width=True)
@@ -90,17 +213,17 @@ def show_wpl_dashboard():
     st.title("Women's Premier League 2025 Analytics")
     
     # Load data
-    df = load_data()
+    index = match_source()
     
-    if df is not None:
+    if index is not None:
         # Add filters in expander
         with st.expander("📊 Filters and Controls", expanded=False):
             col1, col2 = st.columns(2)
             
             with col1:
                 # Date range filter
-                min_date = df['date'].min().date()
-                max_date = df['date'].max().date()
+                min_date = index.min_date
+                max_date = index.max_date
                 
                 start_date = st.date_input(
                     "Start Date",
@@ -117,28 +240,28 @@ def show_wpl_dashboard():
                     max_value=max_date
                 )
             
-            # Team filter
-            teams = sorted(list(set(df['team1'].unique()) | set(df['team2'].unique())))
-            selected_team = st.selectbox("Select Team", ['All Teams'] + teams)
-        
-        # Filter data based on selections
-        mask = (df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)
-        if selected_team != 'All Teams':
-            mask = mask & ((df['team1'] == selected_team) | (df['team2'] == selected_team))
+            # Team and season filters
+            selected_team = st.selectbox("Select Team", ['All Teams'] + index.teams)
+            selected_season = st.selectbox("Select Season", ['All Seasons'] + index.seasons)
         
-        filtered_df = df[mask].copy()
+        # Filters resolve through the index (or the API); results are memoized per combination
+        summary = index.summary(
+            start_date,
+            end_date,
+            None if selected_team == 'All Teams' else selected_team,
+            None if selected_season == 'All Seasons' else selected_season,
+        )
         
-        if len(filtered_df) > 0:
+        if summary.matches > 0:
             # Display visualizations
-            display_key_metrics(filtered_df)
-            plot_team_performance(filtered_df)
-            plot_match_outcomes(filtered_df)
+            display_key_metrics(summary)
+            # A single season's table; with all seasons selected, the season of the end date
+            display_standings(None if selected_season == 'All Seasons' else selected_season, end_date)
+            plot_team_performance(summary)
+            plot_match_outcomes(summary)
             
-            # Match details table
+            # Match details table (the index keeps rows in date order)
             st.subheader("Match Details")
-            st.dataframe(
-                filtered_df[['date', 'team1', 'team2', 'winner', 'match_result', 'venue']].sort_values('date'),
-                use_container_width=True
-            )
+            st.dataframe(summary.details, use_container_width=True)
         else:
             st.warning("No matches found for the selected filters.")
\ No newline at end of file
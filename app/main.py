@@ -1,14 +1,24 @@
+import logging
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import engine
-from app.db import models
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from app.api.routes.data_routes import router as data_router
 from app.api.routes.wpl_routes import router as wpl_router
+from app.api.routes.dashboard_routes import router as dashboard_router
+from app.db.ingest import close_write_buffer
+from app.metrics import REGISTRY
+from app.profiling import ProfiledRoute, ProfilingMiddleware
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+# Schema changes are a deploy step (python -m app.db.schema), not an import side effect
+CREATE_SCHEMA_ON_STARTUP = os.getenv("DB_CREATE_SCHEMA", "").lower() in ("1", "true", "yes")
 
 app = FastAPI(title="Skye Analytics API")
+app.router.route_class = ProfiledRoute
 
 # Configure CORS
 app.add_middleware(
@@ -19,10 +29,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON bodies for clients that accept gzip (the dashboard's tables)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Outermost, so latency covers the other middleware; see app/profiling.py
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(data_router)
 app.include_router(wpl_router)
+app.include_router(dashboard_router)
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Skye Analytics API", "status": "running"}
\ No newline at end of file
+    return {"message": "Welcome to Skye Analytics API", "status": "running"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+def create_schema():
+    if not CREATE_SCHEMA_ON_STARTUP:
+        return
+    from app.db.schema import SchemaUpgradeError, upgrade_schema
+    # Serve what we can either way; requests needing the missing parts fail until it is fixed
+    try:
+        upgrade_schema()
+    except OperationalError as e:
+        logger.warning(f"Schema upgrade skipped, database unavailable: {e}")
+    except (SchemaUpgradeError, SQLAlchemyError) as e:
+        logger.error(f"Schema upgrade incomplete, run python -m app.db.schema to see why: {e}")
+
+@app.on_event("shutdown")
+def flush_write_buffer():
+    close_write_buffer()
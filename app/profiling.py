@@ -0,0 +1,313 @@
+# app/profiling.py
+"""Per-request instrumentation: latency, SQL, rows, serialization and an opt-in profiler.
+
+``ProfilingMiddleware`` opens a ``RequestStats`` for every HTTP request in
+a context variable. SQLAlchemy engine events add each statement's count,
+time and fetched rows to it; ``ProfiledRoute`` and ``serializing()`` mark
+how long encoding the response took. When the request ends the totals go
+into per-route histograms on ``REGISTRY`` (and so ``/metrics``) and a
+``Server-Timing`` header.
+
+Requests sent with ``X-Profile: <PROFILE_TOKEN>`` are also run under a
+stack sampler. The samples cover every busy thread in the process, so
+concurrent requests show up too. They are written to PROFILE_DIR as folded
+stacks (the input format of flamegraph.pl and speedscope), and the
+``X-Profile`` response header names the file. Profiling is off unless
+PROFILE_TOKEN is set.
+"""
+import asyncio
+import functools
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics import REGISTRY
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN") or None
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", Path(__file__).parent.parent / "data" / "profiles"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10_000, 100_000, 1_000_000)
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route")
+)
+REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Requests by route and status code", ("method", "route", "status")
+)
+DB_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("route",), buckets=COUNT_BUCKETS
+)
+DB_SECONDS = REGISTRY.histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request", ("route",)
+)
+DB_ROWS = REGISTRY.histogram(
+    "http_request_db_rows", "Rows fetched from the database per request", ("route",), buckets=ROW_BUCKETS
+)
+SERIALIZE_SECONDS = REGISTRY.histogram(
+    "http_response_serialize_seconds", "Time spent encoding the response body", ("route",)
+)
+PROFILES = REGISTRY.counter(
+    "http_request_profiles_total", "Requests run under the sampling profiler", ("route",)
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    query_seconds: float = 0.0
+    rows: int = 0
+    serialize_seconds: float = 0.0
+    # perf_counter() when the endpoint returned; the rest until the
+    # response starts is FastAPI validating and encoding its result
+    endpoint_done: Optional[float] = None
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@contextmanager
+def serializing():
+    """Count the enclosed block as serialization time of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - started
+
+
+class _CountingCursor:
+    """DBAPI cursor proxy that counts fetched rows into ``stats``"""
+
+    def __init__(self, cursor, stats: RequestStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.rows += len(rows)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._stats.rows += 1
+            yield row
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        stats.query_seconds += time.perf_counter() - started.pop()
+    stats.queries += 1
+    if context is not None and context.cursor is cursor:
+        # The result reads rows through context.cursor, which is set up after this event
+        context.cursor = _CountingCursor(cursor, stats)
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install_query_events():
+    """Listen to every Engine (including ones created later); safe to call repeatedly"""
+    global _installed
+    with _install_lock:
+        if not _installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            _installed = True
+
+
+def _mark_endpoint_done():
+    stats = _current.get()
+    if stats is not None:
+        stats.endpoint_done = time.perf_counter()
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that records when the endpoint returns, so encoding can be timed separately"""
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def endpoint(*args, **kwargs):
+                try:
+                    return await call(*args, **kwargs)
+                finally:
+                    _mark_endpoint_done()
+        else:
+            @functools.wraps(call)
+            def endpoint(*args, **kwargs):
+                try:
+                    return call(*args, **kwargs)
+                finally:
+                    _mark_endpoint_done()
+        # The request handler looks the call up on the dependant at request time
+        self.dependant.call = endpoint
+        return super().get_route_handler()
+
+
+# Leaf frames in these modules are threads waiting for work, not doing it
+_IDLE_MODULES = {"selectors", "threading", "queue", "concurrent.futures.thread"}
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    """Samples every thread's stack at ``interval`` seconds into folded-stack counts"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks = StackCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me or frame.f_globals.get("__name__") in _IDLE_MODULES:
+                    continue
+                names = []
+                while frame is not None:
+                    names.append(_frame_name(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(names))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _server_timing(stats: RequestStats, elapsed: float) -> bytes:
+    return (
+        f'db;dur={stats.query_seconds * 1000:.2f};desc="{stats.queries} queries, {stats.rows} rows", '
+        f"serialize;dur={stats.serialize_seconds * 1000:.2f}, total;dur={elapsed * 1000:.2f}"
+    ).encode()
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware, so streamed responses pass through untouched"""
+
+    def __init__(self, app, profile_token: Optional[str] = PROFILE_TOKEN, profile_dir: Path = PROFILE_DIR,
+                 profile_interval: float = PROFILE_INTERVAL):
+        self.app = app
+        self.profile_token = profile_token
+        self.profile_dir = Path(profile_dir)
+        self.profile_interval = profile_interval
+        install_query_events()
+
+    def _wants_profile(self, scope) -> bool:
+        if not self.profile_token:
+            return False
+        for name, value in scope.get("headers", ()):
+            if name == b"x-profile":
+                return hmac.compare_digest(value.decode("latin-1"), self.profile_token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+        profile_path = None
+        sampler = None
+        if self._wants_profile(scope):
+            slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+            profile_path = self.profile_dir / f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 10**9}-{slug}.folded"
+            sampler = StackSampler(self.profile_interval).__enter__()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                now = time.perf_counter()
+                if stats.endpoint_done is not None:
+                    stats.serialize_seconds += now - stats.endpoint_done
+                    stats.endpoint_done = None
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, now - started)))
+                if profile_path is not None:
+                    headers.append((b"x-profile", profile_path.name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            route = _route_label(scope)
+            REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route)
+            REQUESTS.inc(method=scope["method"], route=route, status=status)
+            DB_QUERIES.observe(stats.queries, route=route)
+            DB_SECONDS.observe(stats.query_seconds, route=route)
+            DB_ROWS.observe(stats.rows, route=route)
+            SERIALIZE_SECONDS.observe(stats.serialize_seconds, route=route)
+            if sampler is not None:
+                sampler.__exit__(None, None, None)
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profile_path.write_text(sampler.folded())
+                PROFILES.inc(route=route)
@@ -1,10 +0,0 @@
-from pathlib import Path
-import pandas as pd
-import logging
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
\ No newline at end of file
@@ -0,0 +1,86 @@
+# app/utils/aggregations.py
+"""Vectorized team, venue and toss aggregations over cleaned match frames.
+
+Shared by the data summary (through ``SummaryStats``) and the dashboard.
+The ``*_counts`` functions return additive counts, so results for chunks
+or files can be summed; the ``*_table`` functions turn counts into the
+final per-team/per-venue frames. Every pass is O(rows), independent of
+the number of teams or venues.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+VENUE_COUNT_COLUMNS = ['matches', 'runs_sum', 'runs_count', 'wickets_sum', 'wickets_count']
+
+
+def team_counts(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Matches played and matches won per team.
+
+    Both team columns are melted into one, so a single groupby counts every
+    appearance; a team listed on both sides of a row counts once.
+    """
+    sides = df[['team1', 'team2']].melt(value_name='team')['team']
+    repeated = np.concatenate([np.zeros(len(df), dtype=bool), (df['team2'] == df['team1']).to_numpy()])
+    played = sides[~repeated].astype(object).value_counts()
+    wins = df['winner'].astype(object).value_counts()
+    return played, wins
+
+
+def team_table(played: pd.Series, wins: pd.Series) -> pd.DataFrame:
+    """Per-team matches played, matches won and win rate (%), sorted by team"""
+    played = played[played > 0].sort_index()
+    won = wins.reindex(played.index, fill_value=0)
+    table = pd.DataFrame({
+        'matches_played': played.astype('int64'),
+        'matches_won': won.astype('int64'),
+    })
+    table['win_rate'] = table['matches_won'] / table['matches_played'] * 100
+    table.index.name = 'team'
+    return table
+
+
+def team_performance(df: pd.DataFrame) -> pd.DataFrame:
+    return team_table(*team_counts(df))
+
+
+def venue_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """Matches hosted plus winning-margin sums and counts per venue"""
+    return df.groupby('venue', observed=True).agg(
+        matches=('match_number', 'count'),
+        runs_sum=('winner_runs', 'sum'),
+        runs_count=('winner_runs', 'count'),
+        wickets_sum=('winner_wickets', 'sum'),
+        wickets_count=('winner_wickets', 'count'),
+    ).astype('float64')
+
+
+def venue_table(counts: pd.DataFrame) -> pd.DataFrame:
+    """Matches hosted and mean winning margins per venue, sorted by venue"""
+    v = counts.sort_index()
+    table = pd.DataFrame({
+        'matches': v['matches'].astype('int64'),
+        'avg_winning_runs': (v['runs_sum'] / v['runs_count'].where(v['runs_count'] > 0)).round(2),
+        'avg_winning_wickets': (v['wickets_sum'] / v['wickets_count'].where(v['wickets_count'] > 0)).round(2),
+    })
+    table.index.name = 'venue'
+    return table
+
+
+def venue_statistics(df: pd.DataFrame) -> pd.DataFrame:
+    return venue_table(venue_counts(df))
+
+
+def toss_impact(toss_wins: int, total_matches: int) -> Dict:
+    return {
+        'toss_and_match_wins': int(toss_wins),
+        'matches': int(total_matches),
+        'percentage': toss_wins / total_matches * 100 if total_matches else None,
+    }
+
+
+def table_records(table: pd.DataFrame) -> list:
+    """JSON-ready rows of a team/venue table, with NaN as None"""
+    records = table.reset_index().astype(object)
+    return records.where(records.notna(), None).to_dict(orient='records')
@@ -1,11 +1,214 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date
 from pathlib import Path
+from typing import Dict, List, Optional, Set
 import pandas as pd
 import logging
 import numpy as np
-import re
+import os
+import time
+
+from app.utils.aggregations import (
+    VENUE_COUNT_COLUMNS, table_records, team_counts, team_table, toss_impact, venue_counts, venue_table,
+)
+from app.utils.manifest import MANIFEST_NAME, Manifest
+from app.utils.processed_store import STORE_NAME, SeasonPartitionWriter, remove_source
 
 logger = logging.getLogger(__name__)
 
+def _map_unique(series, transform):
+    """Apply a vectorized transform to each distinct non-null value, then broadcast back.
+
+    Team, venue and match-number columns repeat a handful of values, so this
+    runs the string work once per distinct value instead of once per row.
+    """
+    codes, uniques = pd.factorize(series)
+    values = transform(pd.Series(uniques)).to_numpy()
+    if (codes == -1).any():
+        # factorize codes missing values as -1, which picks this trailing NaN
+        values = np.append(values, np.nan)
+    return pd.Series(values[codes], index=series.index, name=series.name)
+
+def _match_numbers(series):
+    """First run of digits of each match number as a float, NaN where there is none"""
+    return _map_unique(
+        series,
+        lambda s: pd.to_numeric(s.astype(str).str.extract(r'(\d+)', expand=False))
+    ).astype(float)
+
+def _all_match_numbers(raw_file, chunksize):
+    """Whether every row of ``raw_file`` has a match number, reading only that column"""
+    columns = pd.read_csv(raw_file, chunksize=chunksize, usecols=lambda c: c.lower().strip() == 'match_number')
+    return all(_match_numbers(chunk.iloc[:, 0]).notna().all() for chunk in columns)
+
+class SummaryStats:
+    """Mergeable statistics behind data_summary.txt.
+
+    ``update`` folds in one cleaned chunk and ``merge`` another instance, so
+    the summary of a file processed in chunks, or of several files cleaned
+    at different times, matches the summary of the whole frame.
+    """
+    VENUE_COLUMNS = VENUE_COUNT_COLUMNS
+
+    def __init__(self):
+        self.total_matches = 0
+        self.season = None
+        self.date_min = None
+        self.date_max = None
+        self.toss_wins = 0
+        self.team_wins = pd.Series(dtype='int64')
+        self.team_matches = pd.Series(dtype='int64')
+        self.venues = pd.DataFrame(columns=self.VENUE_COLUMNS, dtype='float64')
+        # Insertion-ordered, so ties rank the same as a single value_counts()
+        self.player_of_match = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls().update(df)
+
+    @classmethod
+    def merged(cls, parts):
+        stats = cls()
+        for part in parts:
+            stats.merge(part)
+        return stats
+
+    def update(self, df):
+        if df.empty:
+            return self
+        self.total_matches += len(df)
+        if self.season is None:
+            self.season = df['season'].iloc[0]
+        self.date_min = _min_present(self.date_min, df['date'].min())
+        self.date_max = _max_present(self.date_max, df['date'].max())
+        self.toss_wins += int(df['won_toss_and_match'].sum())
+
+        played, wins = team_counts(df)
+        self.team_wins = self.team_wins.add(wins, fill_value=0)
+        self.team_matches = self.team_matches.add(played, fill_value=0)
+        self.venues = self.venues.add(venue_counts(df), fill_value=0)
+
+        for player, count in df['player_of_match'].value_counts(sort=False).items():
+            self.player_of_match[player] = self.player_of_match.get(player, 0) + int(count)
+        return self
+
+    def merge(self, other):
+        if other.total_matches == 0:
+            return self
+        self.total_matches += other.total_matches
+        if self.season is None:
+            self.season = other.season
+        self.date_min = _min_present(self.date_min, other.date_min)
+        self.date_max = _max_present(self.date_max, other.date_max)
+        self.toss_wins += other.toss_wins
+        self.team_wins = self.team_wins.add(other.team_wins, fill_value=0)
+        self.team_matches = self.team_matches.add(other.team_matches, fill_value=0)
+        self.venues = self.venues.add(other.venues, fill_value=0)
+        for player, count in other.player_of_match.items():
+            self.player_of_match[player] = self.player_of_match.get(player, 0) + count
+        return self
+
+    def to_dict(self):
+        """JSON-ready form, stored per season in the manifest"""
+        return {
+            'total_matches': self.total_matches,
+            'season': None if self.season is None else int(self.season),
+            'date_min': None if self.date_min is None else self.date_min.isoformat(),
+            'date_max': None if self.date_max is None else self.date_max.isoformat(),
+            'toss_wins': self.toss_wins,
+            'team_wins': {team: int(n) for team, n in self.team_wins.items()},
+            'team_matches': {team: int(n) for team, n in self.team_matches.items()},
+            'venues': {venue: [float(x) for x in row] for venue, row in self.venues.iterrows()},
+            'player_of_match': self.player_of_match,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.total_matches = data['total_matches']
+        stats.season = data['season']
+        stats.date_min = None if data['date_min'] is None else date.fromisoformat(data['date_min'])
+        stats.date_max = None if data['date_max'] is None else date.fromisoformat(data['date_max'])
+        stats.toss_wins = data['toss_wins']
+        stats.team_wins = pd.Series(data['team_wins'], dtype='int64')
+        stats.team_matches = pd.Series(data['team_matches'], dtype='int64')
+        stats.venues = pd.DataFrame.from_dict(
+            data['venues'], orient='index', columns=cls.VENUE_COLUMNS, dtype='float64'
+        ) if data['venues'] else stats.venues
+        stats.player_of_match = dict(data['player_of_match'])
+        return stats
+
+    def team_table(self):
+        return team_table(self.team_matches, self.team_wins)
+
+    def venue_table(self):
+        return venue_table(self.venues)
+
+    def toss_impact(self):
+        return toss_impact(self.toss_wins, self.total_matches)
+
+    def top_players(self, n=5):
+        return pd.Series(self.player_of_match, dtype='int64').sort_values(ascending=False).head(n)
+
+    def to_summary(self):
+        """Structured form of data_summary.txt"""
+        return {
+            'total_matches': self.total_matches,
+            'season': None if self.season is None else int(self.season),
+            'date_range': [
+                None if self.date_min is None else self.date_min.isoformat(),
+                None if self.date_max is None else self.date_max.isoformat(),
+            ],
+            'teams': table_records(self.team_table()),
+            'venues': table_records(self.venue_table()),
+            'toss': self.toss_impact(),
+            'top_players': [{'player': p, 'awards': int(n)} for p, n in self.top_players().items()],
+        }
+
+def _min_present(a, b):
+    return b if a is None or pd.isna(a) else a if pd.isna(b) else min(a, b)
+
+def _max_present(a, b):
+    return b if a is None or pd.isna(a) else a if pd.isna(b) else max(a, b)
+
+@dataclass
+class CleanedFile:
+    rows: int
+    schema: Dict[str, str]
+    seasons: Dict[int, SummaryStats]
+    changed_seasons: Set[int]
+    frame: Optional[pd.DataFrame] = None
+    seconds: float = 0.0
+
+@dataclass
+class CleanReport:
+    cleaned: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # File name -> error message; failed files keep their previous output
+    failed: Dict[str, str] = field(default_factory=dict)
+    # File name -> seconds spent cleaning it
+    timings: Dict[str, float] = field(default_factory=dict)
+    changed_seasons: Set[int] = field(default_factory=set)
+
+    @property
+    def changed(self):
+        return bool(self.cleaned or self.removed)
+
+def _clean_file_task(cleaner_cls, processed_path, raw_file, chunksize):
+    """Process pool entry point: clean one file and time it"""
+    cleaner = cleaner_cls(raw_file)
+    cleaner.processed_path = processed_path
+    started = time.perf_counter()
+    result = cleaner._clean_file(raw_file, chunksize)
+    result.seconds = time.perf_counter() - started
+    return result
+
+def default_workers():
+    return int(os.getenv('CLEAN_WORKERS', 0)) or os.cpu_count() or 1
+
 class WPLDataCleaner:
     def __init__(self, input_path: str = None):
         self.base_path = Path(__file__).parent.parent.parent
@@ -13,13 +216,46 @@ class WPLDataCleaner:
         self.processed_path = self.base_path / 'data' / 'processed'
         
         # Use the specific file name with spaces
-        self.input_file = input_path or self.raw_path / 'Wpl 2023-2024.csv'
+        self.input_file = Path(input_path) if input_path else self.raw_path / 'Wpl 2023-2024.csv'
         
         # Ensure processed directory exists
         self.processed_path.mkdir(parents=True, exist_ok=True)
     
-    def clean_data(self):
-        """Main data cleaning method"""
+    @property
+    def store_path(self):
+        return self.processed_path / STORE_NAME
+    
+    @property
+    def csv_path(self):
+        return self.processed_path / 'wpl_clean.csv'
+    
+    @property
+    def manifest_path(self):
+        return self.processed_path / MANIFEST_NAME
+    
+    def clean_data(self, export_csv: bool = False):
+        """Main data cleaning method
+
+        The cleaned data goes to the season-partitioned Parquet store
+        (``wpl_clean.parquet``); ``export_csv`` also writes ``wpl_clean.csv``.
+        Returns the cleaned frame.
+        """
+        result, _ = self._clean_input(None, export_csv)
+        return result.frame
+    
+    def clean_data_chunked(self, chunksize: int, export_csv: bool = False):
+        """Like ``clean_data``, streaming the raw file in chunks of ``chunksize`` rows
+
+        Each chunk is cleaned, appended to the outputs and folded into the
+        summary statistics, so memory stays bounded by the chunk size. The
+        output files are identical to ``clean_data``'s; the whole frame is
+        never held, so the ``SummaryStats`` are returned instead.
+        """
+        _, stats = self._clean_input(chunksize, export_csv)
+        return stats
+    
+    def _clean_input(self, chunksize, export_csv):
+        """Clean ``input_file`` into the outputs; returns its CleanedFile and the summary stats"""
         logger.info(f"Starting data cleaning process...")
         logger.info(f"Reading data from: {self.input_file}")
         
@@ -28,33 +264,159 @@ class WPLDataCleaner:
             if not self.input_file.exists():
                 raise FileNotFoundError(f"Could not find file: {self.input_file}")
             
-            # Read the CSV file
-            df = pd.read_csv(self.input_file)
-            logger.info(f"Successfully read {len(df)} rows of data")
-            
-            # Clean column names
-            df.columns = df.columns.str.lower().str.strip()
+            result = self._clean_file(self.input_file, chunksize, export_csv)
+            if chunksize:
+                logger.info(f"Successfully cleaned {result.rows} rows in chunks of {chunksize}")
+            else:
+                logger.info(f"Successfully cleaned {result.rows} rows of data")
+            logger.info(f"Cleaned data saved to: {self.store_path}")
+            if export_csv:
+                logger.info(f"CSV export saved to: {self.csv_path}")
             
-            # Basic cleaning steps
-            df = self._clean_dates(df)
-            df = self._clean_team_names(df)
-            df = self._clean_match_details(df)
-            df = self._add_calculated_fields(df)
-            
-            # Save processed data
-            output_file = self.processed_path / 'wpl_clean.csv'
-            df.to_csv(output_file, index=False)
-            logger.info(f"Cleaned data saved to: {output_file}")
+            manifest = Manifest.load(self.manifest_path)
+            self._record(manifest, self.input_file, result)
+            manifest.save()
             
             # Generate summary
-            self._generate_summary(df)
-            
-            return df
+            return result, self._write_summary_from(manifest)
             
         except Exception as e:
             logger.error(f"Error in data cleaning process: {str(e)}")
             raise
     
+    def clean_incremental(self, chunksize: int = None, workers: int = 1):
+        """Clean only the raw files that are new or changed since the last run"""
+        return self.clean_directory(chunksize=chunksize, workers=workers, incremental=True)
+    
+    def clean_directory(self, chunksize: int = None, workers: int = None, incremental: bool = False):
+        """Clean every ``*.csv`` in ``raw_path``, ``workers`` files at a time.
+
+        Files are cleaned in a process pool (``workers`` defaults to
+        CLEAN_WORKERS or the CPU count; 1 cleans inline). Each file writes its
+        own partitions of the store, and the summary is merged from the
+        per-season statistics in the manifest in season, then file name
+        order, so the result does not depend on which worker finished first.
+
+        A file that fails is reported in ``CleanReport.failed`` and keeps its
+        previous output and manifest entry; the others are unaffected. With
+        ``incremental`` files unchanged since the last run are skipped.
+        Files no longer in ``raw_path`` have their rows dropped from the
+        store. ``CleanReport.changed_seasons`` names the partitions that
+        downstream steps such as the DB import need to revisit; run from the
+        command line, the changed seasons are synced to the database with
+        ``app.db.wpl_import.sync_clean_report``.
+        """
+        manifest = Manifest.load(self.manifest_path)
+        report = CleanReport()
+        raw_files = sorted(self.raw_path.glob('*.csv'))
+        
+        pending = []
+        for raw_file in raw_files:
+            if incremental and manifest.is_current(raw_file):
+                report.skipped.append(raw_file.name)
+            else:
+                pending.append(raw_file)
+        
+        for raw_file, result in self._clean_files(pending, chunksize, workers or default_workers()):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to clean {raw_file}: {result}")
+                report.failed[raw_file.name] = str(result)
+                continue
+            report.timings[raw_file.name] = result.seconds
+            logger.info(f"Cleaned {raw_file} ({result.rows} rows) in {result.seconds:.3f}s")
+            self._record(manifest, raw_file, result)
+            # Save as we go, so an interrupted run resumes where it stopped
+            manifest.save()
+            report.cleaned.append(raw_file.name)
+            report.changed_seasons |= result.changed_seasons
+        
+        present = {raw_file.name for raw_file in raw_files}
+        for name in sorted(set(manifest.entries) - present):
+            logger.info(f"Removing rows of deleted file: {name}")
+            report.changed_seasons |= remove_source(self.store_path, Path(name).stem)
+            manifest.remove(name)
+            manifest.save()
+            report.removed.append(name)
+        
+        report.cleaned.sort()
+        if report.changed:
+            self._write_summary_from(manifest)
+        logger.info(
+            f"Cleaned {len(report.cleaned)} files, {len(report.skipped)} unchanged, "
+            f"{len(report.failed)} failed, {len(report.removed)} removed; "
+            f"seasons changed: {sorted(report.changed_seasons)}"
+        )
+        return report
+    
+    def _clean_files(self, raw_files, chunksize, workers):
+        """Yield (raw_file, CleanedFile or the exception it raised) as files finish"""
+        if workers <= 1 or len(raw_files) <= 1:
+            for raw_file in raw_files:
+                try:
+                    yield raw_file, _clean_file_task(type(self), self.processed_path, raw_file, chunksize)
+                except Exception as e:
+                    yield raw_file, e
+            return
+        
+        with ProcessPoolExecutor(max_workers=min(workers, len(raw_files))) as pool:
+            futures = {
+                pool.submit(_clean_file_task, type(self), self.processed_path, raw_file, chunksize): raw_file
+                for raw_file in raw_files
+            }
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    # Includes BrokenProcessPool when a worker dies outright
+                    yield futures[future], e
+    
+    def _clean_file(self, raw_file, chunksize=None, export_csv=False):
+        """Clean one raw file into the store, under a source named after the file"""
+        seasons = defaultdict(SummaryStats)
+        rows, schema, df = 0, None, None
+        chunks = pd.read_csv(raw_file, chunksize=chunksize) if chunksize else [pd.read_csv(raw_file)]
+        # Match numbers export as integers, like a full read, unless some row of the file lacks one
+        integral = export_csv and chunksize and _all_match_numbers(raw_file, chunksize)
+        
+        with SeasonPartitionWriter(self.store_path, raw_file.stem) as writer:
+            for i, df in enumerate(chunks):
+                if schema is None:
+                    schema = {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+                df = self.transform(df)
+                writer.write(df)
+                if export_csv:
+                    if not chunksize:
+                        integral = df['match_number'].notna().all()
+                    export = df.astype({'match_number': int}) if integral else df
+                    export.to_csv(self.csv_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+                for season, part in df.groupby('season', sort=False):
+                    seasons[season].update(part)
+                rows += len(df)
+        
+        return CleanedFile(
+            rows=rows,
+            schema=schema or {},
+            seasons=dict(seasons),
+            changed_seasons=writer.changed_seasons,
+            frame=None if chunksize else df,
+        )
+    
+    def _record(self, manifest, raw_file, result):
+        seasons = {season: stats.to_dict() for season, stats in result.seasons.items()}
+        manifest.record(raw_file, result.rows, result.schema, seasons)
+    
+    def transform(self, df):
+        """Apply every cleaning stage to a raw DataFrame"""
+        # Clean column names
+        df.columns = df.columns.str.lower().str.strip()
+        
+        # Basic cleaning steps
+        df = self._clean_dates(df)
+        df = self._clean_team_names(df)
+        df = self._clean_match_details(df)
+        df = self._add_calculated_fields(df)
+        return df
+    
     def _clean_dates(self, df):
         """Clean and standardize dates"""
         try:
@@ -69,11 +431,11 @@ class WPLDataCleaner:
         team_columns = ['team1', 'team2', 'winner', 'toss_winner']
         for col in team_columns:
             if col in df.columns:
-                df[col] = df[col].str.strip()
+                df[col] = _map_unique(df[col], lambda s: s.str.strip())
         
         if 'venue' in df.columns:
-            df['venue'] = df['venue'].str.strip()
-            df['city'] = df['city'].str.strip()
+            df['venue'] = _map_unique(df['venue'], lambda s: s.str.strip())
+            df['city'] = _map_unique(df['city'], lambda s: s.str.strip())
         
         return df
     
@@ -82,101 +444,112 @@ class WPLDataCleaner:
         # Convert winner runs and wickets to numeric
         numeric_cols = ['winner_runs', 'winner_wickets']
         for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+            # Always float, so a chunk without missing values writes 143.0 like the full file
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(float)
         
-        # Clean match number - handle missing values
-        def extract_match_number(x):
-            if pd.isna(x):
-                return None
-            match = re.search(r'(\d+)', str(x))
-            return int(match.group(1)) if match else None
-        
-        df['match_number'] = df['match_number'].apply(extract_match_number)
+        # Clean match number - first run of digits, missing values stay NaN
+        df['match_number'] = _match_numbers(df['match_number'])
         
         return df
     
     def _add_calculated_fields(self, df):
         """Add calculated statistics"""
         # Add match margin type
-        df['win_type'] = np.where(df['winner_runs'].notna(), 'runs', 
-                                 np.where(df['winner_wickets'].notna(), 'wickets', 'unknown'))
+        has_runs = df['winner_runs'].notna()
+        has_wickets = df['winner_wickets'].notna()
+        df['win_type'] = np.select([has_runs, has_wickets], ['runs', 'wickets'], 'unknown')
         
         # Add margin value
-        df['margin'] = np.where(df['win_type'] == 'runs', df['winner_runs'],
-                               np.where(df['win_type'] == 'wickets', df['winner_wickets'], np.nan))
+        df['margin'] = np.select([has_runs, has_wickets],
+                                 [df['winner_runs'], df['winner_wickets']], np.nan)
         
         # Add home advantage indicator
-        df['is_home_win'] = df.apply(lambda x: x['winner'] == x['team1'], axis=1)
+        df['is_home_win'] = df['winner'] == df['team1']
         
         # Add toss factor
         df['won_toss_and_match'] = df['winner'] == df['toss_winner']
         
         # Add match outcome details
-        df['match_result'] = df.apply(
-            lambda x: f"{x['winner']} won by {int(x['margin'])} {x['win_type']}" 
-            if pd.notna(x['margin']) else "No result",
-            axis=1
+        has_margin = df['margin'].notna()
+        margin_text = _map_unique(df['margin'], lambda s: s.astype(int).astype(str))
+        df['match_result'] = np.where(
+            has_margin,
+            df['winner'].astype(str) + ' won by ' + margin_text + ' ' + df['win_type'],
+            'No result'
         )
         
         return df
     
     def _generate_summary(self, df):
         """Generate and save data summary"""
+        self._write_summary(SummaryStats.from_frame(df))
+    
+    def _write_summary_from(self, manifest):
+        """Write the summary of every file in the store from the manifest's statistics"""
+        stats = SummaryStats.merged(SummaryStats.from_dict(d) for _, d in manifest.season_stats())
+        self._write_summary(stats)
+        return stats
+    
+    def _write_summary(self, stats):
+        """Write data_summary.txt from merged ``SummaryStats``"""
         summary_file = self.processed_path / 'data_summary.txt'
         
         with open(summary_file, 'w') as f:
             f.write("WPL Data Summary\n")
             f.write("===============\n\n")
             
-            f.write(f"Total Matches: {len(df)}\n")
-            f.write(f"Season: {df['season'].unique()[0]}\n")
-            f.write(f"Date Range: {df['date'].min()} to {df['date'].max()}\n\n")
+            f.write(f"Total Matches: {stats.total_matches}\n")
+            f.write(f"Season: {stats.season}\n")
+            f.write(f"Date Range: {stats.date_min} to {stats.date_max}\n\n")
             
             f.write("Teams Performance:\n")
             f.write("------------------\n")
-            teams = set(df['team1'].unique()) | set(df['team2'].unique())
-            for team in sorted(teams):
-                team_wins = len(df[df['winner'] == team])
-                total_matches = len(df[(df['team1'] == team) | (df['team2'] == team)])
-                win_rate = (team_wins / total_matches * 100) if total_matches > 0 else 0
+            for team, row in stats.team_table().iterrows():
                 f.write(f"{team}:\n")
-                f.write(f"- Matches played: {total_matches}\n")
-                f.write(f"- Matches won: {team_wins}\n")
-                f.write(f"- Win rate: {win_rate:.1f}%\n\n")
+                f.write(f"- Matches played: {int(row['matches_played'])}\n")
+                f.write(f"- Matches won: {int(row['matches_won'])}\n")
+                f.write(f"- Win rate: {row['win_rate']:.1f}%\n\n")
             
             f.write("\nVenue Statistics:\n")
             f.write("----------------\n")
-            venue_stats = df.groupby('venue').agg({
-                'match_number': 'count',
-                'winner_runs': lambda x: x.mean(skipna=True),
-                'winner_wickets': lambda x: x.mean(skipna=True)
-            }).round(2)
+            venue_stats = stats.venue_table()
             
-            for venue, stats in venue_stats.iterrows():
+            for venue, stats_row in venue_stats.iterrows():
                 f.write(f"{venue}:\n")
-                f.write(f"- Matches hosted: {int(stats['match_number'])}\n")
-                if not pd.isna(stats['winner_runs']):
-                    f.write(f"- Average winning margin (runs): {stats['winner_runs']}\n")
-                if not pd.isna(stats['winner_wickets']):
-                    f.write(f"- Average winning margin (wickets): {stats['winner_wickets']}\n")
+                f.write(f"- Matches hosted: {int(stats_row['matches'])}\n")
+                if not pd.isna(stats_row['avg_winning_runs']):
+                    f.write(f"- Average winning margin (runs): {stats_row['avg_winning_runs']}\n")
+                if not pd.isna(stats_row['avg_winning_wickets']):
+                    f.write(f"- Average winning margin (wickets): {stats_row['avg_winning_wickets']}\n")
                 f.write("\n")
             
             f.write("\nToss Impact:\n")
             f.write("-----------\n")
-            toss_wins = len(df[df['won_toss_and_match']])
-            toss_win_percentage = (toss_wins / len(df)) * 100
-            f.write(f"Teams winning both toss and match: {toss_wins} ({toss_win_percentage:.1f}%)\n")
+            toss = stats.toss_impact()
+            f.write(f"Teams winning both toss and match: {toss['toss_and_match_wins']} ({toss['percentage']:.1f}%)\n")
             
             f.write("\nTop Players:\n")
             f.write("-----------\n")
-            pom_counts = df['player_of_match'].value_counts()
             f.write("Player of the Match awards:\n")
-            for player, count in pom_counts.head().items():
+            for player, count in stats.top_players().items():
                 f.write(f"- {player}: {count} awards\n")
         
         logger.info(f"Data summary saved to: {summary_file}")
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Clean the raw WPL data")
+    parser.add_argument('--chunksize', type=int, help="stream the raw file in chunks of this many rows")
+    parser.add_argument('--csv', action='store_true', help="also export wpl_clean.csv")
+    parser.add_argument('--all', action='store_true', help="clean every file in data/raw")
+    parser.add_argument('--incremental', action='store_true',
+                        help="clean only new or changed files in data/raw")
+    parser.add_argument('--workers', type=int, help="files cleaned in parallel with --all/--incremental")
+    parser.add_argument('--no-import', action='store_true',
+                        help="with --all/--incremental, leave the database alone instead of syncing changed seasons")
+    args = parser.parse_args()
+    
     # Set up logging
     logging.basicConfig(
         level=logging.INFO,
@@ -185,4 +558,14 @@ if __name__ == "__main__":
     
     # Run the cleaner
     cleaner = WPLDataCleaner()
-    cleaner.clean_data()
\ No newline at end of file
+    if args.all or args.incremental:
+        report = cleaner.clean_directory(chunksize=args.chunksize, workers=args.workers, incremental=args.incremental)
+        if not args.no_import:
+            from app.db.database import SessionLocal
+            from app.db.wpl_import import sync_clean_report
+            with SessionLocal() as session:
+                sync_clean_report(session, report, cleaner.store_path)
+    elif args.chunksize:
+        cleaner.clean_data_chunked(args.chunksize, export_csv=args.csv)
+    else:
+        cleaner.clean_data(export_csv=args.csv)
\ No newline at end of file
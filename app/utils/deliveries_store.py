@@ -0,0 +1,223 @@
+# app/utils/deliveries_store.py
+"""Season-partitioned Parquet store of ball-by-ball deliveries.
+
+``data/processed/deliveries.parquet/season=YYYY/part-0.parquet`` holds one
+row per delivery with compact integer types and dictionary-encoded names,
+sorted by match, innings, over and ball. Matches are written whole: a
+match that arrives again replaces its earlier deliveries, and the writer
+hands those back so derived stats can be corrected by the difference.
+``replacing_matches`` keeps the replaced files until the caller's
+database commit succeeds and restores them otherwise.
+
+``over`` is 0-based and ``ball`` is the delivery's number within the over,
+as in Cricsheet's ``over.ball`` notation; extras that are re-bowled keep
+their ball number. ``extra_type`` is one of EXTRA_TYPES or null.
+"""
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.utils.processed_store import PARTITION_COLUMN
+
+STORE_NAME = 'deliveries.parquet'
+PART_NAME = 'part-0.parquet'
+# About 40 matches per row group, so a match_id filter reads a sliver of a season
+ROW_GROUP_SIZE = 10_000
+
+EXTRA_TYPES = ('wides', 'noballs', 'byes', 'legbyes', 'penalty')
+ORDER = ['match_id', 'innings', 'over', 'ball']
+
+SCHEMA = pa.schema([
+    ('match_id', pa.int32()),
+    ('innings', pa.int8()),
+    ('over', pa.int8()),
+    ('ball', pa.int8()),
+    ('batting_team', pa.string()),
+    ('bowling_team', pa.string()),
+    ('batter', pa.string()),
+    ('non_striker', pa.string()),
+    ('bowler', pa.string()),
+    ('runs', pa.int8()),
+    ('extras', pa.int8()),
+    ('extra_type', pa.string()),
+    ('dismissal', pa.string()),
+    ('player_dismissed', pa.string()),
+])
+STRING_COLUMNS = tuple(f.name for f in SCHEMA if f.type == pa.string())
+REQUIRED_COLUMNS = ('match_id', 'innings', 'batting_team', 'bowling_team', 'batter', 'bowler', 'runs')
+
+# Cricsheet "csv2" ball-by-ball column -> store column
+CRICSHEET_COLUMNS = {'striker': 'batter', 'runs_off_bat': 'runs', 'wicket_type': 'dismissal'}
+
+
+def default_deliveries_path() -> Path:
+    return Path(__file__).parent.parent.parent / 'data' / 'processed' / STORE_NAME
+
+
+def normalise_deliveries(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a deliveries frame (store columns or Cricsheet layout) to the store's types.
+
+    Returns the SCHEMA columns plus ``season``. Read Cricsheet files with
+    ``dtype={'ball': str}`` so that ball 10 of an over is not read as 1.
+    """
+    df = df.rename(columns=lambda c: str(c).strip().lower()).rename(columns=CRICSHEET_COLUMNS)
+    if 'over' not in df.columns and 'ball' in df.columns:
+        over_ball = df['ball'].astype(str).str.split('.', n=1, expand=True)
+        df['over'], df['ball'] = over_ball[0], over_ball[1]
+    if 'extra_type' not in df.columns:
+        df['extra_type'] = None
+        for kind in reversed([k for k in EXTRA_TYPES if k in df.columns]):
+            df.loc[pd.to_numeric(df[kind], errors='coerce').fillna(0) > 0, 'extra_type'] = kind
+    if 'season' not in df.columns:
+        if 'start_date' not in df.columns:
+            raise ValueError("Deliveries need a season or start_date column")
+        df['season'] = pd.to_datetime(df['start_date']).dt.year
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    frame = pd.DataFrame({
+        # Cricsheet seasons can span years ("2007/08"); the first one names the season
+        'season': df['season'].astype(str).str[:4].astype('int64'),
+    }, index=df.index)
+    for field in SCHEMA:
+        if field.name not in df.columns:
+            frame[field.name] = 0 if pa.types.is_integer(field.type) else None
+        elif pa.types.is_integer(field.type):
+            frame[field.name] = pd.to_numeric(df[field.name], errors='coerce').fillna(0).astype(
+                field.type.to_pandas_dtype())
+        else:
+            frame[field.name] = df[field.name].astype(object).where(df[field.name].notna(), None)
+    return frame.reset_index(drop=True)
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    columns = {
+        name: (df[name].astype(object) if isinstance(df[name].dtype, pd.CategoricalDtype) else df[name])
+        for name in SCHEMA.names
+    }
+    return pa.Table.from_pandas(pd.DataFrame(columns), schema=SCHEMA, preserve_index=False)
+
+
+def read_deliveries(
+    path: Optional[Path] = None,
+    columns: Optional[Iterable[str]] = None,
+    seasons: Optional[Iterable[int]] = None,
+    match_ids: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
+    """Load deliveries, reading only ``columns``, ``seasons`` and ``match_ids``.
+
+    Name columns come back as ``category``; ``season`` is included unless
+    ``columns`` leaves it out.
+    """
+    path = Path(path or default_deliveries_path())
+    columns = list(columns) if columns is not None else [PARTITION_COLUMN] + SCHEMA.names
+    if not any(path.glob(f'{PARTITION_COLUMN}=*/{PART_NAME}')):
+        return _empty()[columns]
+    filters = []
+    if seasons is not None:
+        filters.append((PARTITION_COLUMN, 'in', list(seasons)))
+    if match_ids is not None:
+        match_ids = [int(m) for m in match_ids]
+        if not match_ids:
+            return _empty()[columns]
+        # Row groups are pruned on min/max statistics for ranges, not for 'in'
+        filters += [('match_id', '>=', min(match_ids)), ('match_id', '<=', max(match_ids)),
+                    ('match_id', 'in', match_ids)]
+    table = pq.read_table(
+        path,
+        columns=columns,
+        filters=filters or None,
+        memory_map=True,
+        read_dictionary=[c for c in STRING_COLUMNS if c in columns],
+    )
+    df = table.to_pandas()
+    if PARTITION_COLUMN in df.columns:
+        df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype('int64')
+    return df[columns]
+
+
+def upsert_matches(df: pd.DataFrame, path: Optional[Path] = None) -> pd.DataFrame:
+    """Write whole matches into the store, replacing earlier copies of them.
+
+    ``df`` is a normalised frame; returns the deliveries it replaced (empty
+    for new matches), wherever they were stored.
+    """
+    with replacing_matches(df, path) as replaced:
+        return replaced
+
+
+@contextmanager
+def replacing_matches(df: pd.DataFrame, path: Optional[Path] = None) -> Iterator[pd.DataFrame]:
+    """``upsert_matches`` that puts the previous season files back if the block raises.
+
+    Every season file is written to a temporary file first, so a failed
+    write changes nothing; they are then renamed into place, keeping the
+    files they replace until the block exits. A database commit inside the
+    block therefore decides whether the store keeps the new matches.
+    """
+    path = Path(path or default_deliveries_path())
+    match_ids = df['match_id'].unique()
+    held = read_deliveries(path, columns=[PARTITION_COLUMN, 'match_id'], match_ids=match_ids)
+    # A match whose season was corrected also has to leave its old partition
+    seasons = sorted(set(df[PARTITION_COLUMN]) | set(held[PARTITION_COLUMN]))
+
+    replaced, staged = [], []
+    try:
+        for season in seasons:
+            part = df.loc[df[PARTITION_COLUMN] == season, SCHEMA.names]
+            target = path / f'{PARTITION_COLUMN}={season}' / PART_NAME
+            if target.exists():
+                existing = pq.read_table(target, read_dictionary=list(STRING_COLUMNS)).to_pandas()
+                stale = existing['match_id'].isin(match_ids).to_numpy()
+                replaced.append(existing[stale].assign(**{PARTITION_COLUMN: season}))
+                part = pd.concat([existing[~stale], part], ignore_index=True)
+            staged.append((target, _stage_season(target, part.sort_values(ORDER, kind='stable'))))
+    except BaseException:
+        for _, staging in staged:
+            if staging is not None:
+                staging.unlink(missing_ok=True)
+        raise
+
+    replaced = pd.concat(replaced, ignore_index=True)[[PARTITION_COLUMN] + SCHEMA.names] if replaced else _empty()
+    published = []
+    try:
+        for target, staging in staged:
+            backup = target.with_name(f'.{PART_NAME}.bak')
+            if target.exists():
+                os.replace(target, backup)
+            published.append((target, backup))
+            if staging is not None:
+                os.replace(staging, target)
+        yield replaced
+    except BaseException:
+        for target, backup in reversed(published):
+            if backup.exists():
+                os.replace(backup, target)
+            else:
+                target.unlink(missing_ok=True)
+        for _, staging in staged:
+            if staging is not None:
+                staging.unlink(missing_ok=True)
+        raise
+    for _, backup in published:
+        backup.unlink(missing_ok=True)
+
+
+def _stage_season(target: Path, part: pd.DataFrame) -> Optional[Path]:
+    """Write ``part`` beside ``target``; None when the season is left empty"""
+    if part.empty:
+        return None
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.with_name(f'.{PART_NAME}.tmp')
+    pq.write_table(_to_table(part), staging, row_group_size=ROW_GROUP_SIZE)
+    return staging
+
+
+def _empty() -> pd.DataFrame:
+    return normalise_deliveries(pd.DataFrame(columns=[PARTITION_COLUMN] + SCHEMA.names))
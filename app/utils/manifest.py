@@ -0,0 +1,88 @@
+# app/utils/manifest.py
+"""Manifest of the raw files behind the processed store.
+
+``data/processed/manifest.json`` records, per raw file, its SHA-256, size,
+mtime, row count, column schema and the per-season summary statistics of
+its cleaned rows. A file whose size and mtime are unchanged is trusted
+without hashing; otherwise the hash decides, so touching a file does not
+trigger a reclean.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(self, path: Path, entries: Optional[Dict[str, Dict]] = None):
+        self.path = Path(path)
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> 'Manifest':
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        data = json.loads(path.read_text())
+        if data.get('version') != MANIFEST_VERSION:
+            # Unknown layout: start over, which recleans every file once
+            return cls(path)
+        return cls(path, data['files'])
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps({'version': MANIFEST_VERSION, 'files': self.entries}, indent=2))
+        os.replace(tmp, self.path)
+
+    def is_current(self, raw_file: Path) -> bool:
+        """Whether ``raw_file`` is unchanged since it was last cleaned"""
+        entry = self.entries.get(raw_file.name)
+        if entry is None:
+            return False
+        stat = raw_file.stat()
+        if (stat.st_size, stat.st_mtime_ns) == (entry['size'], entry['mtime_ns']):
+            return True
+        if stat.st_size != entry['size'] or file_digest(raw_file) != entry['sha256']:
+            return False
+        # Same content under a new mtime; remember it to skip the hash next time
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    def record(self, raw_file: Path, rows: int, schema: Dict[str, str], seasons: Dict[int, Dict]):
+        stat = raw_file.stat()
+        self.entries[raw_file.name] = {
+            'sha256': file_digest(raw_file),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'rows': rows,
+            'schema': schema,
+            'seasons': {str(season): stats for season, stats in sorted(seasons.items())},
+            'cleaned_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+
+    def remove(self, name: str):
+        self.entries.pop(name, None)
+
+    def season_stats(self) -> Iterator[Tuple[int, Dict]]:
+        """Every (season, stats) pair across files, in season then file order"""
+        pairs = [
+            (int(season), name, stats)
+            for name, entry in self.entries.items()
+            for season, stats in entry['seasons'].items()
+        ]
+        for season, _, stats in sorted(pairs, key=lambda pair: pair[:2]):
+            yield season, stats
@@ -0,0 +1,144 @@
+# app/utils/match_index.py
+"""Precomputed filter indexes over the dashboard's match frame.
+
+``MatchIndex`` sorts the matches by date once, then resolves a date range
+with two binary searches and team/season filters through value -> row
+position maps, so a filter never scans or copies the whole frame.
+Aggregates for a (start, end, team, season) combination are memoized in
+an LRU cache. The same index backs the dashboard in local mode and the
+/wpl/dashboard API routes.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.utils.aggregations import table_records, team_performance
+
+DEFAULT_CACHE_SIZE = 128
+# Columns the index reads; the rest of the store is never loaded
+DASHBOARD_COLUMNS = [
+    'date', 'season', 'team1', 'team2', 'winner', 'venue', 'win_type', 'won_toss_and_match', 'match_result',
+]
+DETAIL_COLUMNS = ['date', 'team1', 'team2', 'winner', 'match_result', 'venue']
+_NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class FilterSummary:
+    matches: int
+    wins_by_runs: int
+    wins_by_wickets: int
+    toss_win_pct: Optional[float]
+    team_table: pd.DataFrame
+    win_type_counts: pd.Series
+    venue_counts: pd.Series
+    details: pd.DataFrame
+
+    def to_dict(self) -> Dict:
+        """JSON-ready form without the details table, which is served separately"""
+        return {
+            'matches': self.matches,
+            'wins_by_runs': self.wins_by_runs,
+            'wins_by_wickets': self.wins_by_wickets,
+            'toss_win_pct': self.toss_win_pct,
+            'teams': table_records(self.team_table),
+            'win_types': {str(k): int(v) for k, v in self.win_type_counts.items()},
+            'venues': {str(k): int(v) for k, v in self.venue_counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, details: Optional[pd.DataFrame] = None) -> 'FilterSummary':
+        teams = pd.DataFrame(data['teams'], columns=['team', 'matches_played', 'matches_won', 'win_rate'])
+        return cls(
+            matches=data['matches'],
+            wins_by_runs=data['wins_by_runs'],
+            wins_by_wickets=data['wins_by_wickets'],
+            toss_win_pct=data['toss_win_pct'],
+            team_table=teams.set_index('team'),
+            win_type_counts=pd.Series(data['win_types'], dtype='int64'),
+            venue_counts=pd.Series(data['venues'], dtype='int64'),
+            details=details if details is not None else pd.DataFrame(columns=DETAIL_COLUMNS),
+        )
+
+
+class MatchIndex:
+    def __init__(self, df: pd.DataFrame, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.df = df.sort_values('date', kind='stable').reset_index(drop=True)
+        self.dates = self.df['date'].to_numpy(dtype='datetime64[ns]')
+
+        positions = np.arange(len(self.df))
+        sides = pd.DataFrame({
+            'team': np.concatenate([self.df['team1'].astype(object), self.df['team2'].astype(object)]),
+            'row': np.concatenate([positions, positions]),
+        })
+        # Sorted, de-duplicated row positions per team (a team may fill both sides)
+        self.team_rows: Dict[str, np.ndarray] = {
+            team: np.unique(rows) for team, rows in sides.groupby('team')['row']
+        }
+        self.season_rows: Dict[int, np.ndarray] = {}
+        if 'season' in self.df.columns:
+            self.season_rows = {int(season): rows for season, rows in self.df.groupby('season').indices.items()}
+        self.summary = lru_cache(maxsize=cache_size)(self._summary)
+
+    @property
+    def teams(self) -> List[str]:
+        return sorted(self.team_rows)
+
+    @property
+    def seasons(self) -> List[int]:
+        return sorted(self.season_rows)
+
+    @property
+    def min_date(self) -> Optional[date]:
+        return pd.Timestamp(self.dates[0]).date() if len(self.dates) else None
+
+    @property
+    def max_date(self) -> Optional[date]:
+        return pd.Timestamp(self.dates[-1]).date() if len(self.dates) else None
+
+    def _bounds(self, start: date, end: date):
+        # Dates are inclusive; the end bound is the first row after ``end``
+        lo = np.searchsorted(self.dates, np.datetime64(start, 'ns'), side='left')
+        hi = np.searchsorted(self.dates, np.datetime64(end + timedelta(days=1), 'ns'), side='left')
+        return lo, hi
+
+    def rows(self, start: date, end: date, team: Optional[str] = None, season: Optional[int] = None) -> np.ndarray:
+        """Row positions of matches between ``start`` and ``end``, optionally for one team/season"""
+        lo, hi = self._bounds(start, end)
+        selected = None
+        for lookup, key in ((self.team_rows, team), (self.season_rows, season)):
+            if key is None:
+                continue
+            rows = lookup.get(key, _NO_ROWS)
+            rows = rows[np.searchsorted(rows, lo):np.searchsorted(rows, hi)]
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        return np.arange(lo, hi) if selected is None else selected
+
+    def frame(self, start: date, end: date, team: Optional[str] = None, season: Optional[int] = None) -> pd.DataFrame:
+        if team is None and season is None:
+            lo, hi = self._bounds(start, end)
+            return self.df.iloc[lo:hi]
+        return self.df.iloc[self.rows(start, end, team, season)]
+
+    def _summary(
+        self, start: date, end: date, team: Optional[str] = None, season: Optional[int] = None
+    ) -> FilterSummary:
+        """Everything the dashboard draws for one filter combination (memoized)"""
+        df = self.frame(start, end, team, season)
+        win_type = df['win_type'].value_counts()
+        venues = df['venue'].value_counts()
+        return FilterSummary(
+            matches=len(df),
+            wins_by_runs=int((df['win_type'] == 'runs').sum()),
+            wins_by_wickets=int((df['win_type'] == 'wickets').sum()),
+            toss_win_pct=df['won_toss_and_match'].mean() * 100 if len(df) else None,
+            team_table=team_performance(df),
+            # Categorical columns also count unused categories; drop the zeros
+            win_type_counts=win_type[win_type > 0],
+            venue_counts=venues[venues > 0],
+            details=df[DETAIL_COLUMNS],
+        )
@@ -0,0 +1,259 @@
+# app/utils/matchups.py
+"""Head-to-head, venue and toss matrices over the processed match store.
+
+``MatchupIndex`` gives every team and venue an integer id and keeps dense
+arrays of per-side results:
+
+- ``head_to_head[team, opponent]``
+- ``team_venue[team, venue]``
+- ``team_toss[team, decision]`` for matches the team won the toss in
+
+Each cell holds the STATS counts and margin sums, so a lookup is a couple
+of array reads. A pair at one venue is too sparse for a dense cube; those
+cells live in a sorted key table and are found by binary search.
+
+Matches are added one season at a time and each season's encoded rows are
+kept, so a season that changes is subtracted and added again without
+touching the others.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columns the index reads from the store
+MATCHUP_COLUMNS = [
+    'season', 'team1', 'team2', 'venue', 'toss_winner', 'toss_decision', 'winner', 'winner_runs', 'winner_wickets',
+]
+STATS = ('played', 'won', 'no_result', 'won_by_runs', 'run_margin', 'won_by_wickets', 'wicket_margin')
+TOSS_DECISIONS = ('bat', 'field')
+
+_PLAYED, _WON, _NO_RESULT, _WON_BY_RUNS, _RUN_MARGIN, _WON_BY_WICKETS, _WICKET_MARGIN = range(len(STATS))
+
+
+def _side_stats(won: np.ndarray, no_result: np.ndarray, runs: np.ndarray, wickets: np.ndarray) -> np.ndarray:
+    stats = np.zeros((len(won), len(STATS)), dtype=np.int64)
+    stats[:, _PLAYED] = 1
+    stats[:, _WON] = won
+    stats[:, _NO_RESULT] = no_result
+    stats[:, _WON_BY_RUNS] = won & (runs > 0)
+    stats[:, _RUN_MARGIN] = np.where(won, runs, 0)
+    stats[:, _WON_BY_WICKETS] = won & (wickets > 0)
+    stats[:, _WICKET_MARGIN] = np.where(won, wickets, 0)
+    return stats
+
+
+def _scatter_add(target: np.ndarray, index: Tuple[np.ndarray, ...], stats: np.ndarray):
+    """``target[index] += stats`` with repeated indexes summed, one bincount per stat"""
+    cells = int(np.prod(target.shape[:-1]))
+    flat = np.ravel_multi_index(index, target.shape[:-1])
+    sums = np.stack([np.bincount(flat, weights=stats[:, k], minlength=cells) for k in range(len(STATS))], axis=1)
+    target += sums.astype(np.int64).reshape(target.shape)
+
+
+def summarise(cell: np.ndarray) -> Dict:
+    """One cell's STATS as a dict, with losses and average margins"""
+    stats = {name: int(value) for name, value in zip(STATS, cell)}
+    stats['lost'] = stats['played'] - stats['won'] - stats['no_result']
+    stats['win_pct'] = round(stats['won'] * 100 / stats['played'], 1) if stats['played'] else None
+    stats['avg_run_margin'] = (
+        round(stats['run_margin'] / stats['won_by_runs'], 1) if stats['won_by_runs'] else None)
+    stats['avg_wicket_margin'] = (
+        round(stats['wicket_margin'] / stats['won_by_wickets'], 1) if stats['won_by_wickets'] else None)
+    return stats
+
+
+class MatchupIndex:
+    def __init__(self):
+        self.teams: List[str] = []
+        self.venues: List[str] = []
+        self.team_ids: Dict[str, int] = {}
+        self.venue_ids: Dict[str, int] = {}
+        self.head_to_head = np.zeros((0, 0, len(STATS)), dtype=np.int64)
+        self.team_venue = np.zeros((0, 0, len(STATS)), dtype=np.int64)
+        self.team_toss = np.zeros((0, len(TOSS_DECISIONS), len(STATS)), dtype=np.int64)
+        # Encoded rows per season: team1, team2, venue, toss side, decision, winner side, runs, wickets
+        self._seasons: Dict[int, np.ndarray] = {}
+        self._pair_venue_keys = np.empty(0, dtype=np.int64)
+        self._pair_venue_cells = np.zeros((0, 3), dtype=np.int64)
+        self._pair_venue_stats = np.zeros((0, len(STATS)), dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'MatchupIndex':
+        index = cls()
+        index.update({int(season): part for season, part in df.groupby('season', observed=True)})
+        return index
+
+    def copy(self) -> 'MatchupIndex':
+        """An independent index to update while this one keeps serving reads"""
+        other = MatchupIndex()
+        other.teams, other.venues = list(self.teams), list(self.venues)
+        other.team_ids, other.venue_ids = dict(self.team_ids), dict(self.venue_ids)
+        other.head_to_head = self.head_to_head.copy()
+        other.team_venue = self.team_venue.copy()
+        other.team_toss = self.team_toss.copy()
+        # Encoded seasons are never modified, only replaced
+        other._seasons = dict(self._seasons)
+        other._pair_venue_keys = self._pair_venue_keys
+        other._pair_venue_cells = self._pair_venue_cells
+        other._pair_venue_stats = self._pair_venue_stats
+        return other
+
+    @property
+    def seasons(self) -> List[int]:
+        return sorted(self._seasons)
+
+    def _ids(self, values: pd.Series, names: List[str], ids: Dict[str, int]) -> np.ndarray:
+        """Codes for ``values`` (-1 for missing), adding unseen names to the vocabulary"""
+        codes, uniques = pd.factorize(values.astype(object))
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, name in enumerate(uniques):
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+            mapping[i] = ids[name]
+        return np.where(codes >= 0, mapping[codes] if len(mapping) else codes, -1)
+
+    def _encode(self, df: pd.DataFrame) -> np.ndarray:
+        team1 = self._ids(df['team1'], self.teams, self.team_ids)
+        team2 = self._ids(df['team2'], self.teams, self.team_ids)
+        venue = self._ids(df['venue'], self.venues, self.venue_ids)
+        toss = df['toss_winner'].astype(object).to_numpy()
+        winner = df['winner'].astype(object).to_numpy()
+        names1, names2 = df['team1'].astype(object).to_numpy(), df['team2'].astype(object).to_numpy()
+        decision = df['toss_decision'].astype(object).map({d: i for i, d in enumerate(TOSS_DECISIONS)})
+        encoded = np.column_stack([
+            team1,
+            team2,
+            venue,
+            np.select([toss == names1, toss == names2], [0, 1], -1),
+            decision.fillna(-1).to_numpy(dtype=np.int64),
+            # A winner that is neither side (or none) is a no result
+            np.select([winner == names1, winner == names2], [0, 1], -1),
+            df['winner_runs'].fillna(0).to_numpy(dtype=np.int64),
+            df['winner_wickets'].fillna(0).to_numpy(dtype=np.int64),
+        ])
+        # Matches without both teams cannot be placed in the matrices
+        return encoded[(team1 >= 0) & (team2 >= 0)]
+
+    def _grow(self):
+        n_teams, n_venues = len(self.teams), len(self.venues)
+
+        def padded(array, shape):
+            if array.shape == shape:
+                return array
+            grown = np.zeros(shape, dtype=array.dtype)
+            grown[tuple(slice(0, n) for n in array.shape)] = array
+            return grown
+
+        self.head_to_head = padded(self.head_to_head, (n_teams, n_teams, len(STATS)))
+        self.team_venue = padded(self.team_venue, (n_teams, n_venues, len(STATS)))
+        self.team_toss = padded(self.team_toss, (n_teams, len(TOSS_DECISIONS), len(STATS)))
+
+    def _sides(self, encoded: np.ndarray):
+        """(team, opponent, venue, decision when this side won the toss, stats) per side"""
+        team1, team2, venue, toss_side, decision, winner_side, runs, wickets = encoded.T
+        for side, (team, opponent) in enumerate(((team1, team2), (team2, team1))):
+            stats = _side_stats(winner_side == side, winner_side < 0, runs, wickets)
+            yield team, opponent, venue, np.where(toss_side == side, decision, -1), stats
+
+    def _apply(self, encoded: np.ndarray, sign: np.ndarray):
+        """Add (sign 1) or remove (sign -1) each encoded match"""
+        for team, opponent, venue, decision, stats in self._sides(encoded):
+            stats = stats * sign[:, None]
+            _scatter_add(self.head_to_head, (team, opponent), stats)
+            has_venue = venue >= 0
+            _scatter_add(self.team_venue, (team[has_venue], venue[has_venue]), stats[has_venue])
+            chose = decision >= 0
+            _scatter_add(self.team_toss, (team[chose], decision[chose]), stats[chose])
+        self._update_pair_venue(encoded, sign)
+
+    def _update_pair_venue(self, encoded: np.ndarray, sign: np.ndarray):
+        """Merge the changes into the sorted (team, opponent, venue) table"""
+        cells, stats = [self._pair_venue_cells], [self._pair_venue_stats]
+        for team, opponent, venue, _, side_stats in self._sides(encoded):
+            has_venue = venue >= 0
+            cells.append(np.column_stack([team[has_venue], opponent[has_venue], venue[has_venue]]))
+            stats.append(side_stats[has_venue] * sign[has_venue, None])
+        cells, stats = np.concatenate(cells), np.concatenate(stats)
+        # Keys are recomputed with the current vocabulary sizes, which may have grown
+        keys = np.ravel_multi_index(tuple(cells.T), (len(self.teams), len(self.teams), max(len(self.venues), 1)))
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        totals = np.zeros((len(unique), len(STATS)), dtype=np.int64)
+        _scatter_add(totals, (inverse,), stats)
+        played = totals[:, _PLAYED] != 0
+        self._pair_venue_keys = unique[played]
+        self._pair_venue_cells = cells[first][played]
+        self._pair_venue_stats = totals[played]
+
+    def update(self, seasons: Dict[int, pd.DataFrame], removed: Iterable[int] = ()):
+        """Replace the given seasons' matches (and drop ``removed`` seasons)"""
+        changes, signs = [], []
+        for season in set(seasons) | set(removed):
+            old = self._seasons.pop(season, None)
+            if old is not None:
+                changes.append(old)
+                signs.append(np.full(len(old), -1, dtype=np.int64))
+        for season, df in seasons.items():
+            self._seasons[season] = encoded = self._encode(df)
+            changes.append(encoded)
+            signs.append(np.ones(len(encoded), dtype=np.int64))
+        if changes:
+            # Old and new matches of every changed season go through in one pass
+            self._grow()
+            self._apply(np.concatenate(changes), np.concatenate(signs))
+
+    def _team(self, name: str) -> int:
+        if name not in self.team_ids:
+            raise KeyError(f"Unknown team: {name}")
+        return self.team_ids[name]
+
+    def _venue(self, name: str) -> int:
+        if name not in self.venue_ids:
+            raise KeyError(f"Unknown venue: {name}")
+        return self.venue_ids[name]
+
+    def pair_at_venue(self, team: int, opponent: int, venue: int) -> np.ndarray:
+        key = np.ravel_multi_index((team, opponent, venue), (len(self.teams), len(self.teams), len(self.venues)))
+        position = np.searchsorted(self._pair_venue_keys, key)
+        if position < len(self._pair_venue_keys) and self._pair_venue_keys[position] == key:
+            return self._pair_venue_stats[position]
+        return np.zeros(len(STATS), dtype=np.int64)
+
+    def head_to_head_stats(self, team1: str, team2: str, venue: Optional[str] = None) -> Dict:
+        """Both sides' record in matches between ``team1`` and ``team2``, optionally at one venue"""
+        a, b = self._team(team1), self._team(team2)
+        if venue is None:
+            first, second = self.head_to_head[a, b], self.head_to_head[b, a]
+        else:
+            v = self._venue(venue)
+            first, second = self.pair_at_venue(a, b, v), self.pair_at_venue(b, a, v)
+        return {
+            'team1': team1,
+            'team2': team2,
+            'venue': venue,
+            'matches': int(first[_PLAYED]),
+            'no_result': int(first[_NO_RESULT]),
+            'team1_record': summarise(first),
+            'team2_record': summarise(second),
+        }
+
+    def venue_stats(self, venue: Optional[str] = None, team: Optional[str] = None) -> Dict:
+        """A team at a venue, every team at a venue, or one team at every venue with its toss record"""
+        if venue is None and team is None:
+            raise ValueError("Give a venue, a team or both")
+        if venue is not None and team is not None:
+            return {'venue': venue, 'team': team, **summarise(self.team_venue[self._team(team), self._venue(venue)])}
+        if venue is not None:
+            cells = self.team_venue[:, self._venue(venue)]
+            rows = [{'team': self.teams[i], **summarise(cells[i])} for i in np.flatnonzero(cells[:, _PLAYED])]
+            # Each match fills two team rows
+            return {'venue': venue, 'matches': int(cells[:, _PLAYED].sum() // 2), 'teams': rows}
+        t = self._team(team)
+        cells = self.team_venue[t]
+        return {
+            'team': team,
+            'matches': int(self.head_to_head[t, :, _PLAYED].sum()),
+            'venues': [{'venue': self.venues[i], **summarise(cells[i])} for i in np.flatnonzero(cells[:, _PLAYED])],
+            'toss': {decision: summarise(self.team_toss[t, i]) for i, decision in enumerate(TOSS_DECISIONS)},
+        }
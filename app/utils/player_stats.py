@@ -0,0 +1,116 @@
+# app/utils/player_stats.py
+"""Vectorized player statistics derived from ball-by-ball deliveries.
+
+``player_counts`` reduces deliveries to additive per-(player, team) counts:
+matches, runs, balls faced, dismissals, legal balls bowled, runs conceded
+and wickets. Counts for separate matches can be summed (and a replaced
+match's counts subtracted), so one new match updates the totals without
+touching the rest. ``player_stats_table`` turns counts into the
+WPLPlayerStats fields.
+
+Names are mapped to integer codes once and every reduction is a groupby
+over integer keys, so the cost is O(deliveries) whatever the number of
+players.
+"""
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+KEY = ['player_name', 'team']
+COUNT_COLUMNS = ['matches', 'runs', 'balls_faced', 'dismissals', 'balls_bowled', 'runs_conceded', 'wickets']
+STAT_COLUMNS = ['batting_average', 'bowling_average', 'strike_rate', 'economy_rate']
+
+# Dismissals credited to the bowler; run outs and the like are not
+BOWLER_WICKETS = ('bowled', 'caught', 'caught and bowled', 'lbw', 'stumped', 'hit wicket')
+# Leaving the field this way does not end an innings for the average
+NOT_OUT = ('retired hurt', 'retired not out')
+# Extras charged to the bowler; byes, leg byes and penalties are not
+BOWLER_EXTRAS = ('wides', 'noballs')
+
+
+def _codes(df: pd.DataFrame, columns: List[str]) -> Tuple[pd.Index, List[np.ndarray]]:
+    """Shared integer codes for ``columns`` (-1 for missing) and the values they stand for"""
+    categoricals = [
+        df[c] if isinstance(df[c].dtype, pd.CategoricalDtype) else df[c].astype('category') for c in columns
+    ]
+    categories = categoricals[0].cat.categories
+    for column in categoricals[1:]:
+        categories = categories.union(column.cat.categories)
+    return categories, [c.cat.set_categories(categories).cat.codes.to_numpy().astype(np.int64) for c in categoricals]
+
+
+def _in(column: pd.Series, values) -> np.ndarray:
+    return column.isin(values).to_numpy()
+
+
+def empty_counts() -> pd.DataFrame:
+    index = pd.MultiIndex.from_arrays([[], []], names=KEY)
+    return pd.DataFrame({c: pd.Series(dtype='int64') for c in COUNT_COLUMNS}, index=index)
+
+
+def player_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """Additive batting and bowling counts per (player_name, team)"""
+    if df.empty:
+        return empty_counts()
+    players, (batter, non_striker, bowler, dismissed) = _codes(
+        df, ['batter', 'non_striker', 'bowler', 'player_dismissed'])
+    teams, (batting, bowling) = _codes(df, ['batting_team', 'bowling_team'])
+    n_teams = len(teams)
+    bat_key = batter * n_teams + batting
+    bowl_key = bowler * n_teams + bowling
+
+    runs = df['runs'].to_numpy(np.int64)
+    extras = df['extras'].to_numpy(np.int64)
+    wide = _in(df['extra_type'], ['wides'])
+    legal = ~(wide | _in(df['extra_type'], ['noballs']))
+    charged = runs + np.where(_in(df['extra_type'], BOWLER_EXTRAS), extras, 0)
+    out = (dismissed >= 0) & ~_in(df['dismissal'], NOT_OUT)
+
+    def total(keys, values):
+        return pd.Series(values, dtype='int64').groupby(keys, sort=False).sum()
+
+    counts = pd.DataFrame({
+        'runs': total(bat_key, runs),
+        'balls_faced': total(bat_key, ~wide),
+        'dismissals': total((dismissed * n_teams + batting)[out], np.ones(out.sum(), dtype=np.int64)),
+        'balls_bowled': total(bowl_key, legal),
+        'runs_conceded': total(bowl_key, charged),
+        'wickets': total(bowl_key, _in(df['dismissal'], BOWLER_WICKETS)),
+    })
+
+    # A player plays a match once however many deliveries they appear in
+    match = pd.factorize(df['match_id'])[0].astype(np.int64)
+    appearances = np.concatenate([
+        bat_key,
+        (non_striker * n_teams + batting)[non_striker >= 0],
+        bowl_key,
+    ])
+    in_match = np.concatenate([match, match[non_striker >= 0], match])
+    pairs = np.unique(appearances * (match.max() + 1) + in_match)
+    counts['matches'] = pd.Series(pairs // (match.max() + 1)).value_counts()
+
+    counts = counts.fillna(0).astype('int64')[COUNT_COLUMNS]
+    keys = counts.index.to_numpy()
+    counts.index = pd.MultiIndex.from_arrays(
+        [players[keys // n_teams].astype(object), teams[keys % n_teams].astype(object)], names=KEY)
+    return counts.sort_index()
+
+
+def combine_counts(counts: pd.DataFrame, delta: pd.DataFrame, sign: int = 1) -> pd.DataFrame:
+    """``counts`` plus (or minus) ``delta``, dropping players left with nothing"""
+    combined = counts.add(delta * sign, fill_value=0).astype('int64')
+    return combined[(combined != 0).any(axis=1)]
+
+
+def player_stats_table(counts: pd.DataFrame) -> pd.DataFrame:
+    """WPLPlayerStats rows for ``counts``; averages are null where undefined"""
+    def ratio(numerator, denominator, scale=1.0):
+        return (counts[numerator] * scale / counts[denominator].where(counts[denominator] > 0)).round(2)
+
+    table = counts.copy()
+    table['batting_average'] = ratio('runs', 'dismissals')
+    table['strike_rate'] = ratio('runs', 'balls_faced', 100.0)
+    table['bowling_average'] = ratio('runs_conceded', 'wickets')
+    table['economy_rate'] = ratio('runs_conceded', 'balls_bowled', 6.0)
+    return table.reset_index()[KEY + COUNT_COLUMNS + STAT_COLUMNS]
@@ -0,0 +1,239 @@
+# app/utils/processed_store.py
+"""Typed, season-partitioned Parquet store for the cleaned WPL data.
+
+``data/processed/wpl_clean.parquet/season=YYYY/<source>.parquet`` holds the
+output of ``WPLDataCleaner``, one file per raw source file and season, so a
+changed source can be replaced without touching the others. The schema is explicit, so every writer
+(full frame or chunk by chunk) produces the same types: native dates and
+booleans, floats for the nullable numbers, and dictionary-encoded strings
+that read back as pandas categoricals for the team, venue, city and
+official columns.
+
+Readers ask for the columns and seasons they need; only those column
+chunks and partitions are read, through a memory map.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_NAME = 'wpl_clean.parquet'
+PARTITION_COLUMN = 'season'
+DEFAULT_SOURCE = 'part-0'
+PUBLISH_ATTEMPTS = 3
+
+CATEGORICAL_COLUMNS = (
+    'team1', 'team2', 'winner', 'toss_winner', 'venue', 'city', 'toss_decision',
+    'umpire1', 'umpire2', 'reserve_umpire', 'match_referee', 'win_type',
+)
+
+# Column order of the cleaned frame, minus the partition column
+SCHEMA = pa.schema([
+    ('team1', pa.string()),
+    ('team2', pa.string()),
+    ('date', pa.date32()),
+    ('match_number', pa.float64()),
+    ('venue', pa.string()),
+    ('city', pa.string()),
+    ('toss_winner', pa.string()),
+    ('toss_decision', pa.string()),
+    ('player_of_match', pa.string()),
+    ('umpire1', pa.string()),
+    ('umpire2', pa.string()),
+    ('reserve_umpire', pa.string()),
+    ('match_referee', pa.string()),
+    ('winner', pa.string()),
+    ('winner_runs', pa.float64()),
+    ('winner_wickets', pa.float64()),
+    ('win_type', pa.string()),
+    ('margin', pa.float64()),
+    ('is_home_win', pa.bool_()),
+    ('won_toss_and_match', pa.bool_()),
+    ('match_result', pa.string()),
+])
+
+
+def default_store_path() -> Path:
+    return Path(__file__).parent.parent.parent / 'data' / 'processed' / STORE_NAME
+
+
+class SeasonPartitionWriter:
+    """Write one source's cleaned frames into the season-partitioned store.
+
+    Each (season, source) pair is one file, ``season=YYYY/<source>.parquet``,
+    that grows by a row group per ``write``, so a chunked clean produces the
+    same layout as writing the whole frame. Files are staged in a hidden
+    sibling directory and renamed into place on ``close``, replacing the
+    source's previous files; other sources' files are left alone.
+    """
+
+    def __init__(self, path: Path, source: str = DEFAULT_SOURCE):
+        self.path = Path(path)
+        self.source = source
+        self._staging = self.path.with_name(f'.{self.path.name}.{source}.tmp')
+        if self._staging.exists():
+            shutil.rmtree(self._staging)
+        self._writers: Dict[int, pq.ParquetWriter] = {}
+        self.changed_seasons: Set[int] = set()
+
+    def write(self, df: pd.DataFrame):
+        for season, part in df.groupby(PARTITION_COLUMN, sort=False):
+            writer = self._writers.get(season)
+            if writer is None:
+                directory = self._staging / _partition_name(season)
+                directory.mkdir(parents=True)
+                writer = self._writers[season] = pq.ParquetWriter(directory / self._file_name, SCHEMA)
+            writer.write_table(pa.Table.from_pandas(part, schema=SCHEMA, preserve_index=False))
+
+    def close(self) -> Set[int]:
+        """Publish the staged files; returns every season whose data changed"""
+        for writer in self._writers.values():
+            writer.close()
+        for season in self._writers:
+            _publish(self._staging / _partition_name(season) / self._file_name,
+                     self.path / _partition_name(season) / self._file_name)
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+        # Seasons the source no longer has rows for
+        stale = remove_source(self.path, self.source, keep=set(self._writers))
+        self.changed_seasons = stale | set(self._writers)
+        return self.changed_seasons
+
+    def abort(self):
+        for writer in self._writers.values():
+            writer.close()
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    @property
+    def _file_name(self) -> str:
+        return f'{self.source}.parquet'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _partition_name(season) -> str:
+    return f'{PARTITION_COLUMN}={season}'
+
+
+def _publish(staged: Path, target: Path):
+    """Rename a staged file into its season directory.
+
+    Sources are cleaned in parallel, and another source's ``remove_source``
+    can remove the season directory between our mkdir and the rename, so
+    the directory is recreated and the rename retried.
+    """
+    for attempt in range(1, PUBLISH_ATTEMPTS + 1):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(staged, target)
+            return
+        except FileNotFoundError:
+            if attempt == PUBLISH_ATTEMPTS or not staged.exists():
+                raise
+
+
+def remove_source(path: Path, source: str, keep: Set[int] = frozenset()) -> Set[int]:
+    """Delete ``source``'s files outside the ``keep`` seasons; returns the seasons touched"""
+    removed = set()
+    for file in Path(path).glob(f'{PARTITION_COLUMN}=*/{source}.parquet'):
+        season = int(file.parent.name.split('=', 1)[1])
+        if season in keep:
+            continue
+        file.unlink()
+        removed.add(season)
+        try:
+            file.parent.rmdir()
+        except OSError:
+            # Another source still has (or has just published) a file here, or removed it first
+            pass
+    return removed
+
+
+def write_matches(df: pd.DataFrame, path: Optional[Path] = None, source: str = DEFAULT_SOURCE) -> Set[int]:
+    """Replace ``source``'s rows in the store at ``path`` with ``df``"""
+    with SeasonPartitionWriter(path or default_store_path(), source) as writer:
+        writer.write(df)
+    return writer.changed_seasons
+
+
+def read_matches(
+    path: Optional[Path] = None,
+    columns: Optional[Iterable[str]] = None,
+    seasons: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
+    """Load matches from the store, reading only ``columns`` and ``seasons``.
+
+    ``date`` comes back as datetime64 and the categorical columns as
+    ``category``; pass ``'season'`` in ``columns`` to get the partition key.
+    """
+    columns = list(columns) if columns is not None else None
+    filters = [(PARTITION_COLUMN, 'in', list(seasons))] if seasons is not None else None
+    table = pq.read_table(
+        path or default_store_path(),
+        columns=columns,
+        filters=filters,
+        memory_map=True,
+        read_dictionary=[c for c in CATEGORICAL_COLUMNS if columns is None or c in columns],
+    )
+    df = table.to_pandas(date_as_object=False)
+    if PARTITION_COLUMN in df.columns:
+        # Hive partition values come back as a dictionary column
+        df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype('int64')
+    if columns is None:
+        df = df[[PARTITION_COLUMN] + SCHEMA.names]
+    return df
+
+
+def read_sources(
+    path: Optional[Path] = None,
+    columns: Iterable[str] = (),
+    seasons: Optional[Iterable[int]] = None,
+    sources: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Like ``read_matches``, with a ``source`` column naming the raw file each row came from"""
+    columns = list(columns)
+    seasons = set(seasons) if seasons is not None else None
+    sources = set(sources) if sources is not None else None
+    frames = []
+    for file in sorted(Path(path or default_store_path()).glob(f'{PARTITION_COLUMN}=*/*.parquet')):
+        season = int(file.parent.name.split('=', 1)[1])
+        if (seasons is not None and season not in seasons) or (sources is not None and file.stem not in sources):
+            continue
+        table = pq.read_table(file, columns=columns, memory_map=True)
+        frames.append(table.to_pandas(date_as_object=False).assign(source=file.stem))
+    if not frames:
+        return pd.DataFrame(columns=columns + ['source'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def store_version(path: Optional[Path] = None) -> tuple:
+    """(file, mtime, size) for every file in the store; changes whenever the data does"""
+    path = Path(path or default_store_path())
+    return tuple(
+        (str(f.relative_to(path)), f.stat().st_mtime_ns, f.stat().st_size)
+        for f in sorted(path.glob(f'{PARTITION_COLUMN}=*/*.parquet'))
+    )
+
+
+def to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """Serialize a frame as an Arrow IPC stream (categoricals stay dictionary-encoded)"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_arrow_ipc(data: bytes) -> pd.DataFrame:
+    return pa.ipc.open_stream(data).read_all().to_pandas()
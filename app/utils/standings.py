@@ -0,0 +1,170 @@
+# app/utils/standings.py
+"""Points-table arithmetic shared by the database standings and the dashboard.
+
+Matches are tuples in ``MATCH_FIELDS`` order, replayed in date order into
+a dict of ``TeamRecord`` per team. Nothing here needs a database, so the
+dashboard can build a table from its own match frame when it has neither
+the API nor the database packages. pandas is only imported for that, as
+the API imports this module at startup.
+"""
+from dataclasses import dataclass
+from datetime import date
+from itertools import groupby
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+POINTS_FOR_WIN = 2
+POINTS_FOR_NO_RESULT = 1
+FORM_LENGTH = 5
+BALLS_PER_OVER = 6
+# A side that is bowled out counts its full quota of overs
+BALLS_PER_INNINGS = 120
+ALL_OUT = 10
+
+RECORD_COLUMNS = (
+    'played', 'won', 'lost', 'no_result', 'points', 'runs_for', 'balls_faced', 'runs_against', 'balls_bowled', 'form',
+)
+MATCH_FIELDS = (
+    'match_date', 'team1', 'team2', 'winner',
+    'team1_score', 'team1_wickets', 'team1_overs',
+    'team2_score', 'team2_wickets', 'team2_overs',
+)
+
+
+def innings_balls(overs: Optional[float], wickets: Optional[int]) -> Optional[int]:
+    """Balls an innings counts for net run rate; 19.3 overs is 19 overs and 3 balls"""
+    if overs is None:
+        return None
+    if wickets is not None and wickets >= ALL_OUT:
+        return BALLS_PER_INNINGS
+    whole = int(overs)
+    return whole * BALLS_PER_OVER + round((overs - whole) * 10)
+
+
+@dataclass
+class TeamRecord:
+    team: str
+    played: int = 0
+    won: int = 0
+    lost: int = 0
+    no_result: int = 0
+    points: int = 0
+    runs_for: int = 0
+    balls_faced: int = 0
+    runs_against: int = 0
+    balls_bowled: int = 0
+    form: str = ''
+
+    @classmethod
+    def from_row(cls, row) -> 'TeamRecord':
+        return cls(row.team, **{c: getattr(row, c) for c in RECORD_COLUMNS})
+
+    @property
+    def net_run_rate(self) -> Optional[float]:
+        if not self.balls_faced or not self.balls_bowled:
+            return None
+        scored = self.runs_for * BALLS_PER_OVER / self.balls_faced
+        conceded = self.runs_against * BALLS_PER_OVER / self.balls_bowled
+        return round(scored - conceded, 3)
+
+    def add_result(self, result: str, points: int):
+        self.played += 1
+        self.points += points
+        if result == 'W':
+            self.won += 1
+        elif result == 'L':
+            self.lost += 1
+        else:
+            self.no_result += 1
+        self.form = (self.form + result)[-FORM_LENGTH:]
+
+    def add_innings(self, runs_for: int, balls_faced: int, runs_against: int, balls_bowled: int):
+        self.runs_for += runs_for
+        self.balls_faced += balls_faced
+        self.runs_against += runs_against
+        self.balls_bowled += balls_bowled
+
+
+def apply_match(table: Dict[str, TeamRecord], match) -> None:
+    (_, team1, team2, winner, score1, wickets1, overs1, score2, wickets2, overs2) = match
+    first = table.setdefault(team1, TeamRecord(team1))
+    second = table.setdefault(team2, TeamRecord(team2))
+    if winner not in (team1, team2):
+        # No result (or no winner recorded): a point each and no effect on run rates
+        first.add_result('N', POINTS_FOR_NO_RESULT)
+        second.add_result('N', POINTS_FOR_NO_RESULT)
+        return
+
+    won, lost = (first, second) if winner == team1 else (second, first)
+    won.add_result('W', POINTS_FOR_WIN)
+    lost.add_result('L', 0)
+    balls1, balls2 = innings_balls(overs1, wickets1), innings_balls(overs2, wickets2)
+    if None not in (score1, score2, balls1, balls2):
+        first.add_innings(score1, balls1, score2, balls2)
+        second.add_innings(score2, balls2, score1, balls1)
+
+
+def ranked(table: Dict[str, TeamRecord]) -> List[TeamRecord]:
+    """Points, then net run rate, then wins; teams without a run rate go below those with one"""
+    def key(record: TeamRecord):
+        nrr = record.net_run_rate
+        return (-record.points, nrr is None, -(nrr or 0.0), -record.won, record.team)
+    return sorted(table.values(), key=key)
+
+
+def replay(table: Dict[str, TeamRecord], matches: Iterable) -> Iterator[date]:
+    """Apply date-ordered matches to ``table``, yielding after each match date"""
+    for day, group in groupby(matches, key=lambda m: m[0]):
+        for match in group:
+            apply_match(table, match)
+        yield day
+
+
+def standings_dict(season: Optional[int], as_of: Optional[date], records: List[TeamRecord]) -> Dict:
+    """The response shape of /wpl/standings"""
+    return {
+        'season': season,
+        'as_of': as_of,
+        'standings': [
+            {
+                'position': position,
+                'team': record.team,
+                'played': record.played,
+                'won': record.won,
+                'lost': record.lost,
+                'no_result': record.no_result,
+                'points': record.points,
+                'net_run_rate': record.net_run_rate,
+                'form': record.form,
+            }
+            for position, record in enumerate(records, start=1)
+        ],
+    }
+
+
+def standings_from_frame(df: 'pd.DataFrame', season: Optional[int] = None, as_of: Optional[date] = None) -> Dict:
+    """``read_standings`` computed from a match frame with a ``date`` column.
+
+    Score columns the frame lacks count as missing, so without them every
+    net run rate is None and ties on points fall back to wins.
+    """
+    import pandas as pd
+    days = pd.to_datetime(df['date']).dt.date
+    if season is None:
+        season = as_of.year if as_of is not None else (max(days).year if len(days) else None)
+    if season is None:
+        return standings_dict(None, None, [])
+
+    keep = days.map(lambda d: d is not None and d.year == season and (as_of is None or d <= as_of))
+    rows = df[keep.astype(bool)].assign(match_date=days[keep.astype(bool)])
+    rows = rows.sort_values('match_date', kind='stable')
+    columns = [
+        rows[c].astype(object).where(rows[c].notna(), None).tolist() if c in rows else [None] * len(rows)
+        for c in MATCH_FIELDS
+    ]
+    table, last = {}, None
+    for last in replay(table, zip(*columns)):
+        pass
+    return standings_dict(season, last, ranked(table))
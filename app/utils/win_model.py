@@ -0,0 +1,197 @@
+# app/utils/win_model.py
+"""Pre-match win probability trained on the processed store.
+
+``WinModel`` is a logistic regression over what is known before a match
+starts, encoded so that swapping team1 and team2 negates the features:
+
+- each team: +1 as team1, -1 as team2 (overall strength)
+- each team at each venue, signed the same way (ground form)
+- the toss: +1 if team1 won it, -1 if team2 did, and that sign again as
+  +1 for choosing to bat or -1 for choosing to field
+
+With no intercept, P(team2 beats team1) is exactly 1 - P(team1 beats
+team2). The result columns (win_type, margin, winner_runs, ...) describe
+a finished match, so they are not features; no-result matches are left
+out of training.
+
+Team and venue names map to feature columns through dicts built once per
+model, so encoding a batch is dict lookups and one sparse matrix, and
+every fixture in a batch goes through a single ``predict_proba`` call.
+
+Models are saved with joblib as ``win_probability-<version>.joblib``.
+The version hashes the raw files in the data manifest (or, for a store
+written without one, the store's files), so a reclean that changes the
+data names a new model and an unchanged reclean reuses the saved one.
+
+Usage: python -m app.utils.win_model [store_path]
+"""
+import hashlib
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression
+
+from app.utils.manifest import MANIFEST_NAME, Manifest
+from app.utils.processed_store import default_store_path, read_matches, store_version
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'win_probability'
+# Bump when the features or the classifier change, so saved models are retrained
+MODEL_FORMAT = 1
+MODEL_COLUMNS = ['team1', 'team2', 'venue', 'toss_winner', 'toss_decision', 'winner']
+TOSS_DECISION_SIGNS = {'bat': 1, 'field': -1}
+REGULARIZATION = 1.0
+
+
+def default_model_dir(store_path: Optional[Path] = None) -> Path:
+    """Saved models sit next to the manifest of the store they were trained on"""
+    return Path(store_path or default_store_path()).parent / 'models'
+
+
+def data_version(store_path: Optional[Path] = None) -> str:
+    """Version of the data a model trained on ``store_path`` would see"""
+    store_path = Path(store_path or default_store_path())
+    manifest_path = store_path.parent / MANIFEST_NAME
+    if manifest_path.exists():
+        key = sorted((name, entry['sha256']) for name, entry in Manifest.load(manifest_path).entries.items())
+    else:
+        key = list(store_version(store_path))
+    return hashlib.sha1(repr((MODEL_FORMAT, key)).encode()).hexdigest()[:12]
+
+
+def model_path(model_dir: Path, version: str) -> Path:
+    return Path(model_dir) / f"{MODEL_NAME}-{version}.joblib"
+
+
+def _lookup(ids: Dict[str, int], names: Sequence) -> np.ndarray:
+    return np.fromiter((ids.get(name, -1) for name in names), dtype=np.int64, count=len(names))
+
+
+class WinModel:
+    def __init__(self, teams: List[str], venues: List[str], version: str = ''):
+        self.teams = teams
+        self.venues = venues
+        self.team_ids = {team: i for i, team in enumerate(teams)}
+        self.venue_ids = {venue: i for i, venue in enumerate(venues)}
+        self.version = version
+        self.matches = 0
+        self.classifier = LogisticRegression(C=REGULARIZATION, fit_intercept=False, max_iter=1000)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.teams) * (1 + len(self.venues)) + 2
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, version: str = '') -> 'WinModel':
+        """Train on store rows with a result"""
+        fixtures = {c: df[c].astype(object).where(df[c].notna(), None).tolist() for c in MODEL_COLUMNS}
+        decided = [w is not None and w in (a, b) for a, b, w in zip(fixtures['team1'], fixtures['team2'],
+                                                                    fixtures['winner'])]
+        fixtures = {c: [v for v, keep in zip(values, decided) if keep] for c, values in fixtures.items()}
+        if not fixtures['winner']:
+            raise ValueError("No decided matches to train on")
+
+        teams = sorted(set(fixtures['team1']) | set(fixtures['team2']))
+        venues = sorted({v for v in fixtures['venue'] if v is not None})
+        model = cls(teams, venues, version)
+        X = model.encode(fixtures)
+        y = np.fromiter((a == w for a, w in zip(fixtures['team1'], fixtures['winner'])), dtype=np.int8)
+        # Each match seen from both sides, so both classes are always present
+        model.classifier.fit(sparse.vstack([X, -X]).tocsr(), np.concatenate([y, 1 - y]))
+        model.matches = len(y)
+        return model
+
+    def encode(self, fixtures: Dict[str, Sequence]) -> sparse.csr_matrix:
+        """Feature rows for columnar fixtures; venue, toss_winner and toss_decision may be missing or None"""
+        team1, team2 = fixtures['team1'], fixtures['team2']
+        n = len(team1)
+        none = [None] * n
+        t1, t2 = _lookup(self.team_ids, team1), _lookup(self.team_ids, team2)
+        if (t1 < 0).any() or (t2 < 0).any():
+            unknown = sorted({str(name) for name, i in zip([*team1, *team2], [*t1, *t2]) if i < 0})
+            raise ValueError(f"Unknown team(s): {', '.join(unknown)}")
+
+        # A venue the model has not seen contributes nothing
+        venue = _lookup(self.venue_ids, fixtures.get('venue') or none)
+        toss = np.fromiter(
+            (1 if w == a else -1 if w == b else 0
+             for a, b, w in zip(team1, team2, fixtures.get('toss_winner') or none)),
+            dtype=np.int64, count=n)
+        decision = np.fromiter(
+            (TOSS_DECISION_SIGNS.get(d, 0) for d in (fixtures.get('toss_decision') or none)),
+            dtype=np.int64, count=n)
+
+        rows = np.arange(n)
+        n_teams = len(self.teams)
+        at_venue = venue >= 0
+        toss_column = n_teams * (1 + len(self.venues))
+        row_parts = [rows, rows, rows[at_venue], rows[at_venue], rows, rows]
+        col_parts = [
+            t1, t2,
+            n_teams + t1[at_venue] * len(self.venues) + venue[at_venue],
+            n_teams + t2[at_venue] * len(self.venues) + venue[at_venue],
+            np.full(n, toss_column), np.full(n, toss_column + 1),
+        ]
+        value_parts = [
+            np.ones(n), -np.ones(n), np.ones(at_venue.sum()), -np.ones(at_venue.sum()),
+            toss.astype(float), (toss * decision).astype(float),
+        ]
+        return sparse.csr_matrix(
+            (np.concatenate(value_parts), (np.concatenate(row_parts), np.concatenate(col_parts))),
+            shape=(n, self.n_features),
+        )
+
+    def predict(self, fixtures: Dict[str, Sequence]) -> np.ndarray:
+        """Probability that team1 wins, for every fixture at once"""
+        if not len(fixtures['team1']):
+            return np.empty(0)
+        return self.classifier.predict_proba(self.encode(fixtures))[:, 1]
+
+
+def save_model(model: WinModel, model_dir: Path) -> Path:
+    """Write the model atomically and remove models saved for other data versions"""
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    path = model_path(model_dir, model.version)
+    tmp = path.with_name(path.name + '.tmp')
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+    for stale in model_dir.glob(f"{MODEL_NAME}-*.joblib"):
+        if stale != path:
+            stale.unlink()
+    return path
+
+
+def train(store_path: Optional[Path] = None, version: Optional[str] = None) -> WinModel:
+    store_path = Path(store_path or default_store_path())
+    df = read_matches(store_path, columns=MODEL_COLUMNS)
+    return WinModel.from_frame(df, version or data_version(store_path))
+
+
+def load_or_train(store_path: Optional[Path] = None, model_dir: Optional[Path] = None) -> WinModel:
+    """The saved model for the store's current data version, training and saving it first if needed"""
+    store_path = Path(store_path or default_store_path())
+    model_dir = Path(model_dir or default_model_dir(store_path))
+    version = data_version(store_path)
+    path = model_path(model_dir, version)
+    if path.exists():
+        return joblib.load(path)
+    model = train(store_path, version)
+    save_model(model, model_dir)
+    logger.info(f"Trained {MODEL_NAME} {version} on {model.matches} matches")
+    return model
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = Path(sys.argv[1]) if len(sys.argv) > 1 else default_store_path()
+    trained = load_or_train(store)
+    logger.info(f"{MODEL_NAME} {trained.version}: {trained.matches} matches, {len(trained.teams)} teams")
@@ -0,0 +1,55 @@
+# benchmarks/aggregations.py
+"""Per-team boolean-mask scans vs the melted groupby in app.utils.aggregations.
+
+Usage: python -m benchmarks.aggregations [n_rows] [n_teams]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils.aggregations import team_performance
+
+
+def synthetic_matches(n_rows: int, n_teams: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    teams = np.array([f"Team {i:03d}" for i in range(n_teams)], dtype=object)
+    team1 = rng.integers(0, n_teams, n_rows)
+    team2 = (team1 + rng.integers(1, n_teams, n_rows)) % n_teams
+    winner = np.where(rng.random(n_rows) < 0.5, team1, team2)
+    return pd.DataFrame({'team1': teams[team1], 'team2': teams[team2], 'winner': teams[winner]})
+
+
+def legacy_team_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """The loop plot_team_performance and _generate_summary used to run"""
+    rows = []
+    for team in set(df['team1'].unique()) | set(df['team2'].unique()):
+        played = len(df[(df['team1'] == team) | (df['team2'] == team)])
+        won = len(df[df['winner'] == team])
+        rows.append({'team': team, 'matches_played': played, 'matches_won': won,
+                     'win_rate': won / played * 100 if played else 0})
+    return pd.DataFrame(rows).set_index('team').sort_index()
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main(n_rows: int = 200_000, n_teams: int = 300):
+    df = synthetic_matches(n_rows, n_teams)
+    legacy_time, legacy = timed(legacy_team_stats, df)
+    vector_time, vectorized = timed(team_performance, df)
+
+    pd.testing.assert_frame_equal(legacy, vectorized, check_names=False)
+    print(f"rows={n_rows} teams={n_teams}")
+    print(f"per-team scans: {legacy_time:8.3f} s")
+    print(f"groupby:        {vector_time:8.3f} s")
+    print(f"speedup:        {legacy_time / vector_time:.0f}x (results identical)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,86 @@
+# benchmarks/cleaner.py
+"""Row-wise vs vectorized WPLDataCleaner stages on a synthetically scaled input.
+
+Usage: python -m benchmarks.cleaner [n_rows]
+"""
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils.data_cleaner import WPLDataCleaner
+
+
+def scaled_raw(n_rows: int) -> pd.DataFrame:
+    """Tile the raw WPL file up to ``n_rows``, with some match numbers in text form"""
+    raw = pd.read_csv(WPLDataCleaner().input_file)
+    df = raw.iloc[np.arange(n_rows) % len(raw)].reset_index(drop=True)
+    df['match_number'] = df['match_number'].astype(object)
+    df.loc[df.index % 7 == 0, 'match_number'] = 'Match 12'
+    df.loc[df.index % 11 == 0, 'match_number'] = np.nan
+    return df
+
+
+def legacy_clean_match_details(df):
+    """The original per-row regex implementation"""
+    for col in ['winner_runs', 'winner_wickets']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    def extract_match_number(x):
+        if pd.isna(x):
+            return None
+        match = re.search(r'(\d+)', str(x))
+        return int(match.group(1)) if match else None
+
+    df['match_number'] = df['match_number'].apply(extract_match_number)
+    return df
+
+
+def legacy_add_calculated_fields(df):
+    """The original row-wise apply implementation"""
+    df['win_type'] = np.where(df['winner_runs'].notna(), 'runs',
+                              np.where(df['winner_wickets'].notna(), 'wickets', 'unknown'))
+    df['margin'] = np.where(df['win_type'] == 'runs', df['winner_runs'],
+                            np.where(df['win_type'] == 'wickets', df['winner_wickets'], np.nan))
+    df['is_home_win'] = df.apply(lambda x: x['winner'] == x['team1'], axis=1)
+    df['won_toss_and_match'] = df['winner'] == df['toss_winner']
+    df['match_result'] = df.apply(
+        lambda x: f"{x['winner']} won by {int(x['margin'])} {x['win_type']}"
+        if pd.notna(x['margin']) else "No result",
+        axis=1
+    )
+    return df
+
+
+def legacy_transform(cleaner, df):
+    df.columns = df.columns.str.lower().str.strip()
+    df = cleaner._clean_dates(df)
+    df = cleaner._clean_team_names(df)
+    df = legacy_clean_match_details(df)
+    return legacy_add_calculated_fields(df)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main(n_rows: int = 1_000_000):
+    cleaner = WPLDataCleaner()
+    raw = scaled_raw(n_rows)
+
+    legacy_time, legacy = timed(legacy_transform, cleaner, raw.copy())
+    vector_time, vectorized = timed(cleaner.transform, raw.copy())
+
+    assert legacy.to_csv(index=False) == vectorized.to_csv(index=False), "outputs differ"
+    print(f"rows={n_rows}")
+    print(f"row-wise:   {legacy_time:8.2f} s")
+    print(f"vectorized: {vector_time:8.2f} s")
+    print(f"speedup:    {legacy_time / vector_time:.1f}x (outputs identical)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,92 @@
+# benchmarks/concurrency.py
+"""Request throughput under parallel load for the sync and async session modes.
+
+Usage: python -m benchmarks.concurrency [n_matches] [requests] [concurrency]
+
+Runs the API in-process against a temporary SQLite database, once with
+threadpool-backed sync sessions and once with aiosqlite async sessions.
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.routes.data_routes import router as data_router
+from app.api.routes.wpl_routes import router as wpl_router
+from app.db.database import Base, get_read_session, get_session
+from benchmarks.team_stats import populate
+
+PATHS = ("/wpl/team-stats", "/wpl/top-players/runs", "/wpl/match-analysis", "/wpl/matches?limit=100")
+
+
+def build_app(session_dependency) -> FastAPI:
+    app = FastAPI()
+    app.include_router(data_router)
+    app.include_router(wpl_router)
+    app.dependency_overrides[get_session] = session_dependency
+    app.dependency_overrides[get_read_session] = session_dependency
+    return app
+
+
+async def load(app: FastAPI, n_requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        async def one(i):
+            async with semaphore:
+                response = await client.get(PATHS[i % len(PATHS)])
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        return time.perf_counter() - started
+
+
+def main(n_matches: int = 20000, n_requests: int = 400, concurrency: int = 32):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as db:
+            populate(db, n_matches)
+
+        SyncSession = sessionmaker(bind=engine, autoflush=False)
+
+        def sync_session():
+            db = SyncSession()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def run_async_mode():
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+            async def async_session():
+                async with AsyncSessionLocal() as db:
+                    yield db
+
+            try:
+                return await load(build_app(async_session), n_requests, concurrency)
+            finally:
+                await async_engine.dispose()
+
+        sync_time = asyncio.run(load(build_app(sync_session), n_requests, concurrency))
+        async_time = asyncio.run(run_async_mode())
+        engine.dispose()
+
+    print(f"matches={n_matches} requests={n_requests} concurrency={concurrency}")
+    for mode, elapsed in (("sync", sync_time), ("async", async_time)):
+        print(f"{mode:5}: {n_requests / elapsed:8.1f} req/s ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,82 @@
+# benchmarks/dashboard.py
+"""Per-interaction cost of the WPL dashboard filters: full-frame masks vs MatchIndex.
+
+Usage: python -m benchmarks.dashboard [n_seasons] [matches_per_season]
+"""
+import random
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.utils.data_cleaner import WPLDataCleaner
+from app.utils.match_index import MatchIndex
+from benchmarks.aggregations import legacy_team_stats
+
+
+def seasons_frame(n_seasons: int, matches_per_season: int) -> pd.DataFrame:
+    """The cleaned WPL data repeated over ``n_seasons`` consecutive years"""
+    cleaner = WPLDataCleaner()
+    clean = cleaner.transform(pd.read_csv(cleaner.input_file))
+    clean['date'] = pd.to_datetime(clean['date'])
+    season = clean.iloc[np.arange(matches_per_season) % len(clean)]
+    frames = [season.assign(date=season['date'] + pd.DateOffset(years=i)) for i in range(n_seasons)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def legacy_interaction(df, start, end, team):
+    """What one rerun did before: masks, a copy, per-team scans, value_counts"""
+    mask = (df['date'].dt.date >= start) & (df['date'].dt.date <= end)
+    if team is not None:
+        mask = mask & ((df['team1'] == team) | (df['team2'] == team))
+    filtered = df[mask].copy()
+    if len(filtered):
+        legacy_team_stats(filtered)
+        filtered['win_type'].value_counts()
+        filtered['venue'].value_counts()
+        filtered.sort_values('date')
+    return len(filtered)
+
+
+def filters(index: MatchIndex, n: int, seed: int = 0):
+    rng = random.Random(seed)
+    span = (index.max_date - index.min_date).days
+    result = []
+    for _ in range(n):
+        start = index.min_date + timedelta(days=rng.randrange(span))
+        end = start + timedelta(days=rng.randrange(30, 400))
+        result.append((start, end, rng.choice([None] + index.teams)))
+    return result
+
+
+def per_call_ms(fn, calls):
+    started = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - started) / len(calls) * 1000
+
+
+def main(n_seasons: int = 10, matches_per_season: int = 10_000):
+    df = seasons_frame(n_seasons, matches_per_season)
+
+    started = time.perf_counter()
+    index = MatchIndex(df)
+    build_ms = (time.perf_counter() - started) * 1000
+    calls = filters(index, 50)
+
+    legacy_ms = per_call_ms(lambda *a: legacy_interaction(df, *a), calls)
+    cold_ms = per_call_ms(index.summary, calls)
+    warm_ms = per_call_ms(index.summary, calls)
+
+    print(f"rows={len(df)} seasons={n_seasons}")
+    print(f"index build (once per data version): {build_ms:8.1f} ms")
+    print(f"masks + copy per interaction:       {legacy_ms:8.2f} ms")
+    print(f"index, first time per filter:       {cold_ms:8.2f} ms")
+    print(f"index, memoized filter:             {warm_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,54 @@
+# benchmarks/parallel_clean.py
+"""Serial vs process-pool cleaning of a directory of raw tournament files.
+
+Usage: python -m benchmarks.parallel_clean [n_files] [rows_per_file] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.utils.data_cleaner import WPLDataCleaner
+from benchmarks.cleaner import scaled_raw
+
+
+def write_raw_files(raw_dir: Path, n_files: int, rows_per_file: int):
+    raw = scaled_raw(rows_per_file)
+    for i in range(n_files):
+        raw['season'] = 2000 + i
+        raw.to_csv(raw_dir / f'league_{2000 + i}.csv', index=False)
+
+
+def run(raw_dir: Path, processed_dir: Path, workers: int):
+    cleaner = WPLDataCleaner()
+    cleaner.raw_path = raw_dir
+    cleaner.processed_path = processed_dir
+    processed_dir.mkdir()
+    started = time.perf_counter()
+    report = cleaner.clean_directory(workers=workers)
+    return time.perf_counter() - started, report
+
+
+def main(n_files: int = 16, rows_per_file: int = 100_000, workers: int = os.cpu_count() or 1):
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = Path(tmp) / 'raw'
+        raw_dir.mkdir()
+        write_raw_files(raw_dir, n_files, rows_per_file)
+
+        serial_time, serial = run(raw_dir, Path(tmp) / 'serial', 1)
+        pooled_time, pooled = run(raw_dir, Path(tmp) / 'pooled', workers)
+
+        same = (Path(tmp) / 'serial' / 'data_summary.txt').read_text() == \
+            (Path(tmp) / 'pooled' / 'data_summary.txt').read_text()
+        slowest = max(pooled.timings.items(), key=lambda item: item[1])
+        print(f"files={n_files} rows_per_file={rows_per_file} cpus={os.cpu_count()}")
+        print(f"serial:           {serial_time:8.2f} s")
+        print(f"{workers} workers:  {pooled_time:8.2f} s ({serial_time / pooled_time:.1f}x)")
+        print(f"slowest file:     {slowest[0]} {slowest[1]:.2f} s")
+        print(f"summaries identical: {same}; failed: {len(serial.failed) + len(pooled.failed)}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
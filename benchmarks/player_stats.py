@@ -0,0 +1,83 @@
+# benchmarks/player_stats.py
+"""Deriving player stats from deliveries: vectorized vs per-delivery, full vs incremental.
+
+Times player_counts against a per-delivery Python tally of the same
+counts, then a full rebuild_player_stats against importing one more match
+into an in-memory SQLite database.
+
+Usage: python -m benchmarks.player_stats [n_matches]
+"""
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.db.player_stats import import_deliveries, rebuild_player_stats
+from app.utils.deliveries_store import normalise_deliveries, upsert_matches
+from app.utils.player_stats import BOWLER_EXTRAS, BOWLER_WICKETS, COUNT_COLUMNS, NOT_OUT, player_counts
+from benchmarks import synthetic
+
+
+def python_counts(df: pd.DataFrame) -> dict:
+    """The same counts tallied one delivery at a time"""
+    counts = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+    played = defaultdict(set)
+    for d in df.to_dict(orient='records'):
+        batter = (d['batter'], d['batting_team'])
+        bowler = (d['bowler'], d['bowling_team'])
+        counts[batter]['runs'] += d['runs']
+        counts[batter]['balls_faced'] += d['extra_type'] != 'wides'
+        counts[bowler]['balls_bowled'] += d['extra_type'] not in BOWLER_EXTRAS
+        counts[bowler]['runs_conceded'] += d['runs'] + (d['extras'] if d['extra_type'] in BOWLER_EXTRAS else 0)
+        counts[bowler]['wickets'] += d['dismissal'] in BOWLER_WICKETS
+        if d['player_dismissed'] is not None and d['dismissal'] not in NOT_OUT:
+            counts[(d['player_dismissed'], d['batting_team'])]['dismissals'] += 1
+        for player in (batter, (d['non_striker'], d['batting_team']), bowler):
+            played[player].add(d['match_id'])
+    for player, match_ids in played.items():
+        counts[player]['matches'] = len(match_ids)
+    return counts
+
+
+def timed(fn, *args, repeat=3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(n_matches: int = 2000):
+    df = normalise_deliveries(synthetic.deliveries(n_matches + 1))
+    history = df[df['match_id'] <= n_matches]
+    latest = df[df['match_id'] > n_matches]
+
+    vector_time, counts = timed(player_counts, history)
+    python_time, expected = timed(python_counts, history, repeat=1)
+    assert len(counts) == len(expected), "vectorized and per-delivery counts disagree"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = Path(workdir) / 'deliveries.parquet'
+        upsert_matches(history, store)
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as db:
+            rebuild_time, players = timed(lambda: (rebuild_player_stats(db, store), db.commit())[0], repeat=1)
+            import_time, report = timed(import_deliveries, db, latest, store, repeat=1)
+
+    print(f"deliveries={len(history)} players={players}")
+    print(f"vectorized counts:   {vector_time * 1000:8.1f} ms")
+    print(f"per-delivery counts: {python_time * 1000:8.1f} ms ({python_time / vector_time:.1f}x)")
+    print(f"full rebuild:        {rebuild_time * 1000:8.1f} ms")
+    print(f"one-match import:    {import_time * 1000:8.1f} ms ({report.players} players updated)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,85 @@
+# benchmarks/predict.py
+"""Win-probability inference: one fixture per call vs one batch.
+
+Trains WinModel on synthetic matches, then predicts the same fixtures
+one call per fixture and in a single batch, both on the model and
+through POST /wpl/predict (TestClient, one request per fixture vs one
+request for all), and reports latency per call and fixtures per second.
+
+Usage: python -m benchmarks.predict [n_rows] [n_fixtures]
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.utils.processed_store import SCHEMA, write_matches
+from app.utils.win_model import WinModel
+from benchmarks import synthetic
+
+FIXTURE_COLUMNS = ['team1', 'team2', 'venue', 'toss_winner', 'toss_decision']
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def report(label: str, seconds: float, calls: int, fixtures: int):
+    print(f"{label:24} {seconds * 1000 / calls:9.3f} ms/call {fixtures / seconds:12,.0f} fixtures/s")
+
+
+def _client(store: Path):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.predict import WinModelSource, get_win_model_source
+    from app.api.routes.wpl_routes import router
+
+    app = FastAPI()
+    app.include_router(router)
+    source = WinModelSource(store)
+    app.dependency_overrides[get_win_model_source] = lambda: source
+    return TestClient(app)
+
+
+def main(n_rows: int = 10_000, n_fixtures: int = 1000):
+    df = synthetic.matches(n_rows)
+    started = time.perf_counter()
+    model = WinModel.from_frame(df)
+    train_time = time.perf_counter() - started
+
+    sample = df.sample(n_fixtures, replace=True, random_state=0)
+    fixtures = {c: sample[c].astype(object).tolist() for c in FIXTURE_COLUMNS}
+    singles = [{c: values[i:i + 1] for c, values in fixtures.items()} for i in range(n_fixtures)]
+
+    print(f"matches={model.matches} teams={len(model.teams)} venues={len(model.venues)} "
+          f"features={model.n_features} trained in {train_time * 1000:.0f} ms")
+    single_time = timed(lambda: [model.predict(f) for f in singles], repeat=1)
+    batch_time = timed(lambda: model.predict(fixtures))
+    report("model, one per call", single_time, n_fixtures, n_fixtures)
+    report("model, one batch", batch_time, 1, n_fixtures)
+
+    records = sample[FIXTURE_COLUMNS].to_dict(orient='records')
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Path(tmp) / 'wpl_clean.parquet'
+        write_matches(df.assign(**{c: None for c in SCHEMA.names if c not in df}), store)
+        with _client(store) as client:
+            client.post('/wpl/predict', json=records[:1])  # trains and loads the model
+            bodies = [json.dumps([r]) for r in records]
+            headers = {'content-type': 'application/json'}
+            route_single = timed(lambda: [client.post('/wpl/predict', content=b, headers=headers) for b in bodies],
+                                 repeat=1)
+            batch_body = json.dumps(records)
+            route_batch = timed(lambda: client.post('/wpl/predict', content=batch_body, headers=headers))
+    report("route, one per request", route_single, n_fixtures, n_fixtures)
+    report("route, one batch", route_batch, 1, n_fixtures)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,64 @@
+# benchmarks/processed_store.py
+"""Load time and memory of the dashboard's data: CSV export vs the Parquet store.
+
+Usage: python -m benchmarks.processed_store [n_rows]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.frontend.wpl_dashboard import DASHBOARD_COLUMNS
+from app.utils.data_cleaner import WPLDataCleaner
+from app.utils.processed_store import read_matches, write_matches
+
+
+def scaled_clean(n_rows: int) -> pd.DataFrame:
+    """The cleaned WPL frame tiled to ``n_rows``, spread over 17 seasons"""
+    cleaner = WPLDataCleaner()
+    clean = cleaner.transform(pd.read_csv(cleaner.input_file))
+    df = clean.iloc[np.arange(n_rows) % len(clean)].reset_index(drop=True)
+    df['season'] = 2008 + df.index % 17
+    return df
+
+
+def load_csv(path: Path) -> pd.DataFrame:
+    """What load_data did before the store: parse everything, then the dates"""
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def main(n_rows: int = 1_000_000):
+    df = scaled_clean(n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'wpl_clean.csv'
+        store_path = Path(tmp) / 'wpl_clean.parquet'
+        df.to_csv(csv_path, index=False)
+        write_matches(df, store_path)
+
+        cases = [
+            ("csv, all columns", load_csv, (csv_path,), {}),
+            ("parquet, all columns", read_matches, (store_path,), {}),
+            ("parquet, dashboard columns", read_matches, (store_path,), {'columns': DASHBOARD_COLUMNS}),
+            ("parquet, dashboard columns, 1 season", read_matches, (store_path,),
+             {'columns': DASHBOARD_COLUMNS, 'seasons': [2024]}),
+        ]
+        print(f"rows={n_rows}")
+        for name, fn, args, kwargs in cases:
+            seconds, loaded = timed(fn, *args, **kwargs)
+            megabytes = loaded.memory_usage(deep=True).sum() / 1e6
+            print(f"{name:38s} {seconds:7.3f} s {megabytes:9.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
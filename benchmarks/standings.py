@@ -0,0 +1,63 @@
+# benchmarks/standings.py
+"""Standings: replaying one match day vs rebuilding, snapshot lookup vs replay.
+
+Imports synthetic matches into an in-memory SQLite database, then times
+a full refresh_standings, a rebuild of the latest season, the
+incremental replay an import of its last match day runs, and reading
+the table as of mid-season from the snapshots against replaying the
+season's matches up to that date.
+
+Usage: python -m benchmarks.standings [n_rows]
+"""
+import io
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.db.standings import _compute_table, read_standings, refresh_standings, replay_season
+from app.db.wpl_import import import_matches
+from benchmarks import synthetic
+
+
+def timed(fn, *args, repeat=3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(n_rows: int = 10_000):
+    df = synthetic.import_matches(n_rows)
+    last_day = date.fromisoformat(df['date'].max())
+    season = last_day.year
+    season_dates = sorted(df.loc[df['date'].str.startswith(str(season)), 'date'].unique())
+    middle = date.fromisoformat(season_dates[len(season_dates) // 2])
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        import_time, report = timed(import_matches, db, io.StringIO(df.to_csv(index=False)), repeat=1)
+        refresh_time, _ = timed(refresh_standings, db, repeat=1)
+        season_time, _ = timed(replay_season, db, season)
+        day_time, rows = timed(replay_season, db, season, last_day)
+        lookup_time, table = timed(read_standings, db, season, middle, repeat=20)
+        replay_time, (as_of, records) = timed(_compute_table, db, season, middle)
+        assert table['as_of'] == as_of and [r['team'] for r in table['standings']] == [r.team for r in records]
+
+    print(f"matches={report.rows} seasons={df['date'].str[:4].nunique()} season {season}: {len(season_dates)} days")
+    print(f"import (with standings): {import_time * 1000:8.1f} ms")
+    print(f"refresh all seasons:     {refresh_time * 1000:8.1f} ms")
+    print(f"rebuild latest season:   {season_time * 1000:8.1f} ms")
+    print(f"replay last match day:   {day_time * 1000:8.1f} ms ({rows} snapshot rows)")
+    print(f"as-of lookup:            {lookup_time * 1000:8.2f} ms")
+    print(f"as-of by replay:         {replay_time * 1000:8.2f} ms ({replay_time / lookup_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
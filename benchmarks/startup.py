@@ -0,0 +1,123 @@
+# benchmarks/startup.py
+"""Cold start of the API: import time and time to first response.
+
+Each measurement runs in a fresh interpreter so nothing is already
+imported or cached:
+
+- import: ``import app.main``
+- first response: import, run startup hooks and serve ``GET /`` in-process
+- uvicorn: spawn ``uvicorn app.main:app`` until ``GET /`` answers
+
+The heavy data modules the API loaded by then are listed too; they should
+only appear once a route that needs them is called.
+
+Usage: python -m benchmarks.startup [--repeat 5] [--database-url URL] [--no-uvicorn]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'sklearn')
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter() - started
+result = {'import': imported}
+if sys.argv[1] == 'first_response':
+    from fastapi.testclient import TestClient
+    with TestClient(app.main.app) as client:
+        assert client.get('/').status_code == 200
+    result['first_response'] = time.perf_counter() - started
+result['heavy'] = sorted({m.split('.')[0] for m in sys.modules} & set(%r))
+print(json.dumps(result))
+""" % (HEAVY_MODULES,)
+
+
+def _env(database_url: str) -> Dict[str, str]:
+    return {**os.environ, 'DATABASE_URL': database_url, 'PYTHONPATH': str(ROOT)}
+
+
+def probe(database_url: str, mode: str = 'import') -> Dict:
+    """Timings from one fresh interpreter; ``mode`` is 'import' or 'first_response'"""
+    output = subprocess.run([sys.executable, '-c', _PROBE, mode], env=_env(database_url), cwd=ROOT,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def uvicorn_first_response(database_url: str, timeout: float = 30.0) -> float:
+    """Seconds from spawning uvicorn until ``GET /`` answers"""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning'],
+        env=_env(database_url), cwd=ROOT,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+                time.sleep(0.01)
+        raise TimeoutError(f"uvicorn did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def measure(database_url: str, repeat: int = 5, uvicorn: bool = True) -> Dict:
+    """Best-of-``repeat`` timings and the heavy modules loaded by the first response"""
+    imports = [probe(database_url, 'import') for _ in range(repeat)]
+    responses = [probe(database_url, 'first_response') for _ in range(repeat)]
+    result = {
+        'startup.import': min(r['import'] for r in imports),
+        'startup.first_response': min(r['first_response'] for r in responses),
+    }
+    if uvicorn:
+        result['startup.uvicorn'] = min(uvicorn_first_response(database_url) for _ in range(repeat))
+    result['heavy_modules'] = responses[-1]['heavy']
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure API import time and time to first response")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--database-url', help="default: a new SQLite file; the app should not connect to it")
+    parser.add_argument('--no-uvicorn', action='store_true', help="skip the uvicorn measurement")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url: Optional[str] = args.database_url or f"sqlite:///{Path(tmp) / 'startup.db'}"
+        result = measure(database_url, args.repeat, not args.no_uvicorn)
+        if not args.database_url:
+            created = (Path(tmp) / 'startup.db').exists()
+            print(f"database touched at startup: {'yes' if created else 'no'}")
+
+    for name, seconds in result.items():
+        if name.startswith('startup.'):
+            print(f"{name[len('startup.'):]:16} {seconds * 1000:8.1f} ms")
+    print(f"heavy modules loaded: {', '.join(result['heavy_modules']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# benchmarks/synthetic.py
+"""Deterministic, WPL-shaped synthetic data at any scale.
+
+Every generator takes a ``seed`` and returns the same data for the same
+arguments. Matches follow a league schedule: ``n_teams`` teams play one
+round of pairings per day, 60 match days per season, one season a year.
+Once a league has run ``SEASONS_PER_LEAGUE`` seasons, a new league with its
+own teams starts, so dates stay in range and (date, team1, team2) stays
+unique at 10M rows while every season keeps a realistic team count.
+
+Usage: python -m benchmarks.synthetic <out_dir> [n_rows]
+    writes raw_matches.csv, import_matches.csv, player_stats.csv and
+    deliveries.csv (ball-by-ball for the first n_rows / 100 matches)
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.db.models import WPLMatch, WPLPlayerStats
+from app.utils.deliveries_store import SCHEMA as DELIVERY_SCHEMA
+
+N_TEAMS = 10
+N_VENUES = 30
+PLAYERS_PER_TEAM = 25
+DAYS_PER_SEASON = 60
+SEASONS_PER_LEAGUE = 100
+FIRST_SEASON = 2008
+
+RAW_COLUMNS = [
+    'season', 'team1', 'team2', 'date', 'match_number', 'venue', 'city', 'toss_winner', 'toss_decision',
+    'player_of_match', 'umpire1', 'umpire2', 'reserve_umpire', 'match_referee', 'winner',
+    'winner_runs', 'winner_wickets',
+]
+IMPORT_COLUMNS = [
+    'date', 'venue', 'team1', 'team2', 'winner', 'player_of_match', 'team1_score', 'team1_wickets',
+    'team1_overs', 'team2_score', 'team2_wickets', 'team2_overs',
+]
+DISMISSALS = np.array(['bowled', 'caught', 'lbw', 'run out', 'stumped', 'retired hurt'], dtype=object)
+EXTRAS = np.array(['wides', 'noballs', 'byes', 'legbyes'], dtype=object)
+BALLS_PER_INNINGS = 120
+PLAYER_COLUMNS = [
+    'player_name', 'team', 'matches', 'runs', 'wickets', 'batting_average', 'bowling_average',
+    'strike_rate', 'economy_rate',
+]
+
+
+def team_names(n_codes: int, n_teams: int = N_TEAMS) -> np.ndarray:
+    """Name of every team code; code = league * n_teams + team"""
+    names = [f"Team {code % n_teams:02d}" for code in range(n_codes)]
+    return np.array([
+        name if code < n_teams else f"League {code // n_teams} {name}" for code, name in enumerate(names)
+    ], dtype=object)
+
+
+def matches(n_rows: int, n_teams: int = N_TEAMS, n_venues: int = N_VENUES, seed: int = 0) -> pd.DataFrame:
+    """One row per match with everything the raw and import formats need"""
+    rng = np.random.default_rng(seed)
+    per_day = n_teams // 2
+    n_days = -(-n_rows // per_day)
+
+    # A fresh random pairing of the league's teams every day
+    order = np.argsort(rng.random((n_days, n_teams)), axis=1)[:, :2 * per_day].reshape(-1, 2)[:n_rows]
+    day = np.arange(n_rows) // per_day
+    season_index, match_day = np.divmod(day, DAYS_PER_SEASON)
+    league, season_in_league = np.divmod(season_index, SEASONS_PER_LEAGUE)
+    season = FIRST_SEASON + season_in_league
+    first_days = np.array([f"{year}-03-01" for year in range(FIRST_SEASON, FIRST_SEASON + SEASONS_PER_LEAGUE)],
+                          dtype='datetime64[D]')
+    dates = first_days[season_in_league] + match_day.astype('timedelta64[D]')
+
+    # Strings are built once per team/player and gathered by code
+    code1 = league * n_teams + order[:, 0]
+    code2 = league * n_teams + order[:, 1]
+    names = team_names(int(league[-1] + 1) * n_teams, n_teams)
+    team1, team2 = names[code1], names[code2]
+    toss_to_team1 = rng.random(n_rows) < 0.5
+    first_wins = rng.random(n_rows) < 0.5
+    no_result = rng.random(n_rows) < 0.02
+    winner_code = np.where(first_wins, code1, code2)
+    winner = np.where(no_result, None, names[winner_code])
+    player_names = np.array([f"{team} Player {i}" for team in names for i in range(PLAYERS_PER_TEAM)], dtype=object)
+
+    team1_score = rng.integers(90, 221, n_rows)
+    team2_wickets = rng.integers(0, 11, n_rows)
+    margin_runs = rng.integers(1, 101, n_rows)
+    margin_wickets = rng.integers(1, 11, n_rows)
+    team2_score = np.where(first_wins, np.maximum(team1_score - margin_runs, 20), team1_score + rng.integers(1, 7, n_rows))
+    venue = rng.integers(0, n_venues, n_rows)
+    player = winner_code * PLAYERS_PER_TEAM + rng.integers(0, PLAYERS_PER_TEAM, n_rows)
+
+    return pd.DataFrame({
+        'season': season,
+        'date': dates,
+        'match_number': match_day * per_day + np.arange(n_rows) % per_day + 1,
+        'team1': team1,
+        'team2': team2,
+        'venue': np.array([f"Venue {i:02d}" for i in range(n_venues)], dtype=object)[venue],
+        'city': np.array([f"City {i:02d}" for i in range(n_venues)], dtype=object)[venue],
+        'toss_winner': np.where(toss_to_team1, team1, team2),
+        'toss_decision': np.where(rng.random(n_rows) < 0.6, 'field', 'bat'),
+        'winner': winner,
+        'winner_runs': np.where(first_wins & ~no_result, margin_runs, np.nan),
+        'winner_wickets': np.where(~first_wins & ~no_result, margin_wickets, np.nan),
+        'player_of_match': np.where(no_result, None, player_names[player]),
+        'team1_score': team1_score,
+        'team1_wickets': rng.integers(0, 11, n_rows),
+        'team1_overs': 20.0,
+        'team2_score': team2_score,
+        'team2_wickets': np.where(first_wins, 10, team2_wickets),
+        'team2_overs': np.round(rng.uniform(12, 20, n_rows), 1),
+    })
+
+
+def raw_matches(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Matches in the data/raw CSV layout WPLDataCleaner reads"""
+    df = matches(n_rows, seed=seed)
+    df['date'] = df['date'].dt.strftime('%Y/%m/%d')
+    for column in ('umpire1', 'umpire2', 'reserve_umpire', 'match_referee'):
+        df[column] = 'Umpire ' + (df['match_number'] % 17).astype(str)
+    return df[RAW_COLUMNS]
+
+
+def import_matches(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Matches in the CSV layout /wpl/import-data reads"""
+    df = matches(n_rows, seed=seed)
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    return df[IMPORT_COLUMNS]
+
+
+def player_stats(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Season-level player stats with missing averages where a player never batted/bowled"""
+    rng = np.random.default_rng(seed)
+    team = np.arange(n_rows) // PLAYERS_PER_TEAM
+    teams = team_names(int(team[-1]) + 1)[team]
+    matches_played = rng.integers(1, 15, n_rows)
+    runs = rng.integers(0, 500, n_rows)
+    wickets = rng.integers(0, 20, n_rows)
+    bowled = rng.random(n_rows) < 0.5
+    return pd.DataFrame({
+        'player_name': [f"{t} Player {i % PLAYERS_PER_TEAM}" for i, t in enumerate(teams)],
+        'team': teams,
+        'matches': matches_played,
+        'runs': runs,
+        'wickets': np.where(bowled, wickets, 0),
+        'batting_average': np.round(runs / matches_played, 2),
+        'bowling_average': np.where(bowled & (wickets > 0), np.round(rng.uniform(10, 40, n_rows), 2), np.nan),
+        'strike_rate': np.round(rng.uniform(70, 180, n_rows), 2),
+        'economy_rate': np.where(bowled, np.round(rng.uniform(5, 11, n_rows), 2), np.nan),
+    })
+
+
+def deliveries(n_matches: int, seed: int = 0) -> pd.DataFrame:
+    """Two full innings of ball-by-ball rows for each of the first ``n_matches`` matches.
+
+    Batters and bowlers are drawn from each side's first eleven, about one
+    delivery in twenty is an extra and one in twenty-five a dismissal.
+    """
+    rng = np.random.default_rng(seed)
+    games = matches(n_matches, seed=seed)
+    n_rows = n_matches * 2 * BALLS_PER_INNINGS
+    row = np.arange(n_rows)
+    match, rest = np.divmod(row, 2 * BALLS_PER_INNINGS)
+    innings, ball_index = np.divmod(rest, BALLS_PER_INNINGS)
+    first_bats = innings == 0
+
+    team1, team2 = games['team1'].to_numpy()[match], games['team2'].to_numpy()[match]
+    batting_team = np.where(first_bats, team1, team2)
+    bowling_team = np.where(first_bats, team2, team1)
+    batter = rng.integers(0, 11, n_rows)
+    non_striker = (batter + rng.integers(1, 11, n_rows)) % 11
+    bowler = rng.integers(0, 11, n_rows)
+
+    # Player names are built once per (team, number) and gathered by code
+    team_code, teams = pd.factorize(np.concatenate([batting_team, bowling_team]))
+    batting_code, bowling_code = np.split(team_code, 2)
+    names = np.array([f"{team} Player {i}" for team in teams for i in range(11)], dtype=object)
+
+    def player(code, number):
+        return names[code * 11 + number]
+
+    extra = rng.random(n_rows) < 0.05
+    extra_type = np.where(extra, EXTRAS[rng.integers(0, len(EXTRAS), n_rows)], None)
+    out = rng.random(n_rows) < 0.04
+    dismissal = np.where(out, DISMISSALS[rng.integers(0, len(DISMISSALS), n_rows)], None)
+    batter_names = player(batting_code, batter)
+
+    return pd.DataFrame({
+        'match_id': match + 1,
+        'season': games['season'].to_numpy()[match],
+        'innings': innings + 1,
+        'over': ball_index // 6,
+        'ball': ball_index % 6 + 1,
+        'batting_team': batting_team,
+        'bowling_team': bowling_team,
+        'batter': batter_names,
+        'non_striker': player(batting_code, non_striker),
+        'bowler': player(bowling_code, bowler),
+        'runs': np.where(extra & np.isin(extra_type, ['wides', 'byes', 'legbyes']), 0,
+                         rng.choice([0, 1, 2, 4, 6], n_rows, p=[0.4, 0.35, 0.1, 0.1, 0.05])),
+        'extras': np.where(extra, 1, 0),
+        'extra_type': extra_type,
+        'dismissal': dismissal,
+        'player_dismissed': np.where(out, batter_names, None),
+    })[['season'] + DELIVERY_SCHEMA.names]
+
+
+def data_points(n_rows: int, seed: int = 0) -> list:
+    """Payload rows for /data/batch, spread over a week"""
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.integers(0, 7 * 24 * 3600, n_rows))
+    timestamps = pd.Timestamp('2024-01-01', tz='UTC') + pd.to_timedelta(offsets, unit='s')
+    return [
+        {'value': float(v), 'category': f"cat{c}", 'source': f"src{s}", 'timestamp': t.isoformat()}
+        for v, c, s, t in zip(rng.normal(100, 15, n_rows).round(3), rng.integers(0, 8, n_rows),
+                              rng.integers(0, 4, n_rows), timestamps)
+    ]
+
+
+def match_objects(df: pd.DataFrame) -> list:
+    """Transient WPLMatch rows, as calculate_team_stats receives them from a query"""
+    df = df.rename(columns={'date': 'match_date'})[[c for c in IMPORT_COLUMNS if c != 'date'] + ['match_date']]
+    df = df.astype(object).where(df.notna(), None)
+    return [WPLMatch(**row) for row in df.to_dict(orient='records')]
+
+
+def player_objects(df: pd.DataFrame) -> list:
+    df = df.astype(object).where(df.notna(), None)
+    return [WPLPlayerStats(**row) for row in df.to_dict(orient='records')]
+
+
+def main(out_dir: str, n_rows: int = 10_000):
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    raw_matches(n_rows).to_csv(out / 'raw_matches.csv', index=False)
+    import_matches(n_rows).to_csv(out / 'import_matches.csv', index=False)
+    player_stats(n_rows).to_csv(out / 'player_stats.csv', index=False)
+    deliveries(max(n_rows // 100, 1)).to_csv(out / 'deliveries.csv', index=False)
+    print(f"wrote {n_rows} rows of each to {out}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], *[int(a) for a in sys.argv[2:]])
@@ -0,0 +1,75 @@
+# benchmarks/team_stats.py
+"""Compare /wpl/team-stats SQL aggregation against the Python fallback.
+
+Usage: python -m benchmarks.team_stats [n_matches]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.db.models import WPLMatch
+from app.db.queries import team_stats_python, team_stats_query
+
+TEAMS = [f"Team {i:02d}" for i in range(40)]
+VENUES = [f"Venue {i:02d}" for i in range(60)]
+
+
+def populate(db: Session, n_matches: int, seed: int = 0):
+    rng = random.Random(seed)
+    start = date(2008, 1, 1)
+    per_day = len(TEAMS) // 2
+    rows = []
+    for i in range(n_matches):
+        # Each day is a fresh pairing so the natural match key stays unique
+        if i % per_day == 0:
+            order = rng.sample(TEAMS, len(TEAMS))
+        team1, team2 = order[2 * (i % per_day)], order[2 * (i % per_day) + 1]
+        rows.append({
+            'match_date': start + timedelta(days=i // per_day),
+            'venue': rng.choice(VENUES),
+            'team1': team1,
+            'team2': team2,
+            'winner': rng.choice((team1, team2)),
+            'player_of_match': f"Player {rng.randrange(2000)}",
+            'team1_score': rng.randint(80, 230),
+            'team1_wickets': rng.randint(0, 10),
+            'team1_overs': 20.0,
+            'team2_score': rng.randint(80, 230),
+            'team2_wickets': rng.randint(0, 10),
+            'team2_overs': 20.0,
+        })
+    db.execute(WPLMatch.__table__.insert(), rows)
+    db.commit()
+
+
+def timed(fn, *args, repeat=5, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(n_matches: int = 50000):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        populate(db, n_matches)
+        sql_time, sql_result = timed(team_stats_query, db)
+        py_time, py_result = timed(team_stats_python, db)
+
+    assert sql_result == py_result, "SQL and Python team stats disagree"
+    print(f"matches={n_matches}")
+    print(f"sql:    {sql_time * 1000:8.1f} ms")
+    print(f"python: {py_time * 1000:8.1f} ms")
+    print(f"speedup: {py_time / sql_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -6,4 +6,125 @@ from pathlib import Path
 
 # Add the project root to PYTHONPATH
 project_root = str(Path(__file__).parent.parent)
-sys.path.insert(0, project_root)
\ No newline at end of file
+sys.path.insert(0, project_root)
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """File-backed SQLite engine with the full schema, independent of DATABASE_URL"""
+    from sqlalchemy import create_engine
+    from app.db.database import Base
+    from app.db import models  # noqa: F401 - registers tables
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def processed_store(tmp_path_factory):
+    """The raw file cleaned into a fresh store and manifest; generated outputs are not committed"""
+    from app.utils.data_cleaner import WPLDataCleaner
+
+    cleaner = WPLDataCleaner()
+    cleaner.processed_path = tmp_path_factory.mktemp('processed')
+    cleaner.clean_data()
+    return cleaner.store_path
+
+
+@pytest.fixture
+def db_session(sqlite_engine):
+    from sqlalchemy.orm import sessionmaker
+
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def write_buffer(sqlite_engine):
+    from sqlalchemy.orm import sessionmaker
+    from app.db.ingest import DataPointWriteBuffer
+
+    buffer = DataPointWriteBuffer(
+        sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine),
+        max_batch=50,
+        flush_interval=0.01,
+    )
+    yield buffer
+    buffer.close()
+
+
+def _make_client(session_dependency, write_buffer, store_path=None):
+    from fastapi import FastAPI
+    from fastapi.middleware.gzip import GZipMiddleware
+    from fastapi.testclient import TestClient
+    from app.db.database import get_read_session, get_session
+    from app.db.ingest import get_write_buffer
+    from app.api.cache import ResponseCache, get_response_cache
+    from app.api.routes.data_routes import router as data_router
+    from app.api.routes.wpl_routes import router as wpl_router
+    from app.api.routes.dashboard_routes import router as dashboard_router
+    from app.api.dashboard import DashboardIndex, get_dashboard_index
+    from app.api.matchups import MatchupSource, get_matchup_source
+    from app.api.predict import WinModelSource, get_win_model_source
+    from app.profiling import ProfilingMiddleware
+
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(data_router)
+    app.include_router(wpl_router)
+    app.include_router(dashboard_router)
+    app.dependency_overrides[get_session] = session_dependency
+    app.dependency_overrides[get_read_session] = session_dependency
+    app.dependency_overrides[get_write_buffer] = lambda: write_buffer
+    response_cache = ResponseCache()
+    app.dependency_overrides[get_response_cache] = lambda: response_cache
+    dashboard_index = DashboardIndex(store_path)
+    app.dependency_overrides[get_dashboard_index] = lambda: dashboard_index
+    matchup_source = MatchupSource(store_path)
+    app.dependency_overrides[get_matchup_source] = lambda: matchup_source
+    win_model_source = WinModelSource(store_path)
+    app.dependency_overrides[get_win_model_source] = lambda: win_model_source
+    return TestClient(app)
+
+
+@pytest.fixture
+def client(sqlite_engine, write_buffer, processed_store):
+    """TestClient for the API routers in sync mode, bound to the SQLite engine"""
+    from sqlalchemy.orm import sessionmaker
+
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)
+
+    def override_get_session():
+        db = TestingSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with _make_client(override_get_session, write_buffer, processed_store) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def async_client(sqlite_engine, write_buffer, processed_store):
+    """TestClient for the API routers in async mode (aiosqlite) on the same database"""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_async_engine(str(sqlite_engine.url).replace("sqlite://", "sqlite+aiosqlite://", 1))
+    TestingSession = sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    async def override_get_session():
+        async with TestingSession() as db:
+            yield db
+
+    with _make_client(override_get_session, write_buffer, processed_store) as test_client:
+        yield test_client
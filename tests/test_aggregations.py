@@ -0,0 +1,52 @@
+# tests/test_aggregations.py
+import json
+
+import pandas as pd
+
+from app.utils.aggregations import team_performance, venue_statistics
+from app.utils.data_cleaner import SummaryStats, WPLDataCleaner
+from app.utils.processed_store import read_matches, write_matches
+
+
+def _clean_frame():
+    cleaner = WPLDataCleaner()
+    return cleaner.transform(pd.read_csv(cleaner.input_file))
+
+
+def test_team_performance_matches_per_team_scans():
+    """Test the melted groupby against counting each team with boolean masks"""
+    df = _clean_frame()
+    table = team_performance(df)
+
+    teams = sorted(set(df['team1']) | set(df['team2']))
+    assert list(table.index) == teams
+    for team in teams:
+        played = len(df[(df['team1'] == team) | (df['team2'] == team)])
+        won = len(df[df['winner'] == team])
+        assert table.loc[team, 'matches_played'] == played
+        assert table.loc[team, 'matches_won'] == won
+        assert table.loc[team, 'win_rate'] == won / played * 100
+
+
+def test_aggregations_ignore_unused_categories(tmp_path):
+    """Test that categorical frames from the store only report teams and venues present"""
+    store = tmp_path / 'wpl_clean.parquet'
+    write_matches(_clean_frame(), store)
+    df = read_matches(store)
+    subset = df[df['team1'] == 'Mumbai Indians']
+
+    teams = team_performance(subset)
+    assert teams.loc['Mumbai Indians', 'matches_played'] == len(subset)
+    assert (teams['matches_played'] > 0).all()
+    assert set(venue_statistics(subset).index) == set(subset['venue'].astype(str))
+
+
+def test_structured_summary_is_json_ready():
+    """Test that the summary statistics are also available as plain data"""
+    summary = SummaryStats.from_frame(_clean_frame()).to_summary()
+
+    assert summary['total_matches'] == 44
+    assert summary['toss']['matches'] == 44
+    assert {row['team'] for row in summary['teams']} >= {'Mumbai Indians', 'UP Warriorz'}
+    assert all(isinstance(row['matches'], int) for row in summary['venues'])
+    json.dumps(summary)
@@ -0,0 +1,29 @@
+# tests/test_async_routes.py
+import json
+
+from tests.test_rollups import POINTS
+from tests.test_wpl_import import MATCHES_CSV
+
+
+def test_wpl_routes_async(async_client, client):
+    """Test that the WPL routes give the same answers on the async session"""
+    response = async_client.post("/wpl/import-data", files={"file": ("m.csv", MATCHES_CSV, "text/csv")})
+    assert response.json()["rows"] == 3
+
+    for path in ("/wpl/team-stats", "/wpl/match-analysis", "/wpl/top-players/runs", "/wpl/matches"):
+        assert async_client.get(path).json() == client.get(path).json(), path
+
+    assert async_client.get("/wpl/match-analysis", params={"method": "stream"}).json()["total_matches"] == 3
+    rows = async_client.get("/wpl/matches", params={"format": "ndjson", "fields": "team1"}).text.splitlines()
+    assert json.loads(rows[0]) == {"id": 1, "team1": "Delhi Capitals"}
+
+
+def test_data_routes_async(async_client, client):
+    """Test writes and reads of data points on the async session"""
+    assert async_client.post("/data/batch", json=POINTS).json()["inserted"] == len(POINTS)
+    created = async_client.post("/data/", params={"value": 2, "category": "runs", "source": "feed"}).json()
+    assert created["value"] == 2.0 and created["id"] == len(POINTS) + 1
+
+    params = {"bucket": "hour", "category": "runs"}
+    assert async_client.get("/data/rollup", params=params).json() == client.get("/data/rollup", params=params).json()
+    assert len(async_client.get("/data/").json()) == len(POINTS) + 1
@@ -0,0 +1,33 @@
+# tests/test_benchmarks.py
+import pandas as pd
+
+from app.utils.data_cleaner import WPLDataCleaner
+from benchmarks import synthetic
+from benchmarks.suite import compare
+
+
+def test_synthetic_data_is_deterministic_and_cleanable():
+    """Test that the generator is seeded, keeps match keys unique and produces raw files the cleaner accepts"""
+    pd.testing.assert_frame_equal(synthetic.raw_matches(2000, seed=1), synthetic.raw_matches(2000, seed=1))
+    assert not synthetic.raw_matches(200, seed=1).equals(synthetic.raw_matches(200, seed=2))
+
+    # 40k rows spans more than one league; match keys stay unique for the importer
+    imported = synthetic.import_matches(40_000)
+    assert not imported.duplicated(['date', 'team1', 'team2']).any()
+    assert (imported['team1'] != imported['team2']).all()
+    per_season = synthetic.matches(40_000).groupby('season')['team1'].nunique()
+    assert per_season.max() <= 2 * synthetic.N_TEAMS
+
+    clean = WPLDataCleaner().transform(synthetic.raw_matches(500))
+    assert len(clean) == 500
+    assert set(clean['win_type']) <= {'runs', 'wickets', 'unknown'}
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Test thresholds, per-metric overrides and the absolute noise floor"""
+    baseline = {'a': 1.0, 'b': 1.0, 'c': 0.001, 'd': 1.0}
+    current = {'a': 1.2, 'b': 1.3, 'c': 0.002, 'd': 1.3, 'new': 5.0}
+
+    assert [r.metric for r in compare(baseline, current, threshold=0.25)] == ['b', 'd']
+    regressions = compare(baseline, current, threshold=0.25, thresholds={'d': 0.5})
+    assert [(r.metric, round(r.change, 2)) for r in regressions] == [('b', 0.3)]
@@ -0,0 +1,75 @@
+# tests/test_cache.py
+import time
+
+from app.api.cache import MemoryCacheBackend
+from tests.test_queries import EXTRA_MATCHES
+from tests.test_wpl_import import MATCHES_CSV
+
+
+def upload(client, csv):
+    return client.post("/wpl/import-data", files={"file": ("m.csv", csv, "text/csv")})
+
+
+def test_hit_and_import_invalidation(client):
+    """Test that responses are cached until an import bumps the data version"""
+    upload(client, MATCHES_CSV)
+    first = client.get("/wpl/team-stats")
+    assert first.headers["X-Cache"] == "MISS"
+    second = client.get("/wpl/team-stats")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+
+    # Different parameters are cached separately
+    assert client.get("/wpl/team-stats", params={"season": 2024}).headers["X-Cache"] == "MISS"
+
+    upload(client, EXTRA_MATCHES)
+    third = client.get("/wpl/team-stats")
+    assert third.headers["X-Cache"] == "MISS"
+    assert "Gujarat Giants" in third.json() and third.json() != first.json()
+
+
+def test_etag_revalidation(client):
+    """Test If-None-Match handling for polling dashboards"""
+    upload(client, MATCHES_CSV)
+    response = client.get("/wpl/match-analysis")
+    etag = response.headers["ETag"]
+
+    not_modified = client.get("/wpl/match-analysis", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    upload(client, EXTRA_MATCHES)
+    changed = client.get("/wpl/match-analysis", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["total_matches"] == 5
+
+
+def test_memory_backend_ttl_and_lru():
+    """Test expiry, LRU eviction and byte accounting"""
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", b"1", ttl=60)
+    backend.set("b", b"22", ttl=60)
+    backend.get("a")
+    backend.set("c", b"333", ttl=60)
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.stats() == {"entries": 2, "bytes": 4}
+
+    backend.set("d", b"x", ttl=0)
+    time.sleep(0.01)
+    assert backend.get("d") is None
+
+
+def test_stale_etag_after_restart_gets_a_body(client):
+    """Test that an ETag is only answered with 304 while its entry is cached, and never repeats across processes"""
+    from app.api.cache import get_response_cache
+
+    upload(client, MATCHES_CSV)
+    etag = client.get("/wpl/match-analysis").headers["ETag"]
+    cache = client.app.dependency_overrides[get_response_cache]()
+    # A restarted worker: empty cache, version counter back at its start
+    cache.backend.clear()
+    response = client.get("/wpl/match-analysis", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.json()["total_matches"] == 3
+
+    assert MemoryCacheBackend().get_version("wpl") != MemoryCacheBackend().get_version("wpl")
@@ -0,0 +1,66 @@
+# tests/test_dashboard_routes.py
+import shutil
+from datetime import date
+
+import pandas as pd
+
+from app.utils.match_index import DASHBOARD_COLUMNS, FilterSummary, MatchIndex
+from app.utils.processed_store import from_arrow_ipc, read_matches, write_matches
+from tests.conftest import _make_client
+
+
+def _local_index(store):
+    return MatchIndex(read_matches(store, columns=DASHBOARD_COLUMNS))
+
+
+def test_summary_matches_local_index(client, processed_store):
+    """Test that the endpoint returns what the dashboard computes locally"""
+    index = _local_index(processed_store)
+    params = {"start_date": "2023-03-10", "end_date": "2024-03-10", "team": "Mumbai Indians"}
+    response = client.get("/wpl/dashboard/summary", params=params)
+    assert response.headers["X-Cache"] == "MISS"
+
+    expected = index.summary(date(2023, 3, 10), date(2024, 3, 10), "Mumbai Indians")
+    remote = FilterSummary.from_dict(response.json())
+    assert remote.matches == expected.matches
+    assert remote.toss_win_pct == expected.toss_win_pct
+    pd.testing.assert_frame_equal(remote.team_table, expected.team_table, check_dtype=False)
+    assert dict(remote.venue_counts) == {str(k): v for k, v in expected.venue_counts.items()}
+
+    assert client.get("/wpl/dashboard/summary", params=params).headers["X-Cache"] == "HIT"
+    season = client.get("/wpl/dashboard/summary", params={"season": 2024}).json()
+    assert season["matches"] == index.summary(index.min_date, index.max_date, None, 2024).matches
+
+
+def test_match_details_json_and_arrow(client):
+    """Test the details table as gzip-compressed JSON and as an Arrow stream"""
+    options = client.get("/wpl/dashboard/options").json()
+    assert options["seasons"] == [2023, 2024]
+    assert "Delhi Capitals" in options["teams"]
+
+    as_json = client.get("/wpl/dashboard/matches", headers={"Accept-Encoding": "gzip"})
+    assert as_json.headers["Content-Encoding"] == "gzip"
+    records = as_json.json()
+    assert len(records) == 44 and list(records[0]) == ['date', 'team1', 'team2', 'winner', 'match_result', 'venue']
+
+    as_arrow = client.get("/wpl/dashboard/matches", params={"format": "arrow", "limit": 5})
+    assert as_arrow.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    frame = from_arrow_ipc(as_arrow.content)
+    assert len(frame) == 5
+    assert str(frame['team1'].dtype) == 'category'
+    assert [str(d.date()) for d in frame['date']] == [r['date'][:10] for r in records[:5]]
+
+
+def test_store_change_rebuilds_index(tmp_path, write_buffer, processed_store):
+    """Test that rewriting the store invalidates the index and cached responses"""
+    store = tmp_path / "wpl_clean.parquet"
+    shutil.copytree(processed_store, store)
+
+    with _make_client(lambda: None, write_buffer, store_path=store) as client:
+        assert client.get("/wpl/dashboard/summary").json()["matches"] == 44
+
+        df = read_matches(store)
+        write_matches(df[df['season'] == 2024], store, source="Wpl 2023-2024")
+        after = client.get("/wpl/dashboard/summary")
+        assert after.headers["X-Cache"] == "MISS"
+        assert after.json()["matches"] == len(df[df['season'] == 2024])
@@ -0,0 +1,146 @@
+# tests/test_data_cleaner.py
+import numpy as np
+import pandas as pd
+
+from app.utils.data_cleaner import SummaryStats, WPLDataCleaner
+from app.utils.processed_store import read_matches
+from benchmarks.cleaner import legacy_transform, scaled_raw
+
+
+def test_transform_reproduces_processed_csv():
+    """Test that cleaning the raw file gives the committed wpl_clean.csv byte for byte"""
+    cleaner = WPLDataCleaner()
+    df = cleaner.transform(pd.read_csv(cleaner.input_file))
+    expected = (cleaner.processed_path / 'wpl_clean.csv').read_text()
+    assert df.to_csv(index=False) == expected
+
+
+def test_vectorized_matches_row_wise():
+    """Test the vectorized stages against the original row-wise implementation"""
+    cleaner = WPLDataCleaner()
+    raw = scaled_raw(500)
+    raw.loc[3, 'winner_runs'] = np.nan
+    raw.loc[3, 'winner_wickets'] = np.nan
+    raw.loc[5, 'team1'] = '  Mumbai Indians '
+    raw.loc[6, 'match_number'] = 'Final'
+
+    expected = legacy_transform(cleaner, raw.copy())
+    actual = cleaner.transform(raw.copy())
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual.loc[3, 'match_result'] == 'No result'
+    assert np.isnan(actual.loc[6, 'match_number'])
+
+
+def test_chunked_clean_matches_full(tmp_path):
+    """Test that chunked cleaning writes the same store, CSV and summary as a full read"""
+    raw = scaled_raw(300)
+    raw.loc[4, 'winner_runs'] = np.nan
+    raw.loc[4, 'winner_wickets'] = np.nan
+    input_file = tmp_path / 'raw.csv'
+    raw.to_csv(input_file, index=False)
+
+    outputs, stores = {}, {}
+    for mode, chunksize in (('full', None), ('chunked', 7)):
+        cleaner = WPLDataCleaner(input_file)
+        cleaner.processed_path = tmp_path / mode
+        cleaner.processed_path.mkdir()
+        if chunksize:
+            assert isinstance(cleaner.clean_data_chunked(chunksize, export_csv=True), SummaryStats)
+        else:
+            assert len(cleaner.clean_data(export_csv=True)) == len(raw)
+        outputs[mode] = [
+            (cleaner.processed_path / name).read_text() for name in ('wpl_clean.csv', 'data_summary.txt')
+        ]
+        stores[mode] = read_matches(cleaner.store_path)
+
+    assert outputs['chunked'] == outputs['full']
+    pd.testing.assert_frame_equal(stores['chunked'], stores['full'])
+
+
+def test_match_numbers_without_gaps_export_as_integers(tmp_path):
+    """Test that a file where every match has a number writes 1, not 1.0, in full and chunked modes"""
+    raw = scaled_raw(30)
+    raw['match_number'] = [str(n) for n in range(1, len(raw) + 1)]
+    input_file = tmp_path / 'raw.csv'
+    raw.to_csv(input_file, index=False)
+
+    outputs = {}
+    for mode, chunksize in (('full', None), ('chunked', 7)):
+        cleaner = WPLDataCleaner(input_file)
+        cleaner.processed_path = tmp_path / mode
+        cleaner.processed_path.mkdir()
+        if chunksize:
+            cleaner.clean_data_chunked(chunksize, export_csv=True)
+        else:
+            cleaner.clean_data(export_csv=True)
+        outputs[mode] = pd.read_csv(cleaner.csv_path, dtype=str)['match_number'].tolist()
+
+    assert outputs['chunked'] == outputs['full'] == [str(n) for n in range(1, len(raw) + 1)]
+
+
+def _split_by_season(raw_dir):
+    cleaner = WPLDataCleaner()
+    raw = pd.read_csv(cleaner.input_file)
+    for season, part in raw.groupby('season'):
+        part.to_csv(raw_dir / f'wpl_{season}.csv', index=False)
+    return raw
+
+
+def test_incremental_clean_skips_unchanged_files(tmp_path):
+    """Test that incremental runs reclean only new or changed files and keep the summary whole"""
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    raw = _split_by_season(raw_dir)
+
+    cleaner = WPLDataCleaner()
+    cleaner.raw_path = raw_dir
+    cleaner.processed_path = tmp_path / 'processed'
+    cleaner.processed_path.mkdir()
+
+    report = cleaner.clean_incremental()
+    assert report.cleaned == ['wpl_2023.csv', 'wpl_2024.csv']
+    assert report.changed_seasons == {2023, 2024}
+    expected_summary = (WPLDataCleaner().processed_path / 'data_summary.txt').read_text()
+    assert (cleaner.processed_path / 'data_summary.txt').read_text() == expected_summary
+
+    # Touching a file changes its mtime but not its hash
+    (raw_dir / 'wpl_2023.csv').touch()
+    report = cleaner.clean_incremental()
+    assert report.skipped == ['wpl_2023.csv', 'wpl_2024.csv']
+    assert not report.changed
+
+    latest = raw[raw['season'] == 2024]
+    latest.iloc[:-1].to_csv(raw_dir / 'wpl_2024.csv', index=False)
+    report = cleaner.clean_incremental()
+    assert report.cleaned == ['wpl_2024.csv']
+    assert report.changed_seasons == {2024}
+    assert len(read_matches(cleaner.store_path)) == len(raw) - 1
+    assert 'Total Matches: 43' in (cleaner.processed_path / 'data_summary.txt').read_text()
+
+    (raw_dir / 'wpl_2023.csv').unlink()
+    report = cleaner.clean_incremental()
+    assert report.removed == ['wpl_2023.csv']
+    assert report.changed_seasons == {2023}
+    assert set(read_matches(cleaner.store_path)['season']) == {2024}
+
+
+def test_clean_directory_in_parallel_isolates_failures(tmp_path):
+    """Test that a pooled batch clean merges every good file and reports the bad one"""
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    raw = _split_by_season(raw_dir)
+    (raw_dir / 'broken.csv').write_text("season,team1\n2025,Mumbai Indians\n")
+
+    cleaner = WPLDataCleaner()
+    cleaner.raw_path = raw_dir
+    cleaner.processed_path = tmp_path / 'processed'
+    cleaner.processed_path.mkdir()
+
+    report = cleaner.clean_directory(workers=2)
+
+    assert report.cleaned == ['wpl_2023.csv', 'wpl_2024.csv']
+    assert list(report.failed) == ['broken.csv']
+    assert set(report.timings) == {'wpl_2023.csv', 'wpl_2024.csv'}
+    assert len(read_matches(cleaner.store_path)) == len(raw)
+    expected_summary = (WPLDataCleaner().processed_path / 'data_summary.txt').read_text()
+    assert (cleaner.processed_path / 'data_summary.txt').read_text() == expected_summary
@@ -0,0 +1,118 @@
+# tests/test_ingest.py
+import json
+import threading
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.db.ingest import BufferFull, DataPointWriteBuffer, FAILED_ROWS, FLUSH_SECONDS, make_point
+from app.db.models import DataPoint
+
+
+def test_batch_formats(client, db_session):
+    """Test JSON, NDJSON and CSV bodies on /data/batch"""
+    points = [{"value": i, "category": "runs", "source": "feed"} for i in range(3)]
+    response = client.post("/data/batch", json=points)
+    assert response.json() == {"status": "success", "inserted": 3}
+
+    ndjson = "\n".join(json.dumps(p) for p in points)
+    response = client.post("/data/batch", content=ndjson, headers={"content-type": "application/x-ndjson"})
+    assert response.json()["inserted"] == 3
+
+    body = "value,category,source,timestamp\n1.5,wickets,feed,2024-03-01T19:30:00+00:00\n"
+    response = client.post("/data/batch", content=body, headers={"content-type": "text/csv"})
+    assert response.json()["inserted"] == 1
+
+    assert db_session.query(DataPoint).count() == 7
+
+
+def test_batch_validation(client):
+    """Test that a bad point rejects the whole batch"""
+    response = client.post("/data/batch", json=[{"value": 1, "category": "runs", "source": "feed"}, {"value": 2}])
+    assert response.status_code == 422
+    assert "index 1" in response.json()["detail"]
+
+
+def test_batch_failure_hides_details(client, monkeypatch):
+    """Test that a failed batch insert is a generic 500 with the cause only in the log"""
+    from app.api.routes import data_routes
+
+    def fail(db, points):
+        raise RuntimeError("INSERT INTO data_points VALUES ('secret')")
+
+    monkeypatch.setattr(data_routes, '_insert_batch', fail)
+    response = client.post("/data/batch", json=[{"value": 1, "category": "runs", "source": "feed"}])
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Batch insert failed"}
+
+
+def test_single_point_validation(client):
+    """Test that an empty category or source is a 422 on /data/, buffered or not"""
+    for buffered in (False, True):
+        params = {"value": 1, "category": "", "source": "feed", "buffered": buffered}
+        response = client.post("/data/", params=params)
+        assert response.status_code == 422
+        assert response.json()["detail"] == "category and source are required"
+
+
+def test_buffered_posts_are_coalesced(client, write_buffer, db_session):
+    """Test that concurrent buffered posts end up as grouped inserts"""
+    flushes_before = FLUSH_SECONDS.count()
+
+    def post(i):
+        response = client.post("/data/", params={"value": i, "category": "runs", "source": "feed", "buffered": True})
+        assert response.status_code == 202
+
+    threads = [threading.Thread(target=post, args=(i,)) for i in range(100)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    write_buffer.flush()
+
+    assert db_session.query(DataPoint).count() == 100
+    assert 0 < FLUSH_SECONDS.count() - flushes_before < 100
+
+
+def test_backpressure(sqlite_engine, db_session):
+    """Test that a full buffer rejects instead of growing without bound"""
+    # max_batch above max_pending and a long interval keep the flusher idle
+    buffer = DataPointWriteBuffer(
+        sessionmaker(bind=sqlite_engine), max_batch=10, max_pending=2, put_timeout=0.01, flush_interval=60
+    )
+    buffer.submit(make_point(1, "runs", "feed"))
+    buffer.submit(make_point(2, "runs", "feed"))
+    with pytest.raises(BufferFull):
+        buffer.submit(make_point(3, "runs", "feed"))
+
+    buffer.close()
+    assert db_session.query(DataPoint).count() == 2
+
+
+def test_failed_flush_retries_then_reports_dropped_points(sqlite_engine, db_session, caplog):
+    """Test that a flush is retried once and a batch that still fails is logged as dropped"""
+    calls = []
+
+    def flaky_session():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+        return sessionmaker(bind=sqlite_engine)()
+
+    def broken_session():
+        raise RuntimeError("database down")
+
+    buffer = DataPointWriteBuffer(flaky_session, flush_interval=60)
+    buffer.submit(make_point(1, "runs", "feed"))
+    buffer.flush()
+    assert db_session.query(DataPoint).count() == 1
+
+    failed_before = FAILED_ROWS.value()
+    broken = DataPointWriteBuffer(broken_session, flush_interval=60)
+    broken.submit(make_point(2, "runs", "feed"))
+    broken.submit(make_point(3, "runs", "feed"))
+    broken.flush()
+    assert FAILED_ROWS.value() - failed_before == 2
+    assert "Dropped 2 acknowledged data points" in caplog.text
+    buffer.close()
+    broken.close()
@@ -0,0 +1,46 @@
+# tests/test_leaderboard.py
+from app.db.leaderboard import top_players_query
+from app.db.models import LEADERBOARD_CATEGORIES, WPLPlayerStats, get_top_players
+
+PLAYERS = [
+    ("H Kaur", "Mumbai Indians", 310, 0, 38.8, None, 136.2, None),
+    ("NR Sciver-Brunt", "Mumbai Indians", 332, 10, 47.4, 25.3, 141.3, 7.4),
+    ("M Lanning", "Delhi Capitals", 345, 0, 49.3, None, 139.7, None),
+    ("S Ecclestone", "UP Warriorz", 40, 16, 10.0, 14.1, 105.0, 6.4),
+    ("S Sajana", "Mumbai Indians", 80, 0, 20.0, None, 150.0, None),
+    ("AC Kerr", "Mumbai Indians", 120, 15, 20.0, 15.0, 110.0, 7.1),
+]
+
+
+def load(db):
+    for name, team, runs, wickets, bat, bowl, sr, econ in PLAYERS:
+        db.add(WPLPlayerStats(
+            player_name=name, team=team, matches=10, runs=runs, wickets=wickets,
+            batting_average=bat, bowling_average=bowl, strike_rate=sr, economy_rate=econ,
+        ))
+    db.commit()
+
+
+def test_sql_matches_heap(db_session):
+    """Test that the SQL leaderboard and the heap path agree for every category"""
+    load(db_session)
+    players = db_session.query(WPLPlayerStats).order_by(WPLPlayerStats.id).all()
+    for category in LEADERBOARD_CATEGORIES:
+        for team in (None, "Mumbai Indians"):
+            expected = [p.player_name for p in get_top_players(players, category, 3, team)]
+            actual = [p.player_name for p in top_players_query(db_session, category, 3, team)]
+            assert actual == expected, category
+
+
+def test_ordering(db_session):
+    """Test ascending categories and NULL handling"""
+    load(db_session)
+    economy = [p.player_name for p in top_players_query(db_session, 'economy_rate', 5)]
+    assert economy == ["S Ecclestone", "AC Kerr", "NR Sciver-Brunt"]
+    assert [p.player_name for p in top_players_query(db_session, 'runs', 1)] == ["M Lanning"]
+
+
+def test_top_players_route(client):
+    """Test category validation on the endpoint"""
+    assert client.get("/wpl/top-players/strike_rate").json() == []
+    assert client.get("/wpl/top-players/sixes").status_code == 400
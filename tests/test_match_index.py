@@ -0,0 +1,53 @@
+# tests/test_match_index.py
+from datetime import date
+
+import pandas as pd
+
+from app.utils.data_cleaner import WPLDataCleaner
+from app.utils.match_index import MatchIndex
+
+
+def _dashboard_frame():
+    cleaner = WPLDataCleaner()
+    df = cleaner.transform(pd.read_csv(cleaner.input_file))
+    df['date'] = pd.to_datetime(df['date'])
+    # Shuffle so the index has to sort
+    return df.sample(frac=1, random_state=0)
+
+
+def _masked(df, start, end, team, season=None):
+    mask = (df['date'].dt.date >= start) & (df['date'].dt.date <= end)
+    if team is not None:
+        mask &= (df['team1'] == team) | (df['team2'] == team)
+    if season is not None:
+        mask &= df['season'] == season
+    return df[mask]
+
+
+def test_index_filters_match_boolean_masks():
+    """Test date-range, team and season lookups through the index against full-frame masks"""
+    df = _dashboard_frame()
+    index = MatchIndex(df)
+
+    for start, end in [(date(2023, 3, 4), date(2024, 3, 17)), (date(2023, 3, 10), date(2023, 3, 20)),
+                       (date(2024, 2, 23), date(2024, 2, 23)), (date(2024, 3, 1), date(2023, 3, 1))]:
+        for team in [None, 'Mumbai Indians', 'UP Warriorz', 'Unknown XI']:
+            for season in [None, 2024, 2019]:
+                expected = _masked(df, start, end, team, season).sort_values('date', kind='stable')
+                actual = index.frame(start, end, team, season)
+                assert sorted(actual['match_result']) == sorted(expected['match_result'])
+                assert actual['date'].is_monotonic_increasing
+                assert index.summary(start, end, team, season).matches == len(expected)
+
+
+def test_summary_is_memoized():
+    """Test that repeated filter combinations are served from the LRU cache"""
+    index = MatchIndex(_dashboard_frame(), cache_size=2)
+    first = index.summary(index.min_date, index.max_date, None)
+
+    assert index.summary(index.min_date, index.max_date, None) is first
+    assert first.matches == 44
+    assert first.team_table['matches_played'].sum() == 88
+    index.summary(index.min_date, index.max_date, 'Delhi Capitals')
+    index.summary(index.min_date, index.max_date, 'Gujarat Giants')
+    assert index.summary.cache_info().currsize == 2
@@ -0,0 +1,117 @@
+# tests/test_matchups.py
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from app.utils.matchups import MATCHUP_COLUMNS, MatchupIndex
+from app.utils.processed_store import read_matches, write_matches
+from benchmarks.synthetic import matches
+from tests.conftest import _make_client
+from tests.test_wpl_import import MATCHES_CSV
+
+
+def _pair(df, team1, team2):
+    return df[((df['team1'] == team1) & (df['team2'] == team2)) | ((df['team1'] == team2) & (df['team2'] == team1))]
+
+
+def _assert_same(index, other):
+    for name in ('head_to_head', 'team_venue', 'team_toss'):
+        left, right = getattr(index, name), getattr(other, name)
+        t = [index.teams.index(team) for team in other.teams]
+        if name == 'team_toss':
+            np.testing.assert_array_equal(left[t], right)
+        else:
+            v = t if name == 'head_to_head' else [index.venues.index(venue) for venue in other.venues]
+            np.testing.assert_array_equal(left[np.ix_(t, v)], right)
+
+
+def test_index_matches_filtering_the_frame(processed_store):
+    """Test head-to-head, venue and toss records against filtering the matches directly"""
+    df = read_matches(processed_store, columns=MATCHUP_COLUMNS)
+    index = MatchupIndex.from_frame(df)
+
+    pair = _pair(df, 'Mumbai Indians', 'Delhi Capitals')
+    stats = index.head_to_head_stats('Mumbai Indians', 'Delhi Capitals')
+    assert stats['matches'] == len(pair)
+    assert stats['team1_record']['won'] == (pair['winner'] == 'Mumbai Indians').sum()
+    assert stats['team2_record']['won'] == (pair['winner'] == 'Delhi Capitals').sum()
+
+    venue = pair['venue'].iloc[0]
+    at_venue = index.head_to_head_stats('Mumbai Indians', 'Delhi Capitals', venue)
+    assert at_venue['matches'] == (pair['venue'] == venue).sum()
+
+    by_venue = index.venue_stats(venue=venue)
+    assert by_venue['matches'] == (df['venue'] == venue).sum()
+    team = index.venue_stats(team='Mumbai Indians')
+    played = df[(df['team1'] == 'Mumbai Indians') | (df['team2'] == 'Mumbai Indians')]
+    assert team['matches'] == len(played)
+    assert sum(v['played'] for v in team['venues']) == len(played)
+    won_toss = played[played['toss_winner'] == 'Mumbai Indians']
+    assert team['toss']['field']['played'] == (won_toss['toss_decision'] == 'field').sum()
+
+
+def test_season_update_equals_rebuild():
+    """Test that replacing and removing seasons gives the same index as building from scratch"""
+    df = matches(3000, seed=3)
+    index = MatchupIndex.from_frame(df)
+    season = index.seasons[-1]
+
+    # The latest season is re-cleaned with different results
+    changed = df[df['season'] == season].copy()
+    changed['winner'] = changed['team1']
+    updated = index.copy()
+    updated.update({season: changed}, removed=[index.seasons[0]])
+
+    rest = df[(df['season'] != season) & (df['season'] != index.seasons[0])]
+    expected = MatchupIndex.from_frame(pd.concat([rest, changed]))
+    _assert_same(updated, expected)
+    for team1, team2, venue in [('Team 01', 'Team 02', None), ('Team 03', 'Team 07', 'Venue 05')]:
+        assert updated.head_to_head_stats(team1, team2, venue) == expected.head_to_head_stats(team1, team2, venue)
+    # The copy leaves the original index untouched
+    _assert_same(index, MatchupIndex.from_frame(df))
+
+
+def test_matchup_routes_follow_store(tmp_path, write_buffer, processed_store):
+    """Test the routes' errors and that rewriting a season partition updates their answers"""
+    store = tmp_path / "wpl_clean.parquet"
+    shutil.copytree(processed_store, store)
+
+    with _make_client(lambda: None, write_buffer, store_path=store) as client:
+        params = {"team1": "Mumbai Indians", "team2": "Royal Challengers Bangalore"}
+        before = client.get("/wpl/head-to-head", params=params)
+        assert before.status_code == 200
+        assert before.json()["matches"] == 5
+        assert client.get("/wpl/head-to-head", params=params).headers["X-Cache"] == "HIT"
+
+        assert client.get("/wpl/head-to-head", params={**params, "team2": "Nobody"}).status_code == 404
+        assert client.get("/wpl/venue-stats").status_code == 400
+        assert client.get("/wpl/venue-stats", params={"venue": "Brabourne Stadium"}).json()["matches"] == 11
+
+        df = read_matches(store)
+        write_matches(df[df['season'] == 2024], store, source="Wpl 2023-2024")
+        after = client.get("/wpl/head-to-head", params=params)
+        assert after.headers["X-Cache"] == "MISS"
+        expected = _pair(df[df['season'] == 2024], *params.values())
+        assert after.json()["matches"] == len(expected)
+
+
+def test_matchup_routes_include_imported_matches(client):
+    """Test that matches from /wpl/import-data count once, alongside the store's copy of the same match"""
+    params = {"team1": "UP Warriorz", "team2": "Royal Challengers Bangalore"}
+    before = client.get("/wpl/head-to-head", params=params).json()
+
+    # The store already has the first match, listed the other way round; the second is new
+    csv = MATCHES_CSV.split("\n", 1)[0] + "\n" + "\n".join([
+        "2024/02/24,M Chinnaswamy Stadium,UP Warriorz,Royal Challengers Bangalore,Royal Challengers Bangalore,"
+        "S Asha,155,7,20.0,157,6,20.0",
+        "2025/02/20,Ekana Stadium,UP Warriorz,Royal Challengers Bangalore,UP Warriorz,DB Sharma,160,4,20.0,150,9,20.0",
+    ])
+    assert client.post("/wpl/import-data", files={"file": ("m.csv", csv, "text/csv")}).status_code == 200
+
+    after = client.get("/wpl/head-to-head", params=params)
+    assert after.headers["X-Cache"] == "MISS"
+    assert after.json()["matches"] == before["matches"] + 1
+    assert after.json()["team1_record"]["won"] == before["team1_record"]["won"] + 1
+    venue = client.get("/wpl/venue-stats", params={"venue": "Ekana Stadium", "team": "UP Warriorz"}).json()
+    assert venue["played"] == 1
@@ -0,0 +1,44 @@
+# tests/test_pagination.py
+import json
+
+from tests.test_queries import EXTRA_MATCHES
+from tests.test_wpl_import import MATCHES_CSV
+
+
+def test_keyset_pages_cover_table(client):
+    """Test walking /wpl/matches with after_id until the cursor runs out"""
+    client.post("/wpl/import-data", files={"file": ("m.csv", MATCHES_CSV + EXTRA_MATCHES.split("\n", 1)[1], "text/csv")})
+
+    ids, after_id = [], None
+    while True:
+        params = {"limit": 2}
+        if after_id is not None:
+            params["after_id"] = after_id
+        response = client.get("/wpl/matches", params=params)
+        ids += [row["id"] for row in response.json()]
+        after_id = response.headers.get("X-Next-After-Id")
+        if after_id is None:
+            break
+    assert ids == [1, 2, 3, 4, 5]
+
+
+def test_field_projection(client):
+    """Test that fields= selects only the requested columns plus id"""
+    client.post("/wpl/import-data", files={"file": ("m.csv", MATCHES_CSV, "text/csv")})
+    rows = client.get("/wpl/matches", params={"fields": "team1,winner"}).json()
+    assert rows[0] == {"id": 1, "team1": "Delhi Capitals", "winner": "Mumbai Indians"}
+    assert client.get("/wpl/matches", params={"fields": "team1,secret"}).status_code == 400
+
+
+def test_ndjson_stream(client):
+    """Test the NDJSON export of data points"""
+    for value in (1.5, 2.5, 3.5):
+        client.post("/data/", params={"value": value, "category": "runs", "source": "feed"})
+
+    response = client.get("/data/", params={"format": "ndjson", "after_id": 1, "fields": "value"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{"id": 2, "value": 2.5}, {"id": 3, "value": 3.5}]
+
+    full = client.get("/data/").json()
+    assert len(full) == 3 and "timestamp" in full[0]
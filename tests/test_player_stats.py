@@ -0,0 +1,181 @@
+# tests/test_player_stats.py
+import io
+import threading
+import time
+from collections import defaultdict
+
+import pandas as pd
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes.wpl_routes import get_deliveries_path
+from app.db import player_stats
+from app.db.models import WPLPlayerStats
+from app.db.player_stats import import_deliveries, rebuild_player_stats
+from app.utils.deliveries_store import normalise_deliveries, read_deliveries
+from app.utils.player_stats import BOWLER_WICKETS, COUNT_COLUMNS, NOT_OUT, player_counts, player_stats_table
+from benchmarks.synthetic import deliveries
+
+
+def naive_counts(df):
+    """One delivery at a time, the way a scorer would tally it"""
+    counts = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+    played = defaultdict(set)
+    for d in df.to_dict(orient='records'):
+        batter = (d['batter'], d['batting_team'])
+        bowler = (d['bowler'], d['bowling_team'])
+        counts[batter]['runs'] += d['runs']
+        counts[batter]['balls_faced'] += d['extra_type'] != 'wides'
+        counts[bowler]['balls_bowled'] += d['extra_type'] not in ('wides', 'noballs')
+        counts[bowler]['runs_conceded'] += d['runs'] + (d['extras'] if d['extra_type'] in ('wides', 'noballs') else 0)
+        counts[bowler]['wickets'] += d['dismissal'] in BOWLER_WICKETS
+        if d['player_dismissed'] is not None and d['dismissal'] not in NOT_OUT:
+            counts[(d['player_dismissed'], d['batting_team'])]['dismissals'] += 1
+        for player in (batter, (d['non_striker'], d['batting_team']), bowler):
+            played[player].add(d['match_id'])
+    for player, match_ids in played.items():
+        counts[player]['matches'] = len(match_ids)
+    return counts
+
+
+def stored_stats(db):
+    columns = [c.name for c in WPLPlayerStats.__table__.columns if c.name != 'id']
+    rows = db.query(WPLPlayerStats).all()
+    table = pd.DataFrame([{c: getattr(r, c) for c in columns} for r in rows], columns=columns)
+    return table.sort_values(['player_name', 'team']).reset_index(drop=True)
+
+
+def test_vectorized_counts_match_naive():
+    """Test the group reductions against a per-delivery tally, including the derived stats"""
+    df = normalise_deliveries(deliveries(6, seed=3))
+    counts = player_counts(df)
+    expected = naive_counts(df)
+    assert len(counts) == len(expected)
+    for (player, team), row in counts.iterrows():
+        assert row.to_dict() == expected[(player, team)]
+
+    stats = player_stats_table(counts).set_index(['player_name', 'team'])
+    for key, row in stats.iterrows():
+        c = expected[key]
+        assert row['strike_rate'] == round(c['runs'] * 100 / c['balls_faced'], 2)
+        if c['dismissals']:
+            assert row['batting_average'] == round(c['runs'] / c['dismissals'], 2)
+        else:
+            assert pd.isna(row['batting_average'])
+
+
+def test_incremental_import_matches_rebuild(db_session, tmp_path):
+    """Test that match-by-match imports, including a corrected match, equal a full rebuild"""
+    store = tmp_path / 'deliveries.parquet'
+    df = deliveries(5, seed=1)
+    for match_id in range(1, 6):
+        import_deliveries(db_session, df[df['match_id'] == match_id], store)
+
+    # A corrected scorecard for match 2 with a different bowler throughout the first over
+    corrected = df[df['match_id'] == 2].copy()
+    first_over = (corrected['innings'] == 1) & (corrected['over'] == 0)
+    corrected.loc[first_over, 'bowler'] = 'Substitute Bowler'
+    report = import_deliveries(db_session, corrected, store)
+    assert report.replaced == len(corrected)
+
+    incremental = stored_stats(db_session)
+    assert len(read_deliveries(store)) == len(df)
+    assert 'Substitute Bowler' in set(incremental['player_name'])
+
+    rebuild_player_stats(db_session, store)
+    db_session.commit()
+    pd.testing.assert_frame_equal(incremental, stored_stats(db_session))
+
+
+def test_import_deliveries_route_feeds_leaderboard(client, tmp_path):
+    """Test that importing a Cricsheet CSV twice is idempotent and drives the leaderboard"""
+    store = tmp_path / 'deliveries.parquet'
+    client.app.dependency_overrides[get_deliveries_path] = lambda: store
+    df = deliveries(3, seed=2)
+    cricsheet = df.rename(columns={'batter': 'striker', 'runs': 'runs_off_bat', 'dismissal': 'wicket_type'})
+    cricsheet['ball'] = cricsheet['over'].astype(str) + '.' + cricsheet['ball'].astype(str)
+    cricsheet['start_date'] = '2024-03-01'
+    for kind in ('wides', 'noballs', 'byes', 'legbyes'):
+        cricsheet[kind] = (cricsheet['extra_type'] == kind) * cricsheet['extras']
+    payload = cricsheet.drop(columns=['over', 'extras', 'extra_type', 'season']).to_csv(index=False)
+
+    for _ in range(2):
+        response = client.post("/wpl/import-deliveries", files={"file": ("d.csv", io.BytesIO(payload.encode()))})
+        assert response.status_code == 200
+    assert response.json()["replaced"] == len(df)
+    assert read_deliveries(store)['season'].unique().tolist() == [2024]
+
+    expected = player_stats_table(player_counts(normalise_deliveries(df)))
+    top = client.get("/wpl/top-players/runs", params={"limit": 1}).json()[0]
+    leaders = expected[expected['runs'] == expected['runs'].max()]
+    assert top["runs"] == leaders['runs'].iloc[0]
+    assert top["player_name"] in set(leaders['player_name'])
+
+
+def test_concurrent_imports_of_a_match_count_it_once(sqlite_engine, tmp_path, monkeypatch):
+    """Test that overlapping imports of the same match do not both subtract the same old copy"""
+    store = tmp_path / 'deliveries.parquet'
+    df = deliveries(1, seed=4)
+    corrected = df.copy()
+    corrected.loc[corrected['over'] == 0, 'bowler'] = 'Substitute Bowler'
+    Session = sessionmaker(bind=sqlite_engine)
+    with Session() as db:
+        import_deliveries(db, corrected, tmp_path / 'expected.parquet')
+        expected = stored_stats(db)
+        db.query(WPLPlayerStats).delete()
+        db.commit()
+        import_deliveries(db, df, store)
+
+    real_read = player_stats.read_deliveries
+    delays = [0.1, 0.6]
+
+    def slow_read(*args, **kwargs):
+        previous = real_read(*args, **kwargs)
+        # Unserialized, both imports read the old copy and the second applies its delta after the first commits
+        time.sleep(delays.pop(0))
+        return previous
+
+    monkeypatch.setattr(player_stats, 'read_deliveries', slow_read)
+
+    errors = []
+
+    def reimport():
+        with Session() as db:
+            try:
+                import_deliveries(db, corrected, store)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=reimport) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with Session() as db:
+        pd.testing.assert_frame_equal(stored_stats(db), expected)
+
+
+def test_failed_commit_leaves_the_store_unchanged(db_session, tmp_path, monkeypatch):
+    """Test that a deliveries import whose commit fails restores the previous store files"""
+    store = tmp_path / 'deliveries.parquet'
+    df = deliveries(2, seed=5)
+    import_deliveries(db_session, df[df['match_id'] == 1], store)
+    before, stats = read_deliveries(store), stored_stats(db_session)
+
+    corrected = df.copy()
+    corrected.loc[corrected['over'] == 0, 'bowler'] = 'Substitute Bowler'
+
+    def fail():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(db_session, 'commit', fail)
+    with pytest.raises(RuntimeError):
+        import_deliveries(db_session, corrected, store)
+    monkeypatch.undo()
+
+    pd.testing.assert_frame_equal(read_deliveries(store), before)
+    pd.testing.assert_frame_equal(stored_stats(db_session), stats)
+    # No staged or backup files are left behind
+    assert list(store.rglob('.*')) == []
@@ -0,0 +1,52 @@
+# tests/test_pool.py
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.database import to_async_url
+from app.db.pool import CHECKOUT_SECONDS, IN_USE, OVERFLOW, TIMEOUTS, engine_options, instrument_engine
+
+
+def test_engine_options_from_env(monkeypatch):
+    """Test that pool and timeout settings come from the environment"""
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "1")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    options = engine_options("postgresql://u:p@db/skye", "primary")
+    assert options["pool_size"] == 3 and options["max_overflow"] == 1
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    async_options = engine_options(to_async_url("postgresql://u:p@db/skye"), "primary", is_async=True)
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    assert "pool_size" not in engine_options("sqlite:///skye.db", "primary")
+
+
+def test_pool_metrics(monkeypatch, tmp_path):
+    """Test checkout timing, in-use, overflow and timeout metrics on a QueuePool"""
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "1")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0")
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    options = engine_options("postgresql://placeholder", "pooltest")
+    options.pop("connect_args", None)
+    engine = instrument_engine(create_engine(url, **options), "pooltest")
+
+    checkouts = CHECKOUT_SECONDS.count(pool="pooltest")
+    first = engine.connect()
+    second = engine.connect()
+    assert IN_USE.value(pool="pooltest") == 2
+    assert OVERFLOW.value(pool="pooltest") == 1
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    assert TIMEOUTS.value(pool="pooltest") == 1
+
+    first.execute(text("SELECT 1"))
+    first.close()
+    second.close()
+    assert IN_USE.value(pool="pooltest") == 0
+    assert CHECKOUT_SECONDS.count(pool="pooltest") - checkouts == 3
+    engine.dispose()
@@ -0,0 +1,92 @@
+# tests/test_processed_store.py
+import errno
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from app.utils import processed_store
+from app.utils.data_cleaner import WPLDataCleaner
+from app.utils.processed_store import SeasonPartitionWriter, read_matches, remove_source, write_matches
+
+
+def _clean_frame():
+    cleaner = WPLDataCleaner()
+    return cleaner.transform(pd.read_csv(cleaner.input_file))
+
+
+def test_round_trip_types_and_partitions(tmp_path):
+    """Test that the store keeps the cleaned data with typed columns, one directory per season"""
+    df = _clean_frame()
+    store = tmp_path / 'wpl_clean.parquet'
+    write_matches(df, store)
+
+    assert sorted(p.name for p in store.iterdir()) == ['season=2023', 'season=2024']
+    loaded = read_matches(store)
+    assert list(loaded.columns) == list(df.columns)
+    assert loaded['date'].dtype == 'datetime64[ns]'
+    assert loaded['is_home_win'].dtype == bool
+    for column in ('team1', 'venue', 'city', 'umpire1', 'match_referee'):
+        assert loaded[column].dtype == 'category'
+
+    expected = df.sort_values('season', kind='stable').reset_index(drop=True)
+    expected['date'] = pd.to_datetime(expected['date'])
+    actual = loaded.astype({c: object for c in loaded.select_dtypes('category').columns})
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_read_projects_columns_and_seasons(tmp_path):
+    """Test that reads return only the requested columns and seasons"""
+    df = _clean_frame()
+    store = tmp_path / 'wpl_clean.parquet'
+    write_matches(df, store)
+
+    loaded = read_matches(store, columns=['date', 'team1', 'season'], seasons=[2024])
+    assert list(loaded.columns) == ['date', 'team1', 'season']
+    assert len(loaded) == (df['season'] == 2024).sum()
+    assert set(loaded['season']) == {2024}
+
+
+def test_failed_write_keeps_previous_store(tmp_path):
+    """Test that an error while writing leaves the existing store untouched"""
+    df = _clean_frame()
+    store = tmp_path / 'wpl_clean.parquet'
+    write_matches(df, store)
+
+    try:
+        with SeasonPartitionWriter(store) as writer:
+            writer.write(df.head(3))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert len(read_matches(store)) == len(df)
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith('.tmp')]
+
+
+def test_parallel_sources_survive_season_directory_races(tmp_path, monkeypatch):
+    """Test that publishing retries when the season directory vanishes and removal ignores a busy one"""
+    df = _clean_frame()
+    store = tmp_path / 'wpl_clean.parquet'
+    write_matches(df[df['season'] == 2023], store, source='old')
+
+    real_replace = os.replace
+    raced = []
+
+    def replace_after_rmdir(src, dst):
+        # Another worker's remove_source empties and removes the directory just after our mkdir
+        if not raced:
+            raced.append(dst)
+            Path(dst).parent.rmdir()
+        real_replace(src, dst)
+
+    monkeypatch.setattr(processed_store.os, 'replace', replace_after_rmdir)
+    assert write_matches(df[df['season'] == 2024], store, source='new') == {2024}
+    assert raced
+
+    def busy(self):
+        raise OSError(errno.ENOTEMPTY, "Directory not empty", str(self))
+
+    monkeypatch.setattr(Path, 'rmdir', busy)
+    assert remove_source(store, 'old') == {2023}
+    assert set(read_matches(store)['season']) == {2024}
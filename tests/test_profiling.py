@@ -0,0 +1,73 @@
+# tests/test_profiling.py
+import time
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.metrics import REGISTRY
+from app.profiling import (
+    DB_QUERIES,
+    DB_ROWS,
+    REQUEST_SECONDS,
+    SERIALIZE_SECONDS,
+    ProfiledRoute,
+    ProfilingMiddleware,
+)
+from tests.test_cache import upload
+from tests.test_wpl_import import MATCHES_CSV
+
+
+def test_request_metrics_per_route(client):
+    """Test latency, SQL count, rows and serialization recorded under the route template"""
+    upload(client, MATCHES_CSV)
+    route = "/wpl/team-stats"
+    requests, queries, rows = (REQUEST_SECONDS.count(method="GET", route=route),
+                               DB_QUERIES.sum(route=route), DB_ROWS.sum(route=route))
+
+    response = client.get(route, params={"method": "python"})
+    assert response.status_code == 200
+    assert REQUEST_SECONDS.count(method="GET", route=route) == requests + 1
+    assert DB_QUERIES.sum(route=route) > queries
+    # The Python fallback hydrates every match
+    assert DB_ROWS.sum(route=route) - rows >= 3
+    assert SERIALIZE_SECONDS.count(route=route) >= 1
+
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=") and "serialize;dur=" in timing
+
+    # Path parameters are labelled by template, not value
+    client.get("/wpl/top-players/runs")
+    assert REQUEST_SECONDS.count(method="GET", route="/wpl/top-players/{category}") >= 1
+    rendered = REGISTRY.render()
+    assert 'http_requests_total{method="GET",route="/wpl/team-stats",status="200"}' in rendered
+    assert 'http_request_db_rows_bucket{route="/wpl/team-stats",le="+Inf"}' in rendered
+
+
+def _busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_header_triggered_profile(tmp_path):
+    """Test that only requests with the right token are profiled, into folded stacks"""
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/slow")
+    def slow():
+        _busy_wait(0.1)
+        return {"done": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ProfilingMiddleware, profile_token="secret", profile_dir=tmp_path, profile_interval=0.001)
+    client = TestClient(app)
+
+    assert "X-Profile" not in client.get("/slow").headers
+    assert "X-Profile" not in client.get("/slow", headers={"X-Profile": "wrong"}).headers
+
+    response = client.get("/slow", headers={"X-Profile": "secret"})
+    profile = (tmp_path / response.headers["X-Profile"]).read_text()
+    lines = profile.splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("tests.test_profiling:_busy_wait" in line for line in lines)
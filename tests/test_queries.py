@@ -0,0 +1,49 @@
+# tests/test_queries.py
+import io
+from datetime import date
+
+from app.db.queries import team_stats_python, team_stats_query
+from app.db.wpl_import import import_matches
+from tests.test_wpl_import import MATCHES_CSV
+
+EXTRA_MATCHES = """date,venue,team1,team2,winner,player_of_match,team1_score,team1_wickets,team1_overs,team2_score,team2_wickets,team2_overs
+2023/03/04,Dr DY Patil Sports Academy,Mumbai Indians,Gujarat Giants,Mumbai Indians,H Kaur,207,5,20.0,64,9,15.4
+2023/03/05,Brabourne Stadium,Delhi Capitals,Royal Challengers Bangalore,Delhi Capitals,M Lanning,223,2,20.0,163,8,20.0
+"""
+
+
+def load(db):
+    import_matches(db, io.StringIO(MATCHES_CSV))
+    import_matches(db, io.StringIO(EXTRA_MATCHES))
+
+
+def test_sql_matches_python(db_session):
+    """Test that the SQL aggregation agrees with the Python fallback"""
+    load(db_session)
+    assert team_stats_query(db_session) == team_stats_python(db_session)
+    assert team_stats_query(db_session)['Mumbai Indians'] == {
+        'matches': 3, 'wins': 3, 'losses': 0, 'total_runs': 509, 'total_wickets': 23,
+    }
+
+
+def test_filters(db_session):
+    """Test season, venue and date filters"""
+    load(db_session)
+    season = team_stats_query(db_session, season=2023)
+    assert set(season) == {
+        'Mumbai Indians', 'Gujarat Giants', 'Delhi Capitals', 'Royal Challengers Bangalore',
+    }
+    assert team_stats_query(db_session, venue='Brabourne Stadium') == team_stats_python(
+        db_session, venue='Brabourne Stadium'
+    )
+    recent = team_stats_query(db_session, start_date=date(2024, 2, 24), end_date=date(2024, 2, 24))
+    assert set(recent) == {'UP Warriorz', 'Royal Challengers Bangalore'}
+
+
+def test_team_stats_route(client):
+    """Test that both methods return the same JSON"""
+    client.post("/wpl/import-data", files={"file": ("m.csv", MATCHES_CSV, "text/csv")})
+    sql = client.get("/wpl/team-stats").json()
+    python = client.get("/wpl/team-stats", params={"method": "python"}).json()
+    assert sql == python
+    assert client.get("/wpl/team-stats", params={"method": "numpy"}).status_code == 422
@@ -0,0 +1,72 @@
+# tests/test_rollups.py
+from datetime import datetime
+
+from app.db.models import DataPoint, DataPointRollup
+from app.db.rollups import rebuild_rollups, rollup_query
+
+POINTS = [
+    {"value": 4, "category": "runs", "source": "feed", "timestamp": "2024-03-01T19:30:10+00:00"},
+    {"value": 6, "category": "runs", "source": "feed", "timestamp": "2024-03-01T19:30:50+00:00"},
+    {"value": 1, "category": "runs", "source": "feed", "timestamp": "2024-03-01T20:05:00+00:00"},
+    {"value": 2, "category": "runs", "source": "other", "timestamp": "2024-03-01T20:10:00+00:00"},
+    # 21:15 in +05:30 is 15:45 UTC
+    {"value": 1, "category": "wickets", "source": "feed", "timestamp": "2024-03-01T21:15:00+05:30"},
+]
+
+
+def test_rollup_matches_raw(client):
+    """Test that the maintained rollups agree with a raw scan at every resolution"""
+    client.post("/data/batch", json=POINTS[:3])
+    client.post("/data/batch", json=POINTS[3:])
+
+    for bucket in ("minute", "hour", "day"):
+        for params in ({}, {"category": "runs"}, {"category": "runs", "source": "feed"}):
+            params = dict(params, bucket=bucket)
+            rollup = client.get("/data/rollup", params=params).json()
+            raw = client.get("/data/rollup", params=dict(params, method="raw")).json()
+            assert rollup == raw, params
+
+    hourly = client.get("/data/rollup", params={"bucket": "hour", "category": "runs", "source": "feed"}).json()
+    assert hourly == [
+        {"bucket": "2024-03-01T19:00:00", "count": 2, "sum": 10.0, "min": 4.0, "max": 6.0, "avg": 5.0},
+        {"bucket": "2024-03-01T20:00:00", "count": 1, "sum": 1.0, "min": 1.0, "max": 1.0, "avg": 1.0},
+    ]
+    wickets = client.get("/data/rollup", params={"bucket": "hour", "category": "wickets"}).json()
+    assert wickets[0]["bucket"] == "2024-03-01T15:00:00"
+
+
+def test_range_filter(client):
+    """Test start/end filtering on bucket boundaries"""
+    client.post("/data/batch", json=POINTS)
+    params = {"bucket": "minute", "category": "runs", "start": "2024-03-01T19:30:30", "end": "2024-03-01T20:06:00"}
+    rows = client.get("/data/rollup", params=params).json()
+    assert [r["bucket"] for r in rows] == ["2024-03-01T19:30:00", "2024-03-01T20:05:00"]
+    assert rows == client.get("/data/rollup", params=dict(params, method="raw")).json()
+
+
+def test_range_inside_a_bucket(client):
+    """Test that an end inside a bucket returns that whole bucket from both methods"""
+    client.post("/data/batch", json=POINTS)
+    for bucket in ("minute", "hour", "day"):
+        for end in ("2024-03-01T19:30:20", "2024-03-01T20:05:00", "2024-03-01T19:00:00"):
+            params = {"bucket": bucket, "category": "runs", "start": "2024-03-01T19:30:30", "end": end}
+            rollup = client.get("/data/rollup", params=params).json()
+            assert rollup == client.get("/data/rollup", params=dict(params, method="raw")).json(), params
+
+    params = {"bucket": "hour", "category": "runs", "source": "feed", "end": "2024-03-01T19:30:20"}
+    for method in ("rollup", "raw"):
+        rows = client.get("/data/rollup", params=dict(params, method=method)).json()
+        assert [(r["bucket"], r["count"]) for r in rows] == [("2024-03-01T19:00:00", 2)]
+
+
+def test_single_post_and_rebuild(client, db_session):
+    """Test that single posts update rollups and that a rebuild reproduces them"""
+    client.post("/data/", params={"value": 3, "category": "runs", "source": "feed"})
+    db_session.add(DataPoint(value=5, category="runs", source="feed", timestamp=datetime(2024, 1, 1, 9, 0)))
+    db_session.commit()
+    assert sum(r["count"] for r in rollup_query(db_session, "day")) == 1
+
+    rebuild_rollups(db_session)
+    db_session.commit()
+    assert sum(r["count"] for r in rollup_query(db_session, "day")) == 2
+    assert db_session.query(DataPointRollup).filter_by(resolution="minute").count() == 2
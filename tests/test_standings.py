@@ -0,0 +1,100 @@
+# tests/test_standings.py
+import io
+from datetime import date
+
+import pandas as pd
+
+from app.db.models import WPLMatch, WPLStanding
+from app.db.standings import innings_balls, read_standings, refresh_standings
+from app.db.wpl_import import import_matches
+from app.utils.standings import standings_from_frame
+from benchmarks.synthetic import import_matches as synthetic_matches
+from tests.test_queries import EXTRA_MATCHES
+from tests.test_wpl_import import MATCHES_CSV
+
+
+def _snapshots(db):
+    columns = [c for c in WPLStanding.__table__.columns.keys() if c != 'id']
+    return sorted(tuple(getattr(row, c) for c in columns) for row in db.query(WPLStanding))
+
+
+def test_points_net_run_rate_and_form(db_session):
+    """Test a season's table against figures worked out by hand"""
+    import_matches(db_session, io.StringIO(MATCHES_CSV))
+    import_matches(db_session, io.StringIO(EXTRA_MATCHES))
+
+    table = read_standings(db_session)
+    assert table['season'] == 2024 and table['as_of'] == date(2024, 2, 25)
+    first = table['standings'][0]
+    assert (first['team'], first['played'], first['won'], first['points'], first['form']) == (
+        'Mumbai Indians', 2, 2, 4, 'WW')
+    # 173/6 in 20 and 129/5 in 18.1 overs against 171 and 126 in 20 overs
+    assert first['net_run_rate'] == round((173 + 129) * 6 / (120 + 109) - (171 + 126) * 6 / 240, 3)
+    assert [row['team'] for row in table['standings']][-1] == 'Gujarat Giants'
+
+    # 15.4 overs is 94 balls; a side bowled out is charged all 120
+    earlier = read_standings(db_session, 2023)
+    giants = next(row for row in earlier['standings'] if row['team'] == 'Gujarat Giants')
+    assert giants['net_run_rate'] == round(64 * 6 / 94 - 207 * 6 / 120, 3)
+    assert innings_balls(15.4, 10) == 120 and innings_balls(18.1, 5) == 109
+
+    as_of = read_standings(db_session, as_of=date(2024, 2, 24))
+    assert as_of['as_of'] == date(2024, 2, 24)
+    assert [(row['team'], row['points']) for row in as_of['standings'][:2]] == [
+        ('Mumbai Indians', 2), ('Royal Challengers Bangalore', 2)]
+    assert read_standings(db_session, as_of=date(2024, 1, 1))['standings'] == []
+
+
+def test_incremental_updates_equal_rebuild(db_session):
+    """Test that batch-by-batch, out-of-order and updating imports leave the same snapshots as a rebuild"""
+    df = synthetic_matches(1200, seed=5)
+    shuffled = df.sample(frac=1, random_state=1)
+    import_matches(db_session, io.StringIO(shuffled.to_csv(index=False)), batch_size=97)
+    # Re-import a later stretch with every result flipped
+    changed = df.iloc[700:760].copy()
+    changed['winner'] = changed['team2']
+    import_matches(db_session, io.StringIO(changed.to_csv(index=False)), batch_size=25)
+
+    incremental = _snapshots(db_session)
+    refresh_standings(db_session)
+    assert _snapshots(db_session) == incremental
+
+    # Reading a season that has no snapshots replays it without writing
+    season = df['date'].str[:4].astype(int).max()
+    expected = read_standings(db_session, int(season))
+    db_session.query(WPLStanding).delete()
+    assert read_standings(db_session, int(season)) == expected
+    assert db_session.query(WPLStanding).count() == 0
+
+
+def test_standings_route(client, db_session):
+    """Test the route's as-of lookup and that imports invalidate its cached responses"""
+    client.post("/wpl/import-data", files={"file": ("m.csv", MATCHES_CSV, "text/csv")})
+    response = client.get("/wpl/standings", params={"as_of": "2024-02-23"})
+    assert response.json()["as_of"] == "2024-02-23"
+    assert [row["team"] for row in response.json()["standings"]] == ["Mumbai Indians", "Delhi Capitals"]
+    assert client.get("/wpl/standings", params={"as_of": "2024-02-23"}).headers["X-Cache"] == "HIT"
+
+    later = MATCHES_CSV + "2024/02/26,Arun Jaitley Stadium,Delhi Capitals,UP Warriorz,,,,,,,,\n"
+    client.post("/wpl/import-data", files={"file": ("m.csv", later, "text/csv")})
+    latest = client.get("/wpl/standings").json()
+    assert latest["as_of"] == "2024-02-26"
+    capitals = next(row for row in latest["standings"] if row["team"] == "Delhi Capitals")
+    assert (capitals["no_result"], capitals["points"], capitals["form"]) == (1, 1, "LN")
+    assert db_session.query(WPLMatch).count() == 4
+
+
+def test_table_from_a_match_frame_matches_the_database(db_session):
+    """Test the dashboard's database-free table against read_standings, with and without scores"""
+    import_matches(db_session, io.StringIO(MATCHES_CSV))
+    import_matches(db_session, io.StringIO(EXTRA_MATCHES))
+    frame = pd.concat([pd.read_csv(io.StringIO(csv)) for csv in (MATCHES_CSV, EXTRA_MATCHES)])
+
+    for season, as_of in ((None, None), (2023, None), (None, date(2024, 2, 24))):
+        assert standings_from_frame(frame, season, as_of) == read_standings(db_session, season, as_of)
+
+    unscored = standings_from_frame(frame[['date', 'team1', 'team2', 'winner']])
+    expected = read_standings(db_session)
+    assert {row['team']: (row['points'], row['form']) for row in unscored['standings']} == {
+        row['team']: (row['points'], row['form']) for row in expected['standings']}
+    assert {row['net_run_rate'] for row in unscored['standings']} == {None}
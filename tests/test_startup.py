@@ -0,0 +1,103 @@
+# tests/test_startup.py
+import pytest
+from sqlalchemy import create_engine, func, inspect
+from sqlalchemy.orm import Session
+
+from app.db.models import WPLPlayerStats
+from app.db.player_stats import import_deliveries
+from app.db.schema import SchemaUpgradeError, upgrade_schema
+from benchmarks.startup import probe
+from benchmarks.synthetic import deliveries
+
+
+def test_app_starts_without_database_or_pandas(tmp_path):
+    """Test that importing and serving app.main neither connects to the database nor loads pandas"""
+    database = tmp_path / 'never.db'
+    result = probe(f"sqlite:///{database}", 'first_response')
+    assert result['heavy'] == []
+    assert not database.exists()
+
+
+def test_upgrade_schema_adds_new_columns_and_keys(tmp_path):
+    """Test upgrading a wpl_player_stats table created before the deliveries columns existed"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE wpl_player_stats (id INTEGER PRIMARY KEY, player_name VARCHAR, team VARCHAR, "
+            "matches INTEGER, runs INTEGER, wickets INTEGER, batting_average FLOAT, bowling_average FLOAT, "
+            "strike_rate FLOAT, economy_rate FLOAT)"
+        )
+        conn.exec_driver_sql("INSERT INTO wpl_player_stats (player_name, team, runs) VALUES ('A', 'T', 10)")
+
+    applied = upgrade_schema(engine)
+    assert len([s for s in applied if not s.startswith("CREATE INDEX")]) == 5
+    columns = {c['name'] for c in inspect(engine).get_columns('wpl_player_stats')}
+    assert {'balls_faced', 'dismissals', 'balls_bowled', 'runs_conceded'} <= columns
+    assert 'wpl_matches' in inspect(engine).get_table_names()
+    assert upgrade_schema(engine) == []
+
+    # The upgraded table takes the upserts deliveries imports rely on
+    with Session(engine) as db:
+        import_deliveries(db, deliveries(1), tmp_path / 'deliveries.parquet')
+        assert db.query(func.count(WPLPlayerStats.id)).scalar() > 1
+    engine.dispose()
+
+
+def test_upgrade_schema_adds_missing_indexes(tmp_path):
+    """Test that tables created before their lookup indexes existed gain them, and only them"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE data_points (id INTEGER PRIMARY KEY, timestamp DATETIME, value FLOAT, "
+            "category VARCHAR, source VARCHAR)"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_data_points_id ON data_points (id)")
+        conn.exec_driver_sql(
+            "CREATE TABLE wpl_matches (id INTEGER PRIMARY KEY, match_date DATE, venue VARCHAR, team1 VARCHAR, "
+            "team2 VARCHAR, winner VARCHAR)"
+        )
+
+    applied = upgrade_schema(engine)
+    assert "CREATE INDEX ix_data_points_category_source_timestamp ON data_points (category, source, timestamp)" in applied
+    assert "CREATE INDEX ix_wpl_matches_venue ON wpl_matches (venue)" in applied
+    assert not any(s.startswith("CREATE INDEX ix_data_points_id") for s in applied)
+
+    indexes = {
+        table: {i['name'] for i in inspect(engine).get_indexes(table)} for table in ('data_points', 'wpl_matches')
+    }
+    assert {'ix_data_points_id', 'ix_data_points_category_source_timestamp'} <= indexes['data_points']
+    assert {'ix_wpl_matches_venue', 'ix_wpl_matches_source', 'uq_wpl_match_key'} <= indexes['wpl_matches']
+    assert upgrade_schema(engine) == []
+    engine.dispose()
+
+
+def test_upgrade_schema_reports_then_dedupes_duplicate_keys(tmp_path):
+    """Test that duplicate matches skip only their unique key until deduped, keeping the newest row"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE wpl_matches (id INTEGER PRIMARY KEY, match_date DATE, venue VARCHAR, team1 VARCHAR, "
+            "team2 VARCHAR, winner VARCHAR)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO wpl_matches (match_date, team1, team2, winner) VALUES "
+            "('2024-02-23', 'A', 'B', 'A'), ('2024-02-23', 'A', 'B', 'B'), ('2024-02-24', 'C', 'D', 'C'), "
+            "(NULL, 'A', 'B', NULL), (NULL, 'A', 'B', NULL)"
+        )
+
+    with pytest.raises(SchemaUpgradeError) as raised:
+        upgrade_schema(engine)
+    assert raised.value.skipped == [
+        "CREATE UNIQUE INDEX uq_wpl_match_key ON wpl_matches (match_date, team1, team2) (1 duplicate rows)"
+    ]
+    # The other statements still committed
+    columns = {c['name'] for c in inspect(engine).get_columns('wpl_matches')}
+    assert {'team1_score', 'team2_overs', 'player_of_match'} <= columns
+
+    applied = upgrade_schema(engine, dedupe=True)
+    assert applied[0].startswith("DELETE FROM wpl_matches")
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("SELECT match_date, winner FROM wpl_matches ORDER BY id").fetchall()
+    assert rows == [('2024-02-23', 'B'), ('2024-02-24', 'C'), (None, None), (None, None)]
+    assert upgrade_schema(engine) == []
+    engine.dispose()
@@ -0,0 +1,65 @@
+# tests/test_summary.py
+import io
+
+import pytest
+
+from app.db.models import MatchSummary, WPLMatch
+from app.db.summary import read_match_analysis, refresh_summary, stream_match_analysis
+from app.db.wpl_import import import_matches
+from tests.test_queries import EXTRA_MATCHES
+from tests.test_wpl_import import MATCHES_CSV
+
+
+def test_empty_analysis(db_session):
+    """Test that an empty match table no longer divides by zero"""
+    analysis = read_match_analysis(db_session)
+    assert analysis["total_matches"] == 0
+    assert analysis["average_first_innings_score"] is None
+    assert stream_match_analysis(db_session) == analysis
+
+
+def test_incremental_summary_matches_stream(db_session):
+    """Test that the summary maintained by imports equals a full scan"""
+    import_matches(db_session, io.StringIO(MATCHES_CSV))
+    import_matches(db_session, io.StringIO(EXTRA_MATCHES), batch_size=1)
+
+    analysis = read_match_analysis(db_session)
+    assert analysis == stream_match_analysis(db_session, batch_size=2)
+    assert analysis["total_matches"] == 5
+    assert analysis["highest_score"] == 223
+    assert analysis["average_first_innings_score"] == (171 + 155 + 126 + 207 + 223) / 5
+    assert db_session.query(MatchSummary).count() == 1
+
+
+def test_reimport_refreshes_summary(db_session):
+    """Test that updating existing matches rebuilds the summary"""
+    import_matches(db_session, io.StringIO(MATCHES_CSV))
+    import_matches(db_session, io.StringIO(MATCHES_CSV.replace("S Sajana", "H Kaur")))
+
+    analysis = read_match_analysis(db_session)
+    assert analysis["total_matches"] == 3
+    assert "S Sajana" not in analysis["players_of_match"]
+    assert analysis == stream_match_analysis(db_session)
+
+
+def test_summary_built_on_first_read(db_session):
+    """Test that matches written outside the importer are picked up lazily"""
+    db_session.add(WPLMatch(team1="A", team2="B", venue="V", team1_score=100, team2_score=90))
+    db_session.commit()
+    assert read_match_analysis(db_session)["total_matches"] == 1
+    refresh_summary(db_session)
+    assert read_match_analysis(db_session)["venues"] == ["V"]
+
+
+def test_failed_import_keeps_summary_of_committed_batches(db_session):
+    """Test that batches updating matches refresh the summary before a later batch fails"""
+    import_matches(db_session, io.StringIO(MATCHES_CSV))
+    header, first, rest = MATCHES_CSV.split("\n", 2)
+    broken = f"{header}\n{first.replace('S Sajana', 'H Kaur')}\n{rest}2024/13/45,Nowhere,A,B\n"
+    with pytest.raises(Exception):
+        import_matches(db_session, io.StringIO(broken), batch_size=1)
+    db_session.rollback()
+
+    analysis = read_match_analysis(db_session)
+    assert "S Sajana" not in analysis["players_of_match"]
+    assert analysis == stream_match_analysis(db_session)
@@ -0,0 +1,96 @@
+# tests/test_win_model.py
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from app.api.predict import WinModelSource
+from app.utils.processed_store import read_matches, write_matches
+from app.utils.win_model import MODEL_COLUMNS, WinModel, data_version, load_or_train, model_path
+from benchmarks.synthetic import matches
+from tests.conftest import _make_client
+
+
+def _fixtures(df):
+    return {c: df[c].astype(object).tolist() for c in ('team1', 'team2', 'venue', 'toss_winner', 'toss_decision')}
+
+
+def test_model_is_symmetric_and_batches_match_singles():
+    """Test that swapping sides complements the probability and a batch equals one call per fixture"""
+    df = matches(2000, seed=7)
+    # Team 00 wins every match it plays
+    plays = (df['team1'] == 'Team 00') | (df['team2'] == 'Team 00')
+    df.loc[plays, 'winner'] = 'Team 00'
+    model = WinModel.from_frame(df)
+    assert model.matches == df['winner'].notna().sum()
+
+    fixtures = _fixtures(df.head(50))
+    batch = model.predict(fixtures)
+    singles = [model.predict({c: values[i:i + 1] for c, values in fixtures.items()})[0] for i in range(50)]
+    np.testing.assert_allclose(batch, singles)
+    swapped = {**fixtures, 'team1': fixtures['team2'], 'team2': fixtures['team1']}
+    np.testing.assert_allclose(model.predict(swapped), 1 - batch)
+
+    favourite = model.predict({'team1': ['Team 00'] * 9, 'team2': [f'Team {i:02d}' for i in range(1, 10)]})
+    assert (favourite > 0.9).all()
+    # Unseen venues and missing toss details are neutral rather than errors
+    neutral = model.predict({'team1': ['Team 01'], 'team2': ['Team 01'], 'venue': ['Nowhere']})
+    assert neutral[0] == pytest.approx(0.5)
+    with pytest.raises(ValueError, match="Nobody"):
+        model.predict({'team1': ['Team 01'], 'team2': ['Nobody']})
+
+
+def test_saved_model_follows_the_manifest(tmp_path, processed_store):
+    """Test that the model is saved per data version and retrained when the manifest changes"""
+    store = tmp_path / "processed" / "wpl_clean.parquet"
+    shutil.copytree(processed_store, store)
+    manifest = store.parent / "manifest.json"
+    shutil.copy(processed_store.parent / "manifest.json", manifest)
+    model_dir = tmp_path / "models"
+
+    first = load_or_train(store, model_dir)
+    assert model_path(model_dir, first.version).exists()
+    assert load_or_train(store, model_dir).matches == first.matches
+
+    data = json.loads(manifest.read_text())
+    for entry in data['files'].values():
+        entry['sha256'] = '0' * 64
+    manifest.write_text(json.dumps(data))
+    second = load_or_train(store, model_dir)
+    assert second.version == data_version(store) != first.version
+    assert [p.name for p in model_dir.iterdir()] == [model_path(model_dir, second.version).name]
+
+
+def test_predict_route(tmp_path, write_buffer, processed_store):
+    """Test batch predictions over JSON and CSV bodies, their errors, and reloading after a store rewrite"""
+    store = tmp_path / "wpl_clean.parquet"
+    shutil.copytree(processed_store, store)
+    fixtures = [
+        {"team1": "Mumbai Indians", "team2": "Delhi Capitals", "venue": "Brabourne Stadium",
+         "toss_winner": "Mumbai Indians", "toss_decision": "field"},
+        {"team1": "Delhi Capitals", "team2": "Mumbai Indians"},
+    ]
+
+    with _make_client(lambda: None, write_buffer, store_path=store) as client:
+        response = client.post("/wpl/predict", json=fixtures)
+        assert response.status_code == 200
+        body = response.json()
+        local = WinModel.from_frame(read_matches(store, columns=MODEL_COLUMNS))
+        expected = local.predict({c: [f.get(c) for f in fixtures] for c in fixtures[0]})
+        assert body["team1_win_probability"] == np.round(expected, 4).tolist()
+
+        # An empty CSV field is treated like a missing one
+        csv = "team1,team2,venue\nMumbai Indians,Delhi Capitals,\n"
+        from_csv = client.post("/wpl/predict", content=csv, headers={"content-type": "text/csv"}).json()
+        plain = local.predict({"team1": ["Mumbai Indians"], "team2": ["Delhi Capitals"]})
+        assert from_csv["team1_win_probability"] == np.round(plain, 4).tolist()
+        assert client.post("/wpl/predict", json=[{"team1": "Mumbai Indians"}]).status_code == 422
+        assert client.post("/wpl/predict", json=[{"team1": "Mumbai Indians", "team2": "Nobody"}]).status_code == 422
+
+        df = read_matches(store)
+        write_matches(df[df['season'] == 2024], store, source="Wpl 2023-2024")
+        reloaded = client.post("/wpl/predict", json=fixtures).json()
+        assert reloaded["model_version"] != body["model_version"]
+
+    assert WinModelSource(store).get().version == reloaded["model_version"]
@@ -0,0 +1,149 @@
+# tests/test_wpl_import.py
+import io
+
+import pandas as pd
+
+from app.api.cache import WPL_NAMESPACE, get_response_cache
+from app.api.routes.wpl_routes import get_import_dir
+from app.db.models import MatchSummary, WPLMatch, WPLStanding
+from app.db.wpl_import import import_matches, import_seasons, sync_clean_report
+from app.utils.data_cleaner import WPLDataCleaner
+from app.utils.processed_store import write_matches
+
+MATCHES_CSV = """date,venue,team1,team2,winner,player_of_match,team1_score,team1_wickets,team1_overs,team2_score,team2_wickets,team2_overs
+2024/02/23,M Chinnaswamy Stadium,Delhi Capitals,Mumbai Indians,Mumbai Indians,S Sajana,171,5,20.0,173,6,20.0
+2024/02/24,M Chinnaswamy Stadium,UP Warriorz,Royal Challengers Bangalore,Royal Challengers Bangalore,S Asha,155,7,20.0,157,6,20.0
+2024/02/25,M Chinnaswamy Stadium,Gujarat Giants,Mumbai Indians,Mumbai Indians,AC Kerr,126,9,20.0,129,5,18.1
+"""
+
+
+def test_import_reports_batches(db_session):
+    """Test that the importer streams in batches and reports timings"""
+    report = import_matches(db_session, io.StringIO(MATCHES_CSV), batch_size=2)
+
+    assert report.rows == 3
+    assert [b.rows for b in report.batches] == [2, 1]
+    assert report.to_dict()["inserted"] == 3
+    assert db_session.query(WPLMatch).count() == 3
+
+
+def test_reimport_upserts(db_session):
+    """Test that re-running an import updates rows instead of duplicating them"""
+    import_matches(db_session, io.StringIO(MATCHES_CSV))
+    changed = MATCHES_CSV.replace("S Sajana", "H Kaur")
+    report = import_matches(db_session, io.StringIO(changed))
+
+    assert report.to_dict()["updated"] == 3
+    assert db_session.query(WPLMatch).count() == 3
+    match = db_session.query(WPLMatch).filter_by(team1="Delhi Capitals").one()
+    assert match.player_of_match == "H Kaur"
+    assert match.team1_score == 171
+
+
+def test_import_route_accepts_upload(client):
+    """Test the import endpoint with an uploaded file"""
+    response = client.post(
+        "/wpl/import-data",
+        files={"file": ("matches.csv", MATCHES_CSV, "text/csv")},
+    )
+    assert response.status_code == 200
+    assert response.json()["rows"] == 3
+
+    missing = client.post("/wpl/import-data", params={"path": "does-not-exist.csv"})
+    assert missing.status_code == 404
+
+
+def test_import_route_defaults_to_the_raw_file(client):
+    """Test that importing with neither a file nor a path reads the bundled raw file"""
+    response = client.post("/wpl/import-data")
+    assert response.status_code == 200
+    assert response.json()["rows"] == 44
+
+
+def test_import_paths_stay_inside_the_data_directory(client, tmp_path):
+    """Test that server-side paths cannot leave the data directory and failures do not echo the file"""
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'matches.csv').write_text(MATCHES_CSV)
+    (data_dir / 'broken.csv').write_text('date,team1\n"secret value,unclosed\n')
+    (tmp_path / 'outside.csv').write_text(MATCHES_CSV)
+    client.app.dependency_overrides[get_import_dir] = lambda: data_dir
+
+    assert client.post("/wpl/import-data", params={"path": "matches.csv"}).json()["rows"] == 3
+    for path in ("../outside.csv", str(tmp_path / 'outside.csv'), "/etc/passwd"):
+        for route in ("/wpl/import-data", "/wpl/import-deliveries"):
+            assert client.post(route, params={"path": path}).status_code == 403, (route, path)
+
+    broken = client.post("/wpl/import-data", params={"path": "broken.csv"})
+    assert broken.status_code == 500
+    assert broken.json() == {"detail": "Import failed"}
+
+
+def test_import_seasons_reads_only_changed_partitions(db_session, tmp_path):
+    """Test importing selected seasons from the processed store, keeping columns it lacks"""
+    cleaner = WPLDataCleaner()
+    clean = cleaner.transform(pd.read_csv(cleaner.input_file))
+    store = tmp_path / 'wpl_clean.parquet'
+    write_matches(clean, store)
+
+    first = clean[clean['season'] == 2024].iloc[0]
+    db_session.add(WPLMatch(match_date=first['date'], team1=first['team1'], team2=first['team2'], team1_score=180))
+    db_session.commit()
+
+    report = import_seasons(db_session, {2024}, store)
+
+    assert report.rows == (clean['season'] == 2024).sum()
+    assert db_session.query(WPLMatch).count() == report.rows
+    match = db_session.query(WPLMatch).filter_by(match_date=first['date'], team1=first['team1']).one()
+    assert match.winner == first['winner']
+    assert match.team1_score == 180
+
+
+def test_sync_clean_report_follows_changed_and_removed_files(db_session, tmp_path):
+    """Test that syncing incremental cleans prunes only the matches their raw files dropped"""
+    raw_dir = tmp_path / 'raw'
+    raw_dir.mkdir()
+    raw = pd.read_csv(WPLDataCleaner().input_file)
+    for season, part in raw.groupby('season'):
+        part.to_csv(raw_dir / f'wpl_{season}.csv', index=False)
+    cleaner = WPLDataCleaner()
+    cleaner.raw_path = raw_dir
+    cleaner.processed_path = tmp_path / 'processed'
+    cleaner.processed_path.mkdir()
+    cache = get_response_cache()
+
+    # A match imported from a CSV has no source and is never pruned
+    uploaded = "date,team1,team2,winner\n2024/12/01,Team A,Team B,Team A\n"
+    import_matches(db_session, io.StringIO(uploaded))
+    report = sync_clean_report(db_session, cleaner.clean_incremental(), cleaner.store_path)
+    assert report.rows == len(raw) == db_session.query(WPLMatch).count() - 1
+    assert {m.source for m in db_session.query(WPLMatch)} == {'wpl_2023', 'wpl_2024', None}
+
+    latest = raw[raw['season'] == 2024]
+    latest.iloc[:-1].to_csv(raw_dir / 'wpl_2024.csv', index=False)
+    version = cache.backend.get_version(WPL_NAMESPACE)
+    report = sync_clean_report(db_session, cleaner.clean_incremental(), cleaner.store_path)
+    assert (report.rows, report.deleted) == (len(latest) - 1, 1)
+    assert db_session.query(WPLMatch).count() == len(raw)
+    assert cache.backend.get_version(WPL_NAMESPACE) != version
+
+    (raw_dir / 'wpl_2023.csv').unlink()
+    report = sync_clean_report(db_session, cleaner.clean_incremental(), cleaner.store_path)
+    assert (report.rows, report.deleted) == (0, (raw['season'] == 2023).sum())
+    assert db_session.query(WPLMatch).count() == len(latest)
+    assert db_session.query(WPLMatch).filter_by(team1='Team A').one().source is None
+    assert db_session.query(MatchSummary).one().total_matches == len(latest)
+    seasons = {row.season for row in db_session.query(WPLStanding.season).distinct()}
+    assert seasons == {2024}
+
+
+def test_import_seasons_is_upsert_only(db_session, tmp_path):
+    """Test that importing a season keeps matches the store does not have"""
+    import_matches(db_session, io.StringIO("date,team1,team2,team1_score\n2024/12/01,Team A,Team B,150\n"))
+    cleaner = WPLDataCleaner()
+    store = tmp_path / 'wpl_clean.parquet'
+    write_matches(cleaner.transform(pd.read_csv(cleaner.input_file)), store)
+
+    report = import_seasons(db_session, {2024}, store)
+    assert report.deleted == 0
+    assert db_session.query(WPLMatch).filter_by(team1='Team A').one().team1_score == 150